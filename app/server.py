@@ -8,9 +8,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, File, Form, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 import uvicorn
-import numpy as np
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
 
 from gpu_manager import gpu_manager
 
@@ -26,6 +30,62 @@ DIALECTS = [
     "Zhejiang","Cantonese (Hong Kong)","Cantonese (Guangdong)","Wu","Minnan",
 ]
 MODELS = ["Qwen3-ASR-1.7B", "Qwen3-ASR-0.6B"]
+STREAM_MAX_BATCH = int(os.environ.get("STREAM_MAX_BATCH", "32"))
+STREAM_MAX_WAIT_MS = float(os.environ.get("STREAM_MAX_WAIT_MS", "20"))
+# off by default: recording syncs the GPU around timed stages on every request
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "0") == "1"
+
+_stream_scheduler = None
+
+
+class PrometheusExporter:
+    """Metrics hook turning each transcribe() TranscribeMetrics into Prometheus series (served on /metrics)."""
+
+    def __init__(self):
+        p = prometheus_client
+        self.stage_seconds = p.Histogram("qwen_asr_stage_seconds", "Time per transcribe stage", ["stage"])
+        self.transcribe_seconds = p.Histogram("qwen_asr_transcribe_seconds", "Wall time per transcribe call")
+        self.real_time_factor = p.Histogram(
+            "qwen_asr_real_time_factor", "Processing time / audio duration",
+            buckets=(0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0),
+        )
+        self.batch_occupancy = p.Histogram(
+            "qwen_asr_batch_occupancy", "Mean ASR batch fill ratio", buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 1.0),
+        )
+        self.audio_seconds = p.Counter("qwen_asr_audio_seconds", "Audio transcribed")
+        self.chunks = p.Counter("qwen_asr_chunks", "Chunks fed to the model")
+        self.generated_tokens = p.Counter("qwen_asr_generated_tokens", "Tokens generated by the ASR model")
+
+    def __call__(self, m):
+        for name, sec in m.stage_seconds.items():
+            self.stage_seconds.labels(stage=name).observe(sec)
+        self.transcribe_seconds.observe(m.total_seconds)
+        if m.audio_seconds > 0:
+            self.real_time_factor.observe(m.real_time_factor)
+        if m.batch_sizes:
+            self.batch_occupancy.observe(m.batch_occupancy)
+        self.audio_seconds.inc(m.audio_seconds)
+        self.chunks.inc(m.num_chunks)
+        self.generated_tokens.inc(m.generated_tokens)
+
+    def attach(self, asr):
+        if self not in asr.metrics_hooks:
+            asr.add_metrics_hook(self)
+
+
+metrics_exporter = PrometheusExporter() if METRICS_ENABLED and prometheus_client is not None else None
+
+
+def get_stream_scheduler(asr):
+    """One shared StreamingScheduler per loaded model; all WebSocket sessions are batched through it."""
+    global _stream_scheduler
+    if _stream_scheduler is None or _stream_scheduler.model is not asr:
+        if _stream_scheduler is not None:
+            _stream_scheduler.close(wait=False)
+        from qwen_asr import StreamingScheduler
+        _stream_scheduler = StreamingScheduler(asr, max_batch_size=STREAM_MAX_BATCH, max_wait_ms=STREAM_MAX_WAIT_MS)
+    return _stream_scheduler
+
 
 @asynccontextmanager
 async def lifespan(app):
@@ -49,6 +109,13 @@ async def health():
     return {"status": "healthy", "version": "1.0.0", "model_loaded": s["model_loaded"], **s}
 
 
+@app.get("/metrics")
+async def metrics():
+    if metrics_exporter is None:
+        return JSONResponse({"error": "Metrics disabled (set METRICS_ENABLED=1 and install prometheus_client)"}, status_code=404)
+    return Response(prometheus_client.generate_latest(), media_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+
 @app.get("/api/status")
 async def api_status():
     s = gpu_manager.get_status()
@@ -80,6 +147,8 @@ async def api_transcribe(
         t_load_start = time.time()
         asr = await gpu_manager.get_model(model, dtype)
         t_load = time.time() - t_load_start
+        if metrics_exporter is not None:
+            metrics_exporter.attach(asr)
 
         lang_arg = language if language and language.lower() != "auto" else None
         t_proc_start = time.time()
@@ -140,6 +209,7 @@ async def ws_stream(ws: WebSocket):
 
         lang_arg = language if language and language.lower() != "auto" else None
         state = asr.init_streaming_state(language=lang_arg)
+        scheduler = get_stream_scheduler(asr)
 
         await ws.send_json({"type": "ready"})
 
@@ -147,11 +217,11 @@ async def ws_stream(ws: WebSocket):
             data = await ws.receive_bytes()
             if not data:
                 break
-            pcm = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
-            state = asr.streaming_transcribe(pcm, state)
+            # raw int16 PCM bytes go straight to the model, converted to float32 in one pass
+            state = await asyncio.wrap_future(scheduler.submit(data, state))
             await ws.send_json({"type": "partial", "text": state.text if hasattr(state, 'text') else ""})
 
-        state = asr.finish_streaming_transcribe(state)
+        state = await asyncio.wrap_future(scheduler.finish(state))
         await ws.send_json({"type": "final", "text": state.text if hasattr(state, 'text') else "", "language": state.language if hasattr(state, 'language') else ""})
     except WebSocketDisconnect:
         pass
@@ -19,7 +19,12 @@ qwen_asr: Qwen3-ASR package.
 
 from .inference.qwen3_asr import Qwen3ASRModel
 from .inference.qwen3_forced_aligner import Qwen3ForcedAligner
+from .inference.streaming_scheduler import StreamingScheduler
+from .inference.parallel_transcriber import ParallelTranscriber
+from .inference.audio_fetcher import AudioFetcher, set_default_audio_fetcher
+from .inference.audio_cache import DecodedAudioCache
+from .inference.metrics import TranscribeMetrics
 
-from .inference.utils import parse_asr_output
+from .inference.utils import RawPCM, parse_asr_output
 
 __all__ = ["__version__"]
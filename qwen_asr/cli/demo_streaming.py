@@ -32,7 +32,7 @@ from typing import Dict, Optional
 
 import numpy as np
 from flask import Flask, Response, jsonify, request
-from qwen_asr import Qwen3ASRModel
+from qwen_asr import Qwen3ASRModel, StreamingScheduler
 
 
 @dataclass
@@ -45,6 +45,7 @@ class Session:
 app = Flask(__name__)
 
 global asr
+global scheduler
 global UNFIXED_CHUNK_NUM
 global UNFIXED_TOKEN_NUM
 global CHUNK_SIZE_SEC
@@ -58,7 +59,7 @@ def _gc_sessions():
     dead = [sid for sid, s in SESSIONS.items() if now - s.last_seen > SESSION_TTL_SEC]
     for sid in dead:
         try:
-            asr.finish_streaming_transcribe(SESSIONS[sid].state)
+            scheduler.finish(SESSIONS[sid].state).result()
         except Exception:
             pass
         SESSIONS.pop(sid, None)
@@ -443,7 +444,7 @@ def api_chunk():
 
     wav = np.frombuffer(raw, dtype=np.float32).reshape(-1)
 
-    asr.streaming_transcribe(wav, s.state)
+    scheduler.submit(wav, s.state).result()
 
     return jsonify(
         {
@@ -460,7 +461,7 @@ def api_finish():
     if not s:
         return jsonify({"error": "invalid session_id"}), 400
 
-    asr.finish_streaming_transcribe(s.state)
+    scheduler.finish(s.state).result()
     out = {
         "language": getattr(s.state, "language", "") or "",
         "text": getattr(s.state, "text", "") or "",
@@ -479,6 +480,14 @@ def parse_args():
     p.add_argument("--unfixed-chunk-num", type=int, default=4)
     p.add_argument("--unfixed-token-num", type=int, default=5)
     p.add_argument("--chunk-size-sec", type=float, default=1.0)
+    p.add_argument("--max-batch-size", type=int, default=32, help="Max concurrent sessions decoded per tick")
+    p.add_argument("--max-wait-ms", type=float, default=20.0, help="Max time a chunk waits for a batched tick")
+    p.add_argument(
+        "--encoder-window-cache-size",
+        type=int,
+        default=0,
+        help="Cache audio encoder outputs of this many completed attention windows (0 disables)",
+    )
     return p.parse_args()
 
 
@@ -486,6 +495,7 @@ def main():
     args = parse_args()
 
     global asr
+    global scheduler
     global UNFIXED_CHUNK_NUM
     global UNFIXED_TOKEN_NUM
     global CHUNK_SIZE_SEC
@@ -498,7 +508,9 @@ def main():
         model=args.asr_model_path,
         gpu_memory_utilization=args.gpu_memory_utilization,
         max_new_tokens=32,
+        encoder_window_cache_size=args.encoder_window_cache_size,
     )
+    scheduler = StreamingScheduler(asr, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
     print("Model loaded.")
     app.run(host=args.host, port=args.port, debug=False, use_reloader=False, threaded=True)
 
@@ -0,0 +1,156 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of audio encoder outputs for completed attention windows (vLLM backend, streaming)."""
+
+from collections import OrderedDict
+from collections.abc import Callable
+
+import numpy as np
+import torch
+
+
+class AudioWindowCache:
+    """
+    LRU cache of audio encoder outputs for completed `n_window_infer` attention windows.
+
+    The encoder attends only inside `n_window_infer`-frame windows and restarts its
+    positional embedding on every conv chunk, so the output of a full window depends
+    on nothing but the mel frames of that window. Streaming requests re-send the whole
+    stream on every step; with this cache only the windows that changed are encoded.
+
+    Windows are keyed by an exact integer fingerprint of their mel frames, so a
+    window is only reused when its features are bit-identical (the Whisper feature
+    extractor clamps to `max - 8` over the whole audio, so a louder new chunk can
+    invalidate earlier windows; they are then simply recomputed).
+    """
+
+    def __init__(self, max_windows: int, window_frames: int, num_mel_bins: int):
+        self.max_windows = int(max_windows)
+        self.window_frames = int(window_frames)
+        generator = torch.Generator().manual_seed(0)
+        # Two independent random int64 projections -> 128-bit key per window.
+        self._weights = torch.randint(
+            -(2**62), 2**62, (2, num_mel_bins * self.window_frames),
+            dtype=torch.int64, generator=generator,
+        )
+        self._entries: OrderedDict[tuple[int, int], torch.Tensor] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def fingerprint(self, windows: torch.Tensor) -> list[tuple[int, int]]:
+        """Fingerprint a `(num_windows, mel, window_frames)` tensor of full windows."""
+        if windows.shape[0] == 0:
+            return []
+        int_dtype = {2: torch.int16, 4: torch.int32, 8: torch.int64}[windows.element_size()]
+        bits = windows.contiguous().view(int_dtype).reshape(windows.shape[0], -1).to(torch.int64)
+        if self._weights.device != bits.device:
+            self._weights = self._weights.to(bits.device)
+        # Integer arithmetic wraps deterministically, so keys do not depend on
+        # reduction order or on how many windows are fingerprinted together.
+        keys = torch.stack([(bits * w).sum(-1) for w in self._weights], dim=-1)
+        return [tuple(k) for k in keys.tolist()]
+
+    def get(self, key: tuple[int, int]) -> torch.Tensor | None:
+        out = self._entries.get(key)
+        if out is not None:
+            self._entries.move_to_end(key)
+        return out
+
+    def put(self, key: tuple[int, int], value: torch.Tensor) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_windows:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def encode_with_window_cache(
+    cache: AudioWindowCache,
+    encode: Callable[[torch.Tensor, torch.Tensor, torch.Tensor], torch.Tensor],
+    input_features: torch.Tensor,
+    feature_lens: torch.Tensor,
+    output_lengths: Callable[[torch.Tensor], torch.Tensor],
+) -> torch.Tensor:
+    """
+    Encode a batch, reusing cached outputs for the leading full windows of each audio.
+
+    For every audio, the longest prefix of full windows found in the cache is reused;
+    the remaining frames (the "tail") of all audios are encoded together in one call,
+    and the new full windows of each tail are added to the cache.
+
+    Args:
+        cache: The window cache.
+        encode: The encoder, called as `encode(input_features, feature_lens, aftercnn_lens)`
+            on the packed `(mel, frames)` features of the tails.
+        input_features: Packed `(mel, frames)` features of the batch.
+        feature_lens: Frames per audio.
+        output_lengths: Maps frame counts to encoder output lengths.
+    """
+    window = cache.window_frames
+    tokens_per_window = int(output_lengths(torch.tensor(window)).item())
+
+    feat_lens = feature_lens.tolist()
+    starts = np.cumsum([0] + feat_lens[:-1]).tolist()
+
+    cached_parts: list[list[torch.Tensor]] = []
+    tail_starts: list[int] = []
+    tail_keys: list[list[tuple[int, int]]] = []
+    for start, feat_len in zip(starts, feat_lens):
+        num_full = feat_len // window
+        feature = input_features[:, start : start + num_full * window]
+        windows = feature.reshape(feature.shape[0], num_full, window).transpose(0, 1)
+        keys = cache.fingerprint(windows)
+
+        hits: list[torch.Tensor] = []
+        for key in keys:
+            out = cache.get(key)
+            if out is None:
+                break
+            hits.append(out)
+        cached_parts.append(hits)
+        tail_starts.append(start + len(hits) * window)
+        tail_keys.append(keys[len(hits):])
+
+    tail_lens = [
+        start + feat_len - tail_start
+        for start, feat_len, tail_start in zip(starts, feat_lens, tail_starts)
+    ]
+    tail_outputs: list[torch.Tensor | None] = [None] * len(feat_lens)
+    encode_idx = [i for i, n in enumerate(tail_lens) if n > 0]
+    if encode_idx:
+        tail_features = torch.cat(
+            [input_features[:, tail_starts[i] : tail_starts[i] + tail_lens[i]] for i in encode_idx],
+            dim=1,
+        )
+        tail_feature_lens = torch.tensor(
+            [tail_lens[i] for i in encode_idx], dtype=feature_lens.dtype, device=feature_lens.device
+        )
+        tail_aftercnn_lens = output_lengths(tail_feature_lens)
+        encoded = encode(tail_features, tail_feature_lens, tail_aftercnn_lens)
+        for i, out in zip(encode_idx, encoded.split(tail_aftercnn_lens.tolist())):
+            tail_outputs[i] = out
+            for w, key in enumerate(tail_keys[i]):
+                cache.put(key, out[w * tokens_per_window : (w + 1) * tokens_per_window].clone())
+
+    outputs: list[torch.Tensor] = []
+    for hits, tail in zip(cached_parts, tail_outputs):
+        outputs.extend(hits)
+        if tail is not None:
+            outputs.append(tail)
+    return torch.cat(outputs, dim=0)
@@ -62,6 +62,9 @@ class Qwen3ASRAudioEncoderConfig(PretrainedConfig):
             The chunk for conv and flash attn in AudioEncoder.
         output_dim (`int`, *optional*, defaults to 3584):
             The output dimension of AudioEncoder.
+        window_cache_size (`int`, *optional*, defaults to 0):
+            Number of completed `n_window_infer` attention windows whose encoder outputs are cached by the vLLM
+            audio encoder (used by streaming ASR to avoid re-encoding the whole stream). 0 disables the cache.
 
     Example:
 
@@ -99,6 +102,7 @@ class Qwen3ASRAudioEncoderConfig(PretrainedConfig):
         n_window_infer=400,
         conv_chunksize=500,
         downsample_hidden_size=480,
+        window_cache_size=0,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -121,6 +125,7 @@ class Qwen3ASRAudioEncoderConfig(PretrainedConfig):
         self.n_window_infer = n_window_infer
         self.conv_chunksize = conv_chunksize
         self.downsample_hidden_size = downsample_hidden_size
+        self.window_cache_size = window_cache_size
 
 
 class Qwen3ASRTextConfig(PretrainedConfig):
@@ -481,7 +481,12 @@ class Qwen3ASRAudioAttention(nn.Module):
         attention_mask: Optional[torch.Tensor] = None,
         **kwargs,
     ) -> tuple[torch.Tensor, Optional[torch.Tensor], Optional[tuple[torch.Tensor]]]:
-        """Input shape: Batch x Time x Channel"""
+        """
+        Input shape: Time x Channel (all attention windows of all samples packed along time).
+
+        FlashAttention varlen kernels consume `cu_seqlens` directly. Other implementations run
+        windowed attention without a mask unless an explicit `attention_mask` is given.
+        """
 
         seq_length, _ = hidden_states.size()
 
@@ -498,27 +503,66 @@ class Qwen3ASRAudioAttention(nn.Module):
         if self.config._attn_implementation != "eager":
             attention_interface = ALL_ATTENTION_FUNCTIONS[self.config._attn_implementation]
 
-        attn_output, _ = attention_interface(
-            self,
-            query_states,
-            key_states,
-            value_states,
-            attention_mask=attention_mask,
-            dropout=0.0 if not self.training else self.attention_dropout,
-            scaling=self.scaling,
-            cu_seq_lens_q=cu_seqlens,  # pass cu seq lens for FA2
-            cu_seq_lens_k=cu_seqlens,
-            max_length_q=max_seqlen,
-            max_length_k=max_seqlen,
-            is_causal=False,
-            **kwargs,
-        )
+        if (
+            cu_seqlens is not None
+            and attention_mask is None
+            and not self.config._attn_implementation.startswith("flash_attention")
+        ):
+            attn_output = self._windowed_attention(
+                attention_interface, query_states, key_states, value_states, cu_seqlens, **kwargs
+            )
+        else:
+            attn_output, _ = attention_interface(
+                self,
+                query_states,
+                key_states,
+                value_states,
+                attention_mask=attention_mask,
+                dropout=0.0 if not self.training else self.attention_dropout,
+                scaling=self.scaling,
+                cu_seq_lens_q=cu_seqlens,  # pass cu seq lens for FA2
+                cu_seq_lens_k=cu_seqlens,
+                max_length_q=max_seqlen,
+                max_length_k=max_seqlen,
+                is_causal=False,
+                **kwargs,
+            )
 
         attn_output = attn_output.reshape(seq_length, -1).contiguous()
         attn_output = self.out_proj(attn_output)
 
         return attn_output
 
+    def _windowed_attention(self, attention_interface, query_states, key_states, value_states, cu_seqlens, **kwargs):
+        """
+        Attention restricted to the `cu_seqlens` windows without building a (seq x seq) mask.
+
+        Windows of equal length are stacked along the batch dimension and run in one call; with
+        the fixed encoder window size that is a single call plus one per distinct tail length.
+        """
+        window_lens = (cu_seqlens[1:] - cu_seqlens[:-1]).tolist()
+        q_windows = query_states.split(window_lens, dim=2)
+        k_windows = key_states.split(window_lens, dim=2)
+        v_windows = value_states.split(window_lens, dim=2)
+
+        outputs = [None] * len(window_lens)
+        for length in set(window_lens):
+            idx = [i for i, n in enumerate(window_lens) if n == length]
+            output, _ = attention_interface(
+                self,
+                torch.cat([q_windows[i] for i in idx], dim=0),
+                torch.cat([k_windows[i] for i in idx], dim=0),
+                torch.cat([v_windows[i] for i in idx], dim=0),
+                attention_mask=None,
+                dropout=0.0 if not self.training else self.attention_dropout,
+                scaling=self.scaling,
+                is_causal=False,
+                **kwargs,
+            )
+            for i, window_output in zip(idx, output.split(1, dim=0)):
+                outputs[i] = window_output
+        return torch.cat(outputs, dim=1)
+
 
 class Qwen3ASRAudioEncoderLayer(GradientCheckpointingLayer):
     def __init__(self, config: Qwen3ASRAudioEncoderConfig):
@@ -654,15 +698,20 @@ class Qwen3ASRAudioEncoder(Qwen3ASRPreTrainedModel):
         if self.config._attn_implementation == "flash_attention_2":
             return None
 
+        # Block-diagonal mask built from window ids in one shot. The encoder itself runs windowed
+        # attention without any mask (see `Qwen3ASRAudioAttention._windowed_attention`).
         seq_length = inputs_tensor.shape[0]
+        window_lens = cu_seqlens[1:] - cu_seqlens[:-1]
+        window_ids = torch.repeat_interleave(
+            torch.arange(len(window_lens), device=inputs_tensor.device), window_lens.to(inputs_tensor.device)
+        )[:seq_length]
         attention_mask = torch.full(
             [1, 1, seq_length, seq_length],
             torch.finfo(inputs_tensor.dtype).min,
             device=inputs_tensor.device,
             dtype=inputs_tensor.dtype,
         )
-        for i in range(1, len(cu_seqlens)):
-            attention_mask[..., cu_seqlens[i - 1] : cu_seqlens[i], cu_seqlens[i - 1] : cu_seqlens[i]] = 0
+        attention_mask.masked_fill_(window_ids[:, None] == window_ids[None, :], 0)
         return attention_mask
 
     @auto_docstring
@@ -691,6 +740,52 @@ class Qwen3ASRAudioEncoder(Qwen3ASRPreTrainedModel):
         chunk_lengths[chunk_lengths == 0] = self.n_window * 2
 
         chunk_list = input_features.T.split(chunk_lengths.tolist(), dim=0)
+        # Each chunk is padded to the longest chunk of its own sample, exactly as when samples are
+        # encoded one by one; chunks are grouped by that padded length for the conv stack.
+        sample_pad_lens = torch.clamp(feature_lens, max=self.n_window * 2)
+        chunk_pad_lens = sample_pad_lens.repeat_interleave(chunk_num).tolist()
+        if len(set(chunk_pad_lens)) == 1:
+            hidden_states = self._embed_chunks(chunk_list)
+        else:
+            chunk_states = [None] * len(chunk_list)
+            for pad_len in sorted(set(chunk_pad_lens)):
+                idx = [i for i, p in enumerate(chunk_pad_lens) if p == pad_len]
+                group_states = self._embed_chunks([chunk_list[i] for i in idx])
+                group_lens = _get_feat_extract_output_lengths(chunk_lengths[idx]).tolist()
+                for i, h in zip(idx, group_states.split(group_lens, dim=0)):
+                    chunk_states[i] = h
+            hidden_states = torch.cat(chunk_states, dim=0)
+
+        cu_chunk_lens = [0]
+        window_ratio = self.n_window_infer // (self.n_window * 2)
+        window_lens = _get_feat_extract_output_lengths(sample_pad_lens) * window_ratio
+        for cnn_len, window_aftercnn in zip(aftercnn_lens.tolist(), window_lens.tolist()):
+            cu_chunk_lens += [window_aftercnn] * (cnn_len // window_aftercnn)
+            remainder = cnn_len % window_aftercnn
+            if remainder != 0:
+                cu_chunk_lens += [remainder]
+        cu_seqlens = torch.tensor(cu_chunk_lens, device=aftercnn_lens.device).cumsum(-1, dtype=torch.int32)
+
+        for encoder_layer in self.layers:
+            layer_outputs = encoder_layer(
+                hidden_states,
+                cu_seqlens,
+            )
+
+            hidden_states = layer_outputs[0]
+
+        hidden_states = self.ln_post(hidden_states)
+        hidden_states = self.proj1(hidden_states)
+        hidden_states = self.act(hidden_states)
+        hidden_states = self.proj2(hidden_states)
+        return BaseModelOutput(last_hidden_state=hidden_states)
+
+    def _embed_chunks(self, chunk_list):
+        """
+        Run the conv stack on conv chunks of shape (frames, mel) and return the valid
+        (unpadded) frame embeddings of all chunks, concatenated in order.
+        """
+        chunk_lengths = torch.tensor([c.shape[0] for c in chunk_list], dtype=torch.long, device=chunk_list[0].device)
         padded_feature = nn.utils.rnn.pad_sequence(chunk_list, batch_first=True).transpose(1, 2)
         feature_lens_after_cnn = _get_feat_extract_output_lengths(chunk_lengths)
         padded_mask_after_cnn = nn.utils.rnn.pad_sequence(
@@ -715,29 +810,7 @@ class Qwen3ASRAudioEncoder(Qwen3ASRPreTrainedModel):
             .to(padded_embed.dtype)
         )
         padded_embed = padded_embed + positional_embedding
-        hidden_states = padded_embed[padded_mask_after_cnn]
-        cu_chunk_lens = [0]
-        window_aftercnn = padded_mask_after_cnn.shape[-1] * (self.n_window_infer // (self.n_window * 2))
-        for cnn_len in aftercnn_lens:
-            cu_chunk_lens += [window_aftercnn] * (cnn_len // window_aftercnn)
-            remainder = cnn_len % window_aftercnn
-            if remainder != 0:
-                cu_chunk_lens += [remainder]
-        cu_seqlens = torch.tensor(cu_chunk_lens, device=aftercnn_lens.device).cumsum(-1, dtype=torch.int32)
-
-        for encoder_layer in self.layers:
-            layer_outputs = encoder_layer(
-                hidden_states,
-                cu_seqlens,
-            )
-
-            hidden_states = layer_outputs[0]
-
-        hidden_states = self.ln_post(hidden_states)
-        hidden_states = self.proj1(hidden_states)
-        hidden_states = self.act(hidden_states)
-        hidden_states = self.proj2(hidden_states)
-        return BaseModelOutput(last_hidden_state=hidden_states)
+        return padded_embed[padded_mask_after_cnn]
 
     def padded_and_mask_function(self, tensor_list, tensor_len, padding_value=0, padding_side="right"):
         """
@@ -1088,6 +1161,8 @@ class Qwen3ASRThinkerForConditionalGeneration(Qwen3ASRPreTrainedModelForConditio
             self.lm_head = nn.Linear(config.text_config.hidden_size, config.text_config.vocab_size, bias=False)
         self.pad_token_id = self.config.pad_token_id if self.config.pad_token_id is not None else -1
         self.rope_deltas = None
+        # Encode all audios of a batch in one audio_tower call instead of one call per audio.
+        self.batch_audio_encoder = False
         self.post_init()
 
     def get_input_embeddings(self):
@@ -1119,6 +1194,14 @@ class Qwen3ASRThinkerForConditionalGeneration(Qwen3ASRPreTrainedModelForConditio
             audio_feature_lengths = None
         feature_lens = audio_feature_lengths if audio_feature_lengths is not None else feature_attention_mask.sum(-1)
     
+        if self.batch_audio_encoder:
+            # Samples are packed along time; the encoder keeps windows and attention per sample.
+            audio_output = self.audio_tower(
+                torch.cat([f[:, :n] for f, n in zip(input_features, feature_lens.tolist())], dim=1),
+                feature_lens=feature_lens,
+            )
+            return audio_output.last_hidden_state
+
         # audio encoder do not support batch inference to keep precision
         audio_features = []
         for input_feature, feature_len in zip(input_features, feature_lens):
@@ -1170,6 +1253,7 @@ class Qwen3ASRThinkerForConditionalGeneration(Qwen3ASRPreTrainedModelForConditio
         labels=None,
         use_cache=None,
         cache_position=None,
+        logits_mask=None,
         **kwargs,
     ) -> Union[tuple, Qwen3ASRThinkerCausalLMOutputWithPast]:
         r"""
@@ -1185,6 +1269,10 @@ class Qwen3ASRThinkerForConditionalGeneration(Qwen3ASRPreTrainedModelForConditio
             Labels for computing the masked language modeling loss. Indices should either be in `[0, ...,
             config.vocab_size]` or -100 (see `input_ids` docstring). Tokens with indices set to `-100` are ignored
             (masked), the loss is only computed for the tokens with labels in `[0, ..., config.vocab_size]`.
+        logits_mask (`torch.BoolTensor` of shape `(batch_size, sequence_length)`, *optional*):
+            If given, `lm_head` is only applied at the selected positions and `logits` has shape
+            `(num_selected, num_classes)`, in row-major order of the mask. The forced aligner uses this to
+            score only its `<timestamp>` slots instead of materializing `(batch, seq, classes)` logits.
         """
 
         if inputs_embeds is None:
@@ -1238,10 +1326,12 @@ class Qwen3ASRThinkerForConditionalGeneration(Qwen3ASRPreTrainedModelForConditio
         )
 
         hidden_states = outputs[0]
+        if logits_mask is not None:
+            hidden_states = hidden_states[logits_mask.to(hidden_states.device)]
         logits = self.lm_head(hidden_states)
 
         loss = None
-        if labels is not None:
+        if labels is not None and logits_mask is None:
             loss = self.loss_function(
                 logits=logits, labels=labels, vocab_size=self.config.get_text_config().vocab_size
             )
@@ -95,6 +95,7 @@ from vllm.transformers_utils.processor import cached_processor_from_config
 from vllm.model_executor.models.vision import (
     get_vit_attn_backend,
 )
+from ..audio_window_cache import AudioWindowCache, encode_with_window_cache
 from ..transformers_backend.configuration_qwen3_asr import (
     Qwen3ASRConfig,
     Qwen3ASRThinkerConfig,
@@ -370,6 +371,24 @@ class Qwen3ASRAudioEncoder(nn.Module):
             attn_backend_override=attn_backend_override,
         )
 
+        # Optional cache of completed attention windows (used by streaming ASR).
+        # Windows must start on conv chunk boundaries for their outputs to be reusable.
+        self.window_cache: AudioWindowCache | None = None
+        window_cache_size = int(getattr(config, "window_cache_size", 0) or 0)
+        if window_cache_size > 0:
+            if self.n_window_infer % (self.n_window * 2) != 0:
+                logger.warning(
+                    "window_cache_size ignored: n_window_infer=%d is not a multiple of 2 * n_window=%d",
+                    self.n_window_infer,
+                    self.n_window * 2,
+                )
+            else:
+                self.window_cache = AudioWindowCache(
+                    max_windows=window_cache_size,
+                    window_frames=self.n_window_infer,
+                    num_mel_bins=self.num_mel_bins,
+                )
+
     def compute_attn_mask_seqlen(self, cu_seqlens: torch.Tensor) -> torch.Tensor | None:
         """Compute max_seqlen only for flash attention backends."""
         max_seqlen = None
@@ -394,6 +413,25 @@ class Qwen3ASRAudioEncoder(nn.Module):
         feature_lens: torch.Tensor,
         aftercnn_lens: torch.Tensor,
     ):
+        if self.window_cache is not None:
+            return self._forward_with_window_cache(input_features, feature_lens)
+        return self._encode(input_features, feature_lens, aftercnn_lens)
+
+    def _forward_with_window_cache(
+        self,
+        input_features: torch.Tensor,
+        feature_lens: torch.Tensor,
+    ) -> torch.Tensor:
+        return encode_with_window_cache(
+            self.window_cache, self._encode, input_features, feature_lens, _get_feat_extract_output_lengths
+        )
+
+    def _encode(
+        self,
+        input_features: torch.Tensor,
+        feature_lens: torch.Tensor,
+        aftercnn_lens: torch.Tensor,
+    ) -> torch.Tensor:
         # Compute chunk information
         chunk_num = torch.ceil(feature_lens / (self.n_window * 2)).long()
 
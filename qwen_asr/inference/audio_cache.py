@@ -0,0 +1,178 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class DecodedAudioCache:
+    """
+    LRU cache of normalized (mono 16k float32) waveforms keyed by a content hash of the input.
+
+    Pass one instance as `audio_cache=` to Qwen3ASRModel / Qwen3ForcedAligner (or to
+    normalize_audios) and repeated inputs skip decoding and resampling: retries, re-alignment of
+    a file that was just transcribed, A/B runs of several models on the same data.
+
+    Entries beyond `max_bytes` are evicted least recently used first. With `spill_dir`, evicted
+    entries are written there as .npy files and reloaded on a later hit, up to `max_spill_bytes`.
+
+    Cached arrays are read-only and shared between hits.
+
+    Example:
+        cache = DecodedAudioCache(max_bytes=1 << 30, spill_dir="/tmp/qwen_asr_audio")
+        asr = Qwen3ASRModel.from_pretrained(..., audio_cache=cache)
+        print(cache.stats())   # {"hits": ..., "misses": ..., "spill_hits": ..., ...}
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 512 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+        max_spill_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            max_bytes:
+                Memory budget for cached waveforms.
+            spill_dir:
+                Optional directory for the disk tier. None drops evicted entries.
+            max_spill_bytes:
+                Disk tier budget. None means unbounded.
+        """
+        self.max_bytes = int(max_bytes)
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = None if max_spill_bytes is None else int(max_spill_bytes)
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.spill_hits = 0
+
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._mem_bytes = 0
+        self._spilled: "OrderedDict[str, int]" = OrderedDict()
+        self._spill_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Return the cached waveform for key (memory first, then disk tier), or None.
+        """
+        with self._lock:
+            wav = self._mem.get(key)
+            if wav is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return wav
+            spilled = key in self._spilled
+
+        if spilled:
+            try:
+                wav = np.load(self._spill_path(key))
+            except (OSError, ValueError):
+                wav = None
+            if wav is not None:
+                wav.setflags(write=False)
+                with self._lock:
+                    self.hits += 1
+                    self.spill_hits += 1
+                    self._spilled.move_to_end(key, last=True)
+                    self._insert(key, wav)
+                return wav
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, wav: np.ndarray) -> np.ndarray:
+        """
+        Store a copy of wav under key and return the cached (read-only) array.
+        """
+        wav = np.array(wav, dtype=np.float32, copy=True)
+        wav.setflags(write=False)
+        with self._lock:
+            if key in self._mem:
+                self._mem_bytes -= self._mem.pop(key).nbytes
+            self._insert(key, wav)
+        return wav
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+            for key in list(self._spilled):
+                self._remove_spilled(key)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss counters and current tier sizes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "spill_hits": self.spill_hits,
+                "entries": len(self._mem),
+                "bytes": self._mem_bytes,
+                "spilled_entries": len(self._spilled),
+                "spilled_bytes": self._spill_bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._mem)
+
+    def _insert(self, key: str, wav: np.ndarray) -> None:
+        # caller holds the lock
+        if wav.nbytes > self.max_bytes:
+            self._spill(key, wav)
+            return
+        self._mem[key] = wav
+        self._mem_bytes += wav.nbytes
+        while self._mem_bytes > self.max_bytes:
+            old_key, old = self._mem.popitem(last=False)
+            self._mem_bytes -= old.nbytes
+            self._spill(old_key, old)
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, key + ".npy")
+
+    def _spill(self, key: str, wav: np.ndarray) -> None:
+        # caller holds the lock
+        if not self.spill_dir or key in self._spilled:
+            return
+        if self.max_spill_bytes is not None and wav.nbytes > self.max_spill_bytes:
+            return
+        path = self._spill_path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, wav)
+        os.replace(tmp, path)
+        self._spilled[key] = wav.nbytes
+        self._spill_bytes += wav.nbytes
+        while self.max_spill_bytes is not None and self._spill_bytes > self.max_spill_bytes:
+            self._remove_spilled(next(iter(self._spilled)))
+
+    def _remove_spilled(self, key: str) -> None:
+        # caller holds the lock
+        self._spill_bytes -= self._spilled.pop(key)
+        try:
+            os.remove(self._spill_path(key))
+        except OSError:
+            pass
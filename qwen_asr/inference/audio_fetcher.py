@@ -0,0 +1,292 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import urllib3
+except ImportError:  # pragma: no cover - urllib3 ships with requests/transformers
+    urllib3 = None
+
+_READ_BLOCK = 1 << 20
+
+
+class AudioFetcher:
+    """
+    HTTP(S) downloader for URL audio inputs.
+
+    - Keep-alive connection pool (urllib3 when available, else one urllib request per fetch).
+    - prefetch() downloads several URLs concurrently; a later fetch() of the same URL joins the
+      in-flight download instead of starting another one. Unclaimed prefetches are dropped by
+      discard(), after prefetch_ttl seconds, or oldest first beyond max_prefetched entries.
+    - Responses larger than max_bytes are rejected (by Content-Length up front, and while reading).
+    - Optional on-disk cache: bodies served with an ETag are stored under cache_dir and
+      revalidated with If-None-Match, so an unchanged object costs a 304 instead of a download.
+      Least recently used files are removed beyond max_cache_bytes / max_cache_entries.
+
+    Example:
+        fetcher = AudioFetcher(max_workers=16, timeout=10, cache_dir="/data/audio_cache")
+        set_default_audio_fetcher(fetcher)   # used by load_audio_any() for URL inputs
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 8,
+        max_workers: int = 8,
+        timeout: float = 30.0,
+        max_bytes: int = 200 * 1024 * 1024,
+        cache_dir: Optional[str] = None,
+        prefetch_ttl: float = 60.0,
+        max_prefetched: int = 256,
+        max_cache_bytes: Optional[int] = 1 << 30,
+        max_cache_entries: Optional[int] = 10000,
+    ):
+        """
+        Args:
+            max_connections:
+                Idle keep-alive connections kept per host.
+            max_workers:
+                Concurrent downloads started by prefetch().
+            timeout:
+                Connect and read timeout in seconds.
+            max_bytes:
+                Maximum response body size.
+            cache_dir:
+                Directory of the ETag cache. None disables caching.
+            prefetch_ttl:
+                Seconds a prefetched body waits for its fetch() before it is dropped.
+            max_prefetched:
+                Maximum number of prefetched bodies waiting for their fetch().
+            max_cache_bytes:
+                Size limit of the ETag cache. None means unbounded.
+            max_cache_entries:
+                File limit of the ETag cache. None means unbounded.
+        """
+        self.timeout = float(timeout)
+        self.max_bytes = int(max_bytes)
+        self.max_workers = max(1, int(max_workers))
+        self.cache_dir = cache_dir
+        self.prefetch_ttl = float(prefetch_ttl)
+        self.max_prefetched = max(1, int(max_prefetched))
+        self.max_cache_bytes = None if max_cache_bytes is None else int(max_cache_bytes)
+        self.max_cache_entries = None if max_cache_entries is None else int(max_cache_entries)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._pool = None
+        if urllib3 is not None:
+            self._pool = urllib3.PoolManager(
+                maxsize=max(1, int(max_connections)),
+                timeout=urllib3.Timeout(connect=self.timeout, read=self.timeout),
+                retries=urllib3.Retry(total=2, redirect=5, raise_on_status=False),
+            )
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="qwen-asr-fetch")
+        # url -> (download, start time), oldest first
+        self._inflight: "OrderedDict[str, Tuple[Future, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Return the body of url, joining a prefetch of the same URL if one is in flight.
+
+        Raises:
+            ValueError: If the body exceeds max_bytes.
+            RuntimeError: On HTTP errors.
+        """
+        with self._lock:
+            self._expire()
+            entry = self._inflight.pop(url, None)
+        if entry is not None:
+            return entry[0].result()
+        return self._download(url)
+
+    def prefetch(self, urls: Iterable[str]) -> None:
+        """
+        Start downloading urls in the background. Each prefetched body is handed to the next fetch()
+        of that URL.
+        """
+        with self._lock:
+            self._expire()
+            for url in urls:
+                if url not in self._inflight:
+                    self._inflight[url] = (self._executor.submit(self._download, url), time.monotonic())
+            while len(self._inflight) > self.max_prefetched:
+                self._inflight.popitem(last=False)[1][0].cancel()
+
+    def discard(self, urls: Iterable[str]) -> None:
+        """
+        Drop the prefetches of urls that no fetch() has claimed, e.g. when their consumer stopped.
+        """
+        with self._lock:
+            for url in urls:
+                entry = self._inflight.pop(url, None)
+                if entry is not None:
+                    entry[0].cancel()
+
+    def close(self) -> None:
+        with self._lock:
+            for future, _ in self._inflight.values():
+                future.cancel()
+            self._inflight.clear()
+        self._executor.shutdown(wait=False)
+        if self._pool is not None:
+            self._pool.clear()
+
+    def _expire(self) -> None:
+        # caller holds the lock; finished prefetches older than prefetch_ttl may be stale by now
+        now = time.monotonic()
+        for url, (future, started) in list(self._inflight.items()):
+            if future.done() and now - started > self.prefetch_ttl:
+                del self._inflight[url]
+
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".audio")
+
+    def _download(self, url: str) -> bytes:
+        headers = {}
+        cached_etag = self._read_cache(url, with_body=False)[0] if self.cache_dir else None
+        if cached_etag:
+            headers["If-None-Match"] = cached_etag
+
+        status, etag, body = self._request(url, headers)
+        if status == 304 and cached_etag:
+            cached_etag, body = self._read_cache(url, with_body=True)
+            if cached_etag is not None:
+                return body
+            # the cached body was evicted after its ETag was read: ask for the full body again
+            status, etag, body = self._request(url, {})
+        if status != 200:
+            raise RuntimeError(f"HTTP {status} while fetching audio URL: {url}")
+
+        if self.cache_dir and etag:
+            self._write_cache(url, etag, body)
+        return body
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, Optional[str], bytes]:
+        if self._pool is not None:
+            resp = self._pool.request("GET", url, headers=headers, preload_content=False)
+            try:
+                self._check_length(url, resp.headers.get("Content-Length"))
+                body = self._read_limited(url, resp) if resp.status == 200 else b""
+            except BaseException:
+                resp.close()  # partially read; do not return the connection to the pool
+                raise
+            resp.release_conn()
+            return resp.status, resp.headers.get("ETag"), body
+
+        req = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                self._check_length(url, resp.headers.get("Content-Length"))
+                return resp.status, resp.headers.get("ETag"), self._read_limited(url, resp)
+        except urllib.error.HTTPError as e:
+            return e.code, None, b""
+
+    def _check_length(self, url: str, content_length: Optional[str]) -> None:
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            raise ValueError(f"Audio URL is larger than max_bytes={self.max_bytes}: {url} ({content_length} bytes)")
+
+    def _read_limited(self, url: str, resp) -> bytes:
+        parts = []
+        size = 0
+        while True:
+            block = resp.read(_READ_BLOCK)
+            if not block:
+                break
+            size += len(block)
+            if size > self.max_bytes:
+                raise ValueError(f"Audio URL is larger than max_bytes={self.max_bytes}: {url}")
+            parts.append(block)
+        return b"".join(parts)
+
+    def _read_cache(self, url: str, with_body: bool) -> Tuple[Optional[str], bytes]:
+        # cache file layout: ETag line, then the body
+        path = self._cache_path(url)
+        try:
+            with open(path, "rb") as f:
+                etag = f.readline().decode("utf-8").rstrip("\n")
+                body = f.read() if with_body else b""
+            if with_body:
+                os.utime(path)  # mtime orders the LRU eviction
+        except OSError:
+            return None, b""
+        return (etag or None), body
+
+    def _write_cache(self, url: str, etag: str, body: bytes) -> None:
+        path = self._cache_path(url)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(etag.replace("\n", "").encode("utf-8") + b"\n")
+            f.write(body)
+        os.replace(tmp, path)
+        self._evict_cache()
+
+    def _evict_cache(self) -> None:
+        if self.max_cache_bytes is None and self.max_cache_entries is None:
+            return
+        with self._cache_lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".audio"):
+                    try:
+                        st = os.stat(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, name))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            while entries and (
+                (self.max_cache_bytes is not None and total > self.max_cache_bytes)
+                or (self.max_cache_entries is not None and len(entries) > self.max_cache_entries)
+            ):
+                _, size, name = entries.pop(0)
+                total -= size
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+
+_default_fetcher: Optional[AudioFetcher] = None
+_default_lock = threading.Lock()
+
+
+def get_default_audio_fetcher() -> AudioFetcher:
+    """
+    Return the process-wide fetcher used for URL audio inputs, creating it on first use.
+    """
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = AudioFetcher()
+        return _default_fetcher
+
+
+def set_default_audio_fetcher(fetcher: AudioFetcher) -> None:
+    """
+    Replace the process-wide fetcher used for URL audio inputs (e.g. to set limits or a cache dir).
+    """
+    global _default_fetcher
+    with _default_lock:
+        _default_fetcher = fetcher
@@ -0,0 +1,181 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Stage names recorded by transcribe(). Stages do not overlap within one thread; decoding runs on
+# decode_workers threads and alignment may run on its own thread (pipeline_alignment), so their
+# sums can exceed wall time.
+STAGES = (
+    "decode",       # reading / fetching / decoding input audio
+    "resample",     # resampling to 16 kHz
+    "split",        # chunk boundary search and VAD
+    "features",     # processor: prompts and mel features (transformers backend)
+    "encoder",      # audio encoder forward (transformers backend)
+    "prefill",      # first LM step without the encoder (transformers backend)
+    "decode_loop",  # remaining generation steps (transformers backend)
+    "generate",     # whole engine call (vLLM backend: encoder, prefill and decode loop)
+    "parse",        # parsing raw outputs into language / text
+    "align",        # forced alignment
+)
+
+
+@dataclass
+class TranscribeMetrics:
+    """
+    Measurements of one transcribe() call (or, for transcribe_iter(), of the work since the last report).
+
+    Attributes:
+        stage_seconds: Seconds spent per stage, keyed by the names in STAGES (absent if not run).
+        total_seconds: Wall time of the call.
+        num_inputs: Number of input audios.
+        num_chunks: Number of chunks fed to the model.
+        audio_seconds: Duration of the chunked audio.
+        generated_tokens: Tokens generated by the ASR model.
+        batch_sizes: Size of every ASR batch.
+        batch_capacity: max_inference_batch_size of the model (0 if unbounded).
+    """
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    total_seconds: float = 0.0
+    num_inputs: int = 0
+    num_chunks: int = 0
+    audio_seconds: float = 0.0
+    generated_tokens: int = 0
+    batch_sizes: List[int] = field(default_factory=list)
+    batch_capacity: int = 0
+
+    @property
+    def real_time_factor(self) -> float:
+        return self.total_seconds / self.audio_seconds if self.audio_seconds > 0 else 0.0
+
+    @property
+    def batch_occupancy(self) -> float:
+        """
+        Mean fill ratio of ASR batches relative to batch_capacity (1.0 when unbounded).
+        """
+        if not self.batch_sizes or self.batch_capacity <= 0:
+            return 1.0
+        return sum(self.batch_sizes) / (len(self.batch_sizes) * self.batch_capacity)
+
+
+MetricsHook = Callable[[TranscribeMetrics], None]
+
+
+class MetricsRecorder:
+    """
+    Thread-safe accumulator behind TranscribeMetrics.
+
+    A recorder is made current for a thread with recording(); instrumented code reports through the
+    module-level stage() / record() helpers, which are no-ops when no recorder is current.
+    """
+
+    def __init__(self, batch_capacity: int = 0):
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self.metrics = TranscribeMetrics(batch_capacity=max(0, int(batch_capacity)))
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.metrics.stage_seconds[name] = self.metrics.stage_seconds.get(name, 0.0) + seconds
+
+    def stage_total(self, name: str) -> float:
+        with self._lock:
+            return self.metrics.stage_seconds.get(name, 0.0)
+
+    def add(self, name: str, value: Any) -> None:
+        """
+        Add value to a counter field of TranscribeMetrics, or append it for batch_sizes.
+        """
+        with self._lock:
+            if name == "batch_sizes":
+                self.metrics.batch_sizes.append(int(value))
+            else:
+                setattr(self.metrics, name, getattr(self.metrics, name) + value)
+
+    def finish(self) -> TranscribeMetrics:
+        """
+        Stamp the wall time and return the metrics. The recorder starts over for the next report.
+        """
+        with self._lock:
+            metrics = self.metrics
+            now = time.perf_counter()
+            metrics.total_seconds = now - self._start
+            self._start = now
+            self.metrics = TranscribeMetrics(batch_capacity=metrics.batch_capacity)
+        return metrics
+
+
+_local = threading.local()
+
+
+def current_recorder() -> Optional[MetricsRecorder]:
+    return getattr(_local, "recorder", None)
+
+
+@contextmanager
+def recording(recorder: Optional[MetricsRecorder]) -> Iterator[Optional[MetricsRecorder]]:
+    """
+    Make recorder current for this thread (None disables recording) and restore the previous one.
+    """
+    previous = current_recorder()
+    _local.recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _local.recorder = previous
+
+
+def bind_recorder(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap fn so that it runs with this thread's current recorder, e.g. before handing it to a pool.
+    """
+    recorder = current_recorder()
+    if recorder is None:
+        return fn
+
+    def bound(*args, **kwargs):
+        with recording(recorder):
+            return fn(*args, **kwargs)
+
+    return bound
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block as stage `name` of the current recorder, if any.
+    """
+    recorder = current_recorder()
+    if recorder is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_stage(name, time.perf_counter() - t0)
+
+
+def record(name: str, value: Any) -> None:
+    """
+    Add value to counter `name` of the current recorder, if any.
+    """
+    recorder = current_recorder()
+    if recorder is not None:
+        recorder.add(name, value)
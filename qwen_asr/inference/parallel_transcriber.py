@@ -0,0 +1,138 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .utils import AudioChunk, AudioLike, ensure_list, iter_audio_chunks
+
+_DEFAULT_BATCH_SIZE = 8
+
+
+class ParallelTranscriber:
+    """
+    Transcribe long inputs by fanning their chunks out over several model workers.
+
+    Qwen3ASRModel.transcribe() runs every chunk of a 2-hour file on one model. Here the inputs are cut
+    into the same AudioChunk records, the chunks are dispatched in batches to whichever worker is
+    free, and the per-chunk language/text/timestamps are merged back in (orig_index, chunk_index)
+    order, exactly as transcribe() would.
+
+    Workers are typically the same checkpoint loaded once per device. Each gets its own driver
+    thread; the heavy work releases the GIL (CUDA kernels, vLLM engine, torch CPU ops). Any object
+    with Qwen3ASRModel.transcribe_chunks() works as a worker, e.g. a proxy to a model living in
+    another process. Decoding settings (decode_workers, resample_quality, audio_cache) are taken
+    from the first worker.
+
+    Example:
+        workers = [Qwen3ASRModel.from_pretrained(path, device_map=f"cuda:{i}", ...) for i in range(4)]
+        transcriber = ParallelTranscriber(workers)
+        result = transcriber.transcribe("meeting_2h.wav", max_chunk_sec=60, chunk_overlap_sec=2)[0]
+        transcriber.close()
+    """
+
+    def __init__(self, workers: Sequence[Any], batch_size: Optional[int] = None):
+        """
+        Args:
+            workers:
+                Qwen3ASRModel instances (or objects with the same transcribe_chunks()).
+            batch_size:
+                Chunks per dispatched batch. Defaults to the first worker's max_inference_batch_size,
+                or 8 if that is unbounded.
+        """
+        if not workers:
+            raise ValueError("ParallelTranscriber needs at least one worker.")
+        self.workers = list(workers)
+        primary = self.workers[0]
+        if batch_size is None:
+            batch_size = primary.max_inference_batch_size
+            if batch_size <= 0:
+                batch_size = _DEFAULT_BATCH_SIZE
+        if int(batch_size) <= 0:
+            raise ValueError(f"batch_size must be > 0, got: {batch_size}")
+        self.batch_size = int(batch_size)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.workers), thread_name_prefix="qwen-asr-worker")
+
+    def transcribe(
+        self,
+        audio: Union[AudioLike, List[AudioLike]],
+        context: Union[str, List[str]] = "",
+        language: Optional[Union[str, List[Optional[str]]]] = None,
+        return_time_stamps: bool = False,
+        max_chunk_sec: Optional[float] = None,
+        chunk_overlap_sec: float = 0.0,
+    ) -> List[Any]:
+        """
+        Same arguments and results as Qwen3ASRModel.transcribe() (without VAD mode).
+
+        Batches are dispatched while later inputs are still being decoded.
+
+        Returns:
+            List[ASRTranscription]: One result per input audio.
+        """
+        primary = self.workers[0]
+        if return_time_stamps and any(getattr(w, "forced_aligner", None) is None for w in self.workers):
+            raise ValueError("return_time_stamps=True requires every worker to have a `forced_aligner`.")
+
+        items = ensure_list(audio)
+        n = len(items)
+        ctxs, langs_norm = primary._prepare_requests(n, context, language)
+        max_chunk_sec = primary._chunk_length(max_chunk_sec, chunk_overlap_sec)
+
+        # batch start index -> results; filled by the worker threads
+        todo: "queue.Queue[Optional[Tuple[int, List[AudioChunk]]]]" = queue.Queue()
+        done: Dict[int, List[Tuple[str, str, Optional[Any]]]] = {}
+
+        def drain(worker: Any) -> None:
+            while True:
+                job = todo.get()
+                if job is None:
+                    return
+                start, batch = job
+                done[start] = worker.transcribe_chunks(batch, ctxs, langs_norm, return_time_stamps=return_time_stamps)
+
+        futures = [self._executor.submit(drain, w) for w in self.workers]
+        chunks: List[AudioChunk] = []
+        dispatched = 0
+        try:
+            parts_iter = iter_audio_chunks(
+                items,
+                max_chunk_sec,
+                num_workers=primary.decode_workers,
+                resample_quality=primary.resample_quality,
+                cache=primary.audio_cache,
+                overlap_sec=chunk_overlap_sec,
+            )
+            for i, parts in enumerate(parts_iter):
+                chunks.extend(primary._make_audio_chunks(i, parts))
+                while len(chunks) - dispatched >= self.batch_size:
+                    todo.put((dispatched, chunks[dispatched : dispatched + self.batch_size]))
+                    dispatched += self.batch_size
+            if dispatched < len(chunks):
+                todo.put((dispatched, chunks[dispatched:]))
+        finally:
+            for _ in self.workers:
+                todo.put(None)
+        for f in futures:
+            f.result()
+
+        chunk_results: List[Tuple[str, str, Optional[Any]]] = []
+        for start in sorted(done):
+            chunk_results.extend(done[start])
+        return primary._merge_chunk_results(n, chunks, chunk_results, return_time_stamps, chunk_overlap_sec)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
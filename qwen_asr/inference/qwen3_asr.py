@@ -13,8 +13,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import functools
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -23,27 +29,35 @@ from qwen_asr.core.transformers_backend import (
     Qwen3ASRForConditionalGeneration,
     Qwen3ASRProcessor,
 )
-from transformers import AutoConfig, AutoModel, AutoProcessor
+from transformers import AutoConfig, AutoModel, AutoProcessor, LogitsProcessor, LogitsProcessorList
 
 AutoConfig.register("qwen3_asr", Qwen3ASRConfig)
 AutoModel.register(Qwen3ASRConfig, Qwen3ASRForConditionalGeneration)
 AutoProcessor.register(Qwen3ASRConfig, Qwen3ASRProcessor)
 
+from .audio_cache import DecodedAudioCache
+from .metrics import MetricsHook, MetricsRecorder, bind_recorder, current_recorder, record, recording, stage
 from .qwen3_forced_aligner import Qwen3ForcedAligner
 from .utils import (
     MAX_ASR_INPUT_SECONDS,
-    MAX_FORCE_ALIGN_INPUT_SECONDS,
+    PCM_BUFFER_TYPES,
     SAMPLE_RATE,
     SUPPORTED_LANGUAGES,
     AudioChunk,
     AudioLike,
     chunk_list,
+    ensure_list,
+    find_overlap_cut,
+    is_single_audio,
+    iter_audio_chunks,
+    make_length_batches,
+    map_chunk_time,
     merge_languages,
-    normalize_audios,
     normalize_language_name,
     parse_asr_output,
-    split_audio_into_chunks,
+    pcm_from_buffer,
     validate_language,
+    validate_resample_quality,
 )
 
 try:
@@ -54,6 +68,74 @@ except:
     pass
 
 
+# audio tower attribute holding the shared encoder timing hooks, see _install_encoder_timer()
+_ENCODER_TIMER_ATTR = "_qwen_asr_encoder_timer"
+
+
+@dataclass
+class _EncoderTimer:
+    handles: List[Any]
+    users: Any  # weakref.WeakSet of Qwen3ASRModel
+
+
+# ASR batch size for pipeline_alignment when max_inference_batch_size is unbounded
+_PIPELINE_BATCH_SIZE = 32
+
+
+def _records_metrics(method):
+    """
+    Run a transcribe-like method under a MetricsRecorder and report it to the model's metrics hooks.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.metrics_hooks:
+            return method(self, *args, **kwargs)
+        recorder = self._new_metrics_recorder()
+        with recording(recorder):
+            result = method(self, *args, **kwargs)
+        self._report_metrics(recorder)
+        return result
+
+    return wrapper
+
+
+class _FirstStepTimer(LogitsProcessor):
+    """
+    Logits processor that only notes when the first generation step (prefill) has produced logits.
+    """
+
+    def __init__(self):
+        self.first_step_at: Optional[float] = None
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        if self.first_step_at is None:
+            if scores.is_cuda:
+                torch.cuda.synchronize(scores.device)
+            self.first_step_at = time.perf_counter()
+        return scores
+
+
+def _sync_device(device: Any) -> None:
+    if device is not None and torch.device(device).type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def _word_offsets(text: str, words: List[str]) -> List[int]:
+    """Character offset in text of each aligned word, searched in order; an unmatched word takes the end of the previous match."""
+    low = text.lower()
+    out: List[int] = []
+    pos = 0
+    for w in words:
+        found = low.find(w.lower(), pos) if w else -1
+        if found >= 0:
+            pos = found
+            out.append(found)
+            pos += len(w)
+        else:
+            out.append(pos)
+    return out
+
+
 @dataclass
 class ASRTranscription:
     """
@@ -109,6 +191,22 @@ class ASRStreamingState:
         _raw_decoded (str):
             Internal accumulated decoded raw text (before parse_asr_output normalization).
             Used for rollback/token trimming and as prefix for prompting.
+        _raw_decoded_ids (Optional[List[int]]):
+            Internal token ids of _raw_decoded (prefix ids + generated ids), so prefix rollback is a
+            slice instead of a full tokenizer round-trip. None if the backend did not return ids.
+        max_window_samples (int):
+            Bounded streaming mode: commit and drop audio once audio_accum reaches this many samples
+            (see init_streaming_state(max_window_sec=...)). 0 means unbounded.
+        context_tail_chars (int):
+            Number of trailing committed characters carried into the prompt context after a commit.
+        committed_text (str):
+            Text of committed segments. It is never re-decoded; state.text = committed_text + current text.
+        committed_language (str):
+            Merged language string of committed segments.
+        segment_chunk_id (int):
+            Number of chunks decoded since the last commit (equals chunk_id in unbounded mode).
+        finished (bool):
+            Set by finish_streaming_transcribe(); a finished stream accepts no more audio.
     """
     unfixed_chunk_num: int
     unfixed_token_num: int
@@ -127,6 +225,14 @@ class ASRStreamingState:
     text: str
     _raw_decoded: str
 
+    _raw_decoded_ids: Optional[List[int]] = None
+    max_window_samples: int = 0
+    context_tail_chars: int = 64
+    committed_text: str = ""
+    committed_language: str = ""
+    segment_chunk_id: int = 0
+    finished: bool = False
+
 
 class Qwen3ASRModel:
     """
@@ -151,6 +257,12 @@ class Qwen3ASRModel:
         forced_aligner: Optional[Qwen3ForcedAligner] = None,
         max_inference_batch_size: int = -1,
         max_new_tokens: int = 512,
+        sort_by_length: bool = False,
+        max_inference_batch_seconds: Optional[float] = None,
+        decode_workers: int = 0,
+        resample_quality: str = "high",
+        audio_cache: Optional[DecodedAudioCache] = None,
+        pipeline_alignment: bool = False,
     ):
         self.backend = backend  # "transformers" | "vllm"
         self.model = model
@@ -159,6 +271,15 @@ class Qwen3ASRModel:
         self.forced_aligner = forced_aligner
         self.max_inference_batch_size = int(max_inference_batch_size)
         self.max_new_tokens = max_new_tokens
+        self.sort_by_length = bool(sort_by_length)
+        self.max_inference_batch_seconds = max_inference_batch_seconds
+        self.decode_workers = max(0, int(decode_workers))
+        validate_resample_quality(resample_quality)
+        self.resample_quality = resample_quality
+        self.audio_cache = audio_cache
+        self.pipeline_alignment = bool(pipeline_alignment)
+        self._aligner_streams: Dict[Any, Any] = {}
+        self.metrics_hooks: List[MetricsHook] = []
 
         if backend == "transformers":
             self.device = getattr(model, "device", None)
@@ -172,6 +293,81 @@ class Qwen3ASRModel:
             self.device = None
             self.dtype = None
 
+    def add_metrics_hook(self, hook: MetricsHook) -> None:
+        """
+        Register a callback receiving a TranscribeMetrics after every transcribe() call (and after
+        each batch of results yielded by transcribe_iter()).
+
+        Per-stage timings, token counts, audio seconds and batch sizes are only collected while at
+        least one hook is registered; on CUDA, stage boundaries inside generation then synchronize
+        the device.
+
+        Example:
+            asr.add_metrics_hook(lambda m: print(m.real_time_factor, m.stage_seconds))
+        """
+        if not self.metrics_hooks:
+            self._install_encoder_timer()
+        self.metrics_hooks.append(hook)
+
+    def remove_metrics_hook(self, hook: MetricsHook) -> None:
+        self.metrics_hooks.remove(hook)
+        if not self.metrics_hooks:
+            self._remove_encoder_timer()
+
+    def _new_metrics_recorder(self) -> MetricsRecorder:
+        return MetricsRecorder(batch_capacity=self.max_inference_batch_size)
+
+    def _report_metrics(self, recorder: MetricsRecorder) -> None:
+        metrics = recorder.finish()
+        for hook in list(self.metrics_hooks):
+            hook(metrics)
+
+    def _audio_tower(self) -> Optional[torch.nn.Module]:
+        audio_tower = getattr(getattr(self.model, "thinker", None), "audio_tower", None)
+        return audio_tower if isinstance(audio_tower, torch.nn.Module) else None
+
+    def _install_encoder_timer(self) -> None:
+        # Times the audio tower while a recorder is active. The hooks live on the module, once, however
+        # many wrappers share it; each wrapper with metrics hooks counts as one user.
+        audio_tower = self._audio_tower()
+        if audio_tower is None:
+            return
+        timer = getattr(audio_tower, _ENCODER_TIMER_ATTR, None)
+        if timer is None:
+            local = threading.local()
+            device = self.device
+
+            def pre_hook(module, args):
+                local.start = None
+                if current_recorder() is not None:
+                    _sync_device(device)
+                    local.start = time.perf_counter()
+
+            def post_hook(module, args, output):
+                t0 = getattr(local, "start", None)
+                recorder = current_recorder()
+                if t0 is not None and recorder is not None:
+                    _sync_device(device)
+                    recorder.add_stage("encoder", time.perf_counter() - t0)
+
+            timer = _EncoderTimer(
+                handles=[audio_tower.register_forward_pre_hook(pre_hook), audio_tower.register_forward_hook(post_hook)],
+                users=weakref.WeakSet(),
+            )
+            setattr(audio_tower, _ENCODER_TIMER_ATTR, timer)
+        timer.users.add(self)
+
+    def _remove_encoder_timer(self) -> None:
+        audio_tower = self._audio_tower()
+        timer = getattr(audio_tower, _ENCODER_TIMER_ATTR, None) if audio_tower is not None else None
+        if timer is None:
+            return
+        timer.users.discard(self)
+        if not timer.users:
+            for handle in timer.handles:
+                handle.remove()
+            delattr(audio_tower, _ENCODER_TIMER_ATTR)
+
     @classmethod
     def from_pretrained(
         cls,
@@ -180,6 +376,13 @@ class Qwen3ASRModel:
         forced_aligner_kwargs: Optional[Dict[str, Any]] = None,
         max_inference_batch_size: int = 32,
         max_new_tokens: Optional[int] = 512,
+        sort_by_length: bool = False,
+        max_inference_batch_seconds: Optional[float] = None,
+        batch_audio_encoder: bool = False,
+        decode_workers: int = 0,
+        resample_quality: str = "high",
+        audio_cache: Optional[DecodedAudioCache] = None,
+        pipeline_alignment: bool = False,
         **kwargs,
     ) -> "Qwen3ASRModel":
         """
@@ -196,6 +399,29 @@ class Qwen3ASRModel:
                 Batch size limit for inference. -1 means no chunking. Small values can avoid OOM.
             max_new_tokens:
                 Maximum number of tokens to generate.
+            sort_by_length:
+                If True, chunks are bucketed by audio duration before batching (results keep input order),
+                so short clips are not padded to the length of a long one.
+            max_inference_batch_seconds:
+                Optional padded-audio budget per batch in seconds (batch size x longest item).
+                Batches are then sized by total frames rather than only by max_inference_batch_size.
+            batch_audio_encoder:
+                If True, the audio encoder runs once per batch instead of once per audio.
+            decode_workers:
+                Number of threads decoding/resampling input audio. With > 0, inference on earlier
+                batches overlaps with decoding of later inputs. 0 decodes serially.
+            resample_quality:
+                Resampler for non-16k input: "high" (librosa/soxr HQ, default), "fast"
+                (soxr LQ) or "polyphase" (scipy polyphase FIR with cached filter taps).
+            audio_cache:
+                Optional DecodedAudioCache shared across calls (and with the forced aligner), so
+                repeated inputs skip decoding and resampling.
+            pipeline_alignment:
+                If True, with return_time_stamps=True each ASR batch is handed to the forced aligner on
+                a worker thread (own CUDA stream) while the next batch is transcribed, so latency
+                approaches the slower of the two models instead of their sum. Works best with the
+                aligner on its own device (forced_aligner_kwargs={"device_map": "cuda:1"}). With an
+                unbounded max_inference_batch_size, chunks are pipelined in batches of 32.
             **kwargs:
                 Forwarded to AutoModel.from_pretrained(...).
 
@@ -204,13 +430,14 @@ class Qwen3ASRModel:
         """
 
         model = AutoModel.from_pretrained(pretrained_model_name_or_path, **kwargs)
+        model.thinker.batch_audio_encoder = bool(batch_audio_encoder)
 
         processor = AutoProcessor.from_pretrained(pretrained_model_name_or_path, fix_mistral_regex=True)
 
         forced_aligner_model = None
         if forced_aligner is not None:
             forced_aligner_model = Qwen3ForcedAligner.from_pretrained(
-                forced_aligner, **(forced_aligner_kwargs or {})
+                forced_aligner, **{"audio_cache": audio_cache, **(forced_aligner_kwargs or {})}
             )
 
         return cls(
@@ -221,6 +448,12 @@ class Qwen3ASRModel:
             forced_aligner=forced_aligner_model,
             max_inference_batch_size=max_inference_batch_size,
             max_new_tokens=max_new_tokens,
+            sort_by_length=sort_by_length,
+            max_inference_batch_seconds=max_inference_batch_seconds,
+            decode_workers=decode_workers,
+            resample_quality=resample_quality,
+            audio_cache=audio_cache,
+            pipeline_alignment=pipeline_alignment,
         )
 
     @classmethod
@@ -231,6 +464,11 @@ class Qwen3ASRModel:
         forced_aligner_kwargs: Optional[Dict[str, Any]] = None,
         max_inference_batch_size: int = -1,
         max_new_tokens: Optional[int] = 4096,
+        encoder_window_cache_size: int = 0,
+        decode_workers: int = 0,
+        resample_quality: str = "high",
+        audio_cache: Optional[DecodedAudioCache] = None,
+        pipeline_alignment: bool = False,
         **kwargs,
     ) -> "Qwen3ASRModel":
         """
@@ -249,6 +487,26 @@ class Qwen3ASRModel:
                 Batch size limit for inference. -1 means no chunking. Small values can avoid OOM.
             max_new_tokens:
                 Maximum number of tokens to generate.
+            encoder_window_cache_size:
+                Number of completed audio encoder attention windows to cache inside the engine.
+                Streaming ASR re-feeds the whole stream on every chunk; with the cache enabled only
+                the new tail windows are encoded, so per-chunk encoder cost stays flat.
+                0 disables the cache.
+            decode_workers:
+                Number of threads decoding/resampling input audio. With > 0, inference on earlier
+                batches overlaps with decoding of later inputs. 0 decodes serially.
+            resample_quality:
+                Resampler for non-16k input: "high" (librosa/soxr HQ, default), "fast"
+                (soxr LQ) or "polyphase" (scipy polyphase FIR with cached filter taps).
+            audio_cache:
+                Optional DecodedAudioCache shared across calls (and with the forced aligner), so
+                repeated inputs skip decoding and resampling.
+            pipeline_alignment:
+                If True, with return_time_stamps=True each ASR batch is handed to the forced aligner on
+                a worker thread (own CUDA stream) while the next batch is transcribed, so latency
+                approaches the slower of the two models instead of their sum. Works best with the
+                aligner on its own device (forced_aligner_kwargs={"device_map": "cuda:1"}). With an
+                unbounded max_inference_batch_size, chunks are pipelined in batches of 32.
             **kwargs:
                 Forwarded to vllm.LLM(...).
 
@@ -266,6 +524,15 @@ class Qwen3ASRModel:
                 "vLLM is not available. Install with: pip install qwen-asr[vllm]"
             ) from e
 
+        if encoder_window_cache_size and int(encoder_window_cache_size) > 0:
+            hf_overrides = dict(kwargs.pop("hf_overrides", None) or {})
+            thinker_overrides = dict(hf_overrides.get("thinker_config", {}))
+            audio_overrides = dict(thinker_overrides.get("audio_config", {}))
+            audio_overrides["window_cache_size"] = int(encoder_window_cache_size)
+            thinker_overrides["audio_config"] = audio_overrides
+            hf_overrides["thinker_config"] = thinker_overrides
+            kwargs["hf_overrides"] = hf_overrides
+
         llm = vLLM(model=model, **kwargs)
 
         processor = Qwen3ASRProcessor.from_pretrained(model, fix_mistral_regex=True)
@@ -274,7 +541,7 @@ class Qwen3ASRModel:
         forced_aligner_model = None
         if forced_aligner is not None:
             forced_aligner_model = Qwen3ForcedAligner.from_pretrained(
-                forced_aligner, **(forced_aligner_kwargs or {})
+                forced_aligner, **{"audio_cache": audio_cache, **(forced_aligner_kwargs or {})}
             )
 
         return cls(
@@ -285,6 +552,10 @@ class Qwen3ASRModel:
             forced_aligner=forced_aligner_model,
             max_inference_batch_size=max_inference_batch_size,
             max_new_tokens=None,
+            decode_workers=decode_workers,
+            resample_quality=resample_quality,
+            audio_cache=audio_cache,
+            pipeline_alignment=pipeline_alignment,
         )
 
     def get_supported_languages(self) -> List[str]:
@@ -297,12 +568,17 @@ class Qwen3ASRModel:
         return list(SUPPORTED_LANGUAGES)
 
     @torch.no_grad()
+    @_records_metrics
     def transcribe(
         self,
         audio: Union[AudioLike, List[AudioLike]],
         context: Union[str, List[str]] = "",
         language: Optional[Union[str, List[Optional[str]]]] = None,
         return_time_stamps: bool = False,
+        vad: bool = False,
+        vad_options: Optional[Dict[str, Any]] = None,
+        max_chunk_sec: Optional[float] = None,
+        chunk_overlap_sec: float = 0.0,
     ) -> List[ASRTranscription]:
         """
         Transcribe audio with optional context and optional forced alignment timestamps.
@@ -321,7 +597,23 @@ class Qwen3ASRModel:
                 If provided, the prompt will force output to be transcription text only.
             return_time_stamps:
                 If True, timestamps are produced via forced aligner and merged across chunks.
-                This requires forced_aligner initialized.
+                This requires forced_aligner initialized. ASR chunks keep their usual length; the
+                aligner covers chunks above MAX_FORCE_ALIGN_INPUT_SECONDS window by window.
+            vad:
+                If True, non-speech spans are detected with an energy VAD and dropped; speech is packed
+                into chunks (up to the usual chunk length) and timestamps are mapped back to the
+                original timeline. Audio without any detected speech returns empty text.
+            vad_options:
+                Optional detect_speech_segments() options (threshold_db, min_silence_ms, pad_ms, ...).
+            max_chunk_sec:
+                Optional chunk length for long audio, in seconds. Defaults to (and is capped at) the
+                model input limit. Shorter chunks batch with less padding, especially with
+                chunk_overlap_sec to hide the extra boundaries.
+            chunk_overlap_sec:
+                If > 0, adjacent chunks share this much audio, so words cut at a boundary are heard
+                whole by one of them. The duplicated text is matched with find_overlap_cut() and text
+                and timestamps are handed over at the same word (the middle of the shared audio if the
+                texts do not match). Not supported with vad=True.
 
         Returns:
             List[ASRTranscription]: One result per input audio.
@@ -331,13 +623,233 @@ class Qwen3ASRModel:
                 - If return_time_stamps=True but forced_aligner is not provided.
                 - If language is unsupported.
                 - If batch sizes mismatch for context/language.
+                - If chunk_overlap_sec is negative, not below half the chunk length, or used with vad.
         """
         if return_time_stamps and self.forced_aligner is None:
             raise ValueError("return_time_stamps=True requires `forced_aligner` to be provided at initialization.")
+        if chunk_overlap_sec and vad:
+            raise ValueError("chunk_overlap_sec is not supported with vad=True.")
+
+        items = ensure_list(audio)
+        n = len(items)
+        ctxs, langs_norm = self._prepare_requests(n, context, language)
+        max_chunk_sec = self._chunk_length(max_chunk_sec, chunk_overlap_sec)
+        record("num_inputs", n)
+
+        # Full batches can run while later inputs are still decoding, unless batching needs all
+        # chunk lengths up front (length sorting / seconds budget).
+        stream_batches = (
+            self.decode_workers > 0
+            and self.max_inference_batch_size > 0
+            and not self.sort_by_length
+            and self.max_inference_batch_seconds is None
+        )
+
+        # alignment of finished ASR batches overlaps with transcription of the next ones
+        aligner_pool = None
+        if return_time_stamps and self.pipeline_alignment:
+            aligner_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qwen-asr-align")
+        aligned: List[Tuple[List[int], Future]] = []
+
+        def run_asr(idx: List[int]) -> None:
+            outs = self._infer_chunks([chunks[k] for k in idx], ctxs, langs_norm)
+            # idx is the next contiguous range, except for the final pipelined batches (which may be
+            # length-sorted); raw_outputs is only read back on the non-pipelined path
+            raw_outputs.extend(outs)
+            if aligner_pool is not None:
+                sub = [chunks[k] for k in idx]
+                finish = bind_recorder(self._finish_chunks_on_stream)
+                aligned.append((idx, aligner_pool.submit(finish, sub, outs, langs_norm)))
+
+        # chunk audios and record mapping, run ASR on chunks
+        chunks: List[AudioChunk] = []
+        raw_outputs: List[str] = []
+        # long local files are read and split window by window instead of being decoded whole
+        parts_iter = iter_audio_chunks(
+            items,
+            max_chunk_sec,
+            num_workers=self.decode_workers,
+            resample_quality=self.resample_quality,
+            cache=self.audio_cache,
+            vad_options=(dict(vad_options or {}) if vad else None),
+            overlap_sec=chunk_overlap_sec,
+        )
+        try:
+            for i, parts in enumerate(parts_iter):
+                chunks.extend(self._make_audio_chunks(i, parts))
+                while stream_batches and len(chunks) - len(raw_outputs) >= self.max_inference_batch_size:
+                    start = len(raw_outputs)
+                    run_asr(list(range(start, start + self.max_inference_batch_size)))
+
+            rest = list(range(len(raw_outputs), len(chunks)))
+            if aligner_pool is None:
+                run_asr(rest)
+                chunk_results = self._finish_chunks(chunks, raw_outputs, langs_norm, return_time_stamps)
+            else:
+                # one ASR call per batch, so each batch can go to the aligner as soon as it decodes;
+                # an unbounded batch size would give one batch and nothing to overlap
+                size = self.max_inference_batch_size
+                size = size if size > 0 else _PIPELINE_BATCH_SIZE
+                for batch in self._make_batches([chunks[k].wav.shape[0] for k in rest], max_batch_size=size):
+                    run_asr([rest[b] for b in batch])
+                chunk_results: List[Any] = [None] * len(chunks)
+                for idx, future in aligned:
+                    for k, r in zip(idx, future.result()):
+                        chunk_results[k] = r
+        finally:
+            if aligner_pool is not None:
+                aligner_pool.shutdown(wait=True)
+
+        return self._merge_chunk_results(n, chunks, chunk_results, return_time_stamps, chunk_overlap_sec)
+
+    def transcribe_iter(
+        self,
+        audio: Union[AudioLike, Iterable[AudioLike]],
+        context: str = "",
+        language: Optional[str] = None,
+        return_time_stamps: bool = False,
+        vad: bool = False,
+        vad_options: Optional[Dict[str, Any]] = None,
+        max_chunk_sec: Optional[float] = None,
+        chunk_overlap_sec: float = 0.0,
+    ) -> Iterator[ASRTranscription]:
+        """
+        Like transcribe(), but consume inputs lazily and yield each result as soon as it is ready.
+
+        Inputs are pulled from the iterable only as decoding and batching need them, chunks are
+        batched across consecutive inputs (max_inference_batch_size chunks per ASR call; one input
+        per call if unbounded), and every input whose chunks are all decoded is aligned (optional),
+        merged and yielded right away. Memory therefore stays flat for arbitrarily long manifests.
+
+        Args:
+            audio:
+                Iterable of audio inputs (list, generator, ...) or a single input.
+            context:
+                Context string used for every input.
+            language:
+                Optional forced language used for every input.
+            return_time_stamps, vad, vad_options, max_chunk_sec, chunk_overlap_sec:
+                Same as transcribe().
+
+        Yields:
+            ASRTranscription: One result per input audio, in input order.
+
+        Example:
+            for path, result in zip(paths, asr.transcribe_iter(iter(paths))):
+                writer.write(path, result.text)
+        """
+        if return_time_stamps and self.forced_aligner is None:
+            raise ValueError("return_time_stamps=True requires `forced_aligner` to be provided at initialization.")
+        if chunk_overlap_sec and vad:
+            raise ValueError("chunk_overlap_sec is not supported with vad=True.")
+        # every input is merged on its own, so all chunks use orig_index 0 into these one-element lists
+        ctxs, langs_norm = self._prepare_requests(1, context, language)
+        max_chunk_sec = self._chunk_length(max_chunk_sec, chunk_overlap_sec)
+        if is_single_audio(audio):
+            audio = [audio]
+        items = audio if isinstance(audio, list) else iter(audio)
+        batch_size = self.max_inference_batch_size
+
+        # chunks of inputs not yielded yet, in order; sizes holds their chunk count per input
+        chunks: List[AudioChunk] = []
+        raw_outputs: List[str] = []
+        sizes: Deque[int] = deque()
+
+        def ready() -> List[ASRTranscription]:
+            # inputs whose chunks are all decoded, aligned together
+            k, m = 0, 0
+            while k < len(sizes) and m + sizes[k] <= len(raw_outputs):
+                m += sizes[k]
+                k += 1
+            if k == 0:
+                return []
+            results = self._finish_chunks(chunks[:m], raw_outputs[:m], langs_norm, return_time_stamps)
+            done = chunks[:m]
+            del chunks[:m], raw_outputs[:m]
+            out: List[ASRTranscription] = []
+            pos = 0
+            for _ in range(k):
+                size = sizes.popleft()
+                out.extend(self._merge_chunk_results(
+                    1, done[pos : pos + size], results[pos : pos + size], return_time_stamps, chunk_overlap_sec,
+                ))
+                pos += size
+            record("num_inputs", k)
+            return out
+
+        def groups() -> Iterator[List[ASRTranscription]]:
+            parts_iter = iter_audio_chunks(
+                items,
+                max_chunk_sec,
+                num_workers=self.decode_workers,
+                resample_quality=self.resample_quality,
+                cache=self.audio_cache,
+                vad_options=(dict(vad_options or {}) if vad else None),
+                overlap_sec=chunk_overlap_sec,
+            )
+            for parts in parts_iter:
+                chunks.extend(self._make_audio_chunks(0, parts))
+                sizes.append(len(parts))
+                if batch_size <= 0:
+                    raw_outputs.extend(self._infer_chunks(chunks[len(raw_outputs) :], ctxs, langs_norm))
+                else:
+                    while len(chunks) - len(raw_outputs) >= batch_size:
+                        start = len(raw_outputs)
+                        raw_outputs.extend(self._infer_chunks(chunks[start : start + batch_size], ctxs, langs_norm))
+                yield ready()
+            raw_outputs.extend(self._infer_chunks(chunks[len(raw_outputs) :], ctxs, langs_norm))
+            yield ready()
+
+        # the recorder (and no_grad, which a decorator on this generator would not cover) is only
+        # current while inference runs, not while the caller holds a result
+        recorder = self._new_metrics_recorder() if self.metrics_hooks else None
+        steps = groups()
+        while True:
+            with recording(recorder), torch.no_grad():
+                group = next(steps, None)
+            if group is None:
+                return
+            if group:
+                if recorder is not None:
+                    self._report_metrics(recorder)
+                yield from group
+
+    def transcribe_chunks(
+        self,
+        chunks: List[AudioChunk],
+        contexts: List[str],
+        languages: List[Optional[str]],
+        return_time_stamps: bool = False,
+    ) -> List[Tuple[str, str, Optional[Any]]]:
+        """
+        Transcribe (and optionally align) already cut chunks, e.g. a share of a long file handed to this
+        model by ParallelTranscriber.
+
+        Args:
+            chunks: AudioChunk records.
+            contexts: Context per original input, indexed by AudioChunk.orig_index.
+            languages: Normalized forced language (or None) per original input, indexed the same way.
+            return_time_stamps: If True, chunks are aligned with this model's forced_aligner and the
+                timestamps are shifted to the original timeline.
 
-        wavs = normalize_audios(audio)
-        n = len(wavs)
+        Returns:
+            List of (language, text, time_stamps) per chunk; time_stamps is None without alignment or
+            for empty text.
+        """
+        if return_time_stamps and self.forced_aligner is None:
+            raise ValueError("return_time_stamps=True requires `forced_aligner` to be provided at initialization.")
+        raw_outputs = self._infer_chunks(chunks, contexts, languages)
+        return self._finish_chunks(chunks, raw_outputs, languages, return_time_stamps)
 
+    def _prepare_requests(
+        self,
+        n: int,
+        context: Union[str, List[str]],
+        language: Optional[Union[str, List[Optional[str]]]],
+    ) -> Tuple[List[str], List[Optional[str]]]:
+        """
+        Broadcast context/language to n inputs and validate the languages.
+        """
         ctxs = context if isinstance(context, list) else [context]
         if len(ctxs) == 1 and n > 1:
             ctxs = ctxs * n
@@ -362,33 +874,52 @@ class Qwen3ASRModel:
                 ln = normalize_language_name(str(l))
                 validate_language(ln)
                 langs_norm.append(ln)
+        return ctxs, langs_norm
+
+    def _chunk_length(self, max_chunk_sec: Optional[float], chunk_overlap_sec: float) -> float:
+        # also with timestamps: the forced aligner windows chunks above its own input limit
+        max_chunk_sec = min(float(max_chunk_sec), MAX_ASR_INPUT_SECONDS) if max_chunk_sec else MAX_ASR_INPUT_SECONDS
+        if chunk_overlap_sec < 0 or chunk_overlap_sec * 2 >= max_chunk_sec:
+            raise ValueError(
+                f"chunk_overlap_sec must be in [0, max_chunk_sec / 2), got {chunk_overlap_sec} for {max_chunk_sec}"
+            )
+        return max_chunk_sec
 
-        max_chunk_sec = MAX_FORCE_ALIGN_INPUT_SECONDS if return_time_stamps else MAX_ASR_INPUT_SECONDS
-
-        # chunk audios and record mapping
-        chunks: List[AudioChunk] = []
-        for i, wav in enumerate(wavs):
-            parts = split_audio_into_chunks(
-                wav=wav,
-                sr=SAMPLE_RATE,
-                max_chunk_sec=max_chunk_sec,
+    def _make_audio_chunks(
+        self,
+        orig_index: int,
+        parts: List[Tuple[np.ndarray, float, Optional[List[Tuple[float, float]]]]],
+    ) -> List[AudioChunk]:
+        record("num_chunks", len(parts))
+        record("audio_seconds", sum(p[0].shape[0] for p in parts) / float(SAMPLE_RATE))
+        return [
+            AudioChunk(
+                orig_index=orig_index, chunk_index=j, wav=cwav, sr=SAMPLE_RATE, offset_sec=offset_sec, time_map=time_map,
             )
-            for j, (cwav, offset_sec) in enumerate(parts):
-                chunks.append(AudioChunk(orig_index=i, chunk_index=j, wav=cwav, sr=SAMPLE_RATE, offset_sec=offset_sec))
+            for j, (cwav, offset_sec, time_map) in enumerate(parts)
+        ]
 
-        # run ASR on chunks
-        chunk_ctx: List[str] = [ctxs[c.orig_index] for c in chunks]
-        chunk_lang: List[Optional[str]] = [langs_norm[c.orig_index] for c in chunks]
-        chunk_wavs: List[np.ndarray] = [c.wav for c in chunks]
-        raw_outputs = self._infer_asr(chunk_ctx, chunk_wavs, chunk_lang)
+    def _finish_chunks(
+        self,
+        chunks: List[AudioChunk],
+        raw_outputs: List[str],
+        languages: List[Optional[str]],
+        return_time_stamps: bool,
+    ) -> List[Tuple[str, str, Optional[Any]]]:
+        """
+        Parse raw chunk outputs and run the optional forced alignment.
 
+        Returns:
+            List of (language, text, time_stamps) per chunk.
+        """
         # parse outputs, prepare for optional alignment
         per_chunk_lang: List[str] = []
         per_chunk_text: List[str] = []
-        for out, forced_lang in zip(raw_outputs, chunk_lang):
-            lang, txt = parse_asr_output(out, user_language=forced_lang)
-            per_chunk_lang.append(lang)
-            per_chunk_text.append(txt)
+        with stage("parse"):
+            for c, out in zip(chunks, raw_outputs):
+                lang, txt = parse_asr_output(out, user_language=languages[c.orig_index])
+                per_chunk_lang.append(lang)
+                per_chunk_text.append(txt)
 
         # forced alignment (optional)
         per_chunk_align: List[Optional[Any]] = [None] * len(chunks)
@@ -407,40 +938,98 @@ class Qwen3ASRModel:
                 to_align_idx.append(idx)
 
             # batch align with max_inference_batch_size
-            aligned_results: List[Any] = []
-            for a_chunk, t_chunk, l_chunk in zip(
-                chunk_list(to_align_audio, self.max_inference_batch_size),
-                chunk_list(to_align_text, self.max_inference_batch_size),
-                chunk_list(to_align_lang, self.max_inference_batch_size),
-            ):
-                aligned_results.extend(
-                    self.forced_aligner.align(audio=a_chunk, text=t_chunk, language=l_chunk)
-                )
+            aligned_results: List[Any] = [None] * len(to_align_idx)
+            for batch in self._make_batches([a.shape[0] for a, _ in to_align_audio]):
+                with stage("align"):
+                    batch_results = self.forced_aligner.align(
+                        audio=[to_align_audio[k] for k in batch],
+                        text=[to_align_text[k] for k in batch],
+                        language=[to_align_lang[k] for k in batch],
+                    )
+                for k, r in zip(batch, batch_results):
+                    aligned_results[k] = r
 
             # offset fix
             for k, idx in enumerate(to_align_idx):
                 c = chunks[idx]
                 r = aligned_results[k]
-                per_chunk_align[idx] = self._offset_align_result(r, c.offset_sec)
+                per_chunk_align[idx] = self._offset_align_result(r, c.offset_sec, time_map=c.time_map)
+
+        return list(zip(per_chunk_lang, per_chunk_text, per_chunk_align))
 
-        # merge chunks back to original samples
+    def _finish_chunks_on_stream(
+        self,
+        chunks: List[AudioChunk],
+        raw_outputs: List[str],
+        languages: List[Optional[str]],
+    ) -> List[Tuple[str, str, Optional[Any]]]:
+        """
+        _finish_chunks() with alignment, for the pipelined aligner thread. On CUDA the aligner gets
+        its own stream so its kernels can overlap with ASR kernels on the default stream.
+        """
+        device = getattr(self.forced_aligner, "device", None)
+        if device is None or torch.device(device).type != "cuda":
+            return self._finish_chunks(chunks, raw_outputs, languages, True)
+        stream = self._aligner_streams.get(torch.device(device))
+        if stream is None:
+            stream = self._aligner_streams[torch.device(device)] = torch.cuda.Stream(device=device)
+        with torch.cuda.stream(stream):
+            results = self._finish_chunks(chunks, raw_outputs, languages, True)
+        stream.synchronize()
+        return results
+
+    def _merge_chunk_results(
+        self,
+        n: int,
+        chunks: List[AudioChunk],
+        chunk_results: List[Tuple[str, str, Optional[Any]]],
+        return_time_stamps: bool,
+        chunk_overlap_sec: float = 0.0,
+    ) -> List[ASRTranscription]:
+        """
+        Merge per-chunk (language, text, time_stamps) back into one ASRTranscription per original input.
+
+        chunks must be grouped by orig_index and ordered by chunk_index within each input.
+        """
         out_langs: List[List[str]] = [[] for _ in range(n)]
         out_texts: List[List[str]] = [[] for _ in range(n)]
         out_aligns: List[List[Any]] = [[] for _ in range(n)]
+        out_offsets: List[List[float]] = [[] for _ in range(n)]
 
-        for c, lang, txt, al in zip(chunks, per_chunk_lang, per_chunk_text, per_chunk_align):
+        for c, (lang, txt, al) in zip(chunks, chunk_results):
             out_langs[c.orig_index].append(lang)
             out_texts[c.orig_index].append(txt)
-            if return_time_stamps and al is not None:
+            out_offsets[c.orig_index].append(c.offset_sec)
+            if return_time_stamps:
                 out_aligns[c.orig_index].append(al)
 
         results: List[ASRTranscription] = []
         for i in range(n):
-            merged_text = "".join([t for t in out_texts[i] if t is not None])
+            texts = [t or "" for t in out_texts[i]]
+            aligns = out_aligns[i] if return_time_stamps else [None] * len(texts)
+            spans = [[0, len(t)] for t in texts]
+            if chunk_overlap_sec > 0:
+                # text and time stamps are handed over to the next chunk at the same point
+                for k in range(len(texts) - 1):
+                    cut = self._overlap_cut(
+                        texts[k], texts[k + 1], aligns[k], aligns[k + 1],
+                        out_offsets[i][k + 1] + chunk_overlap_sec / 2.0, chunk_overlap_sec,
+                    )
+                    if cut is not None:
+                        spans[k][1], spans[k + 1][0] = cut
+                for span in spans:
+                    span[1] = max(span)
+            merged_text = "".join(t[a:b] for t, (a, b) in zip(texts, spans))
             merged_language = merge_languages(out_langs[i])
             merged_align = None
             if return_time_stamps:
-                merged_align = self._merge_align_results(out_aligns[i])
+                keep = None
+                if chunk_overlap_sec > 0:
+                    keep = [
+                        None if al is None else self._items_in_span(t, al, a, b)
+                        for t, al, (a, b) in zip(texts, aligns, spans)
+                    ]
+                merged_align = self._merge_align_results(aligns, keep=keep)
             results.append(ASRTranscription(language=merged_language, text=merged_text, time_stamps=merged_align))
 
         return results
@@ -464,6 +1053,23 @@ class Qwen3ASRModel:
             base = base + f"language {force_language}{'<asr_text>'}"
         return base
 
+    def _infer_chunks(
+        self,
+        chunks: List[AudioChunk],
+        contexts: List[str],
+        languages: List[Optional[str]],
+    ) -> List[str]:
+        """
+        Run ASR on chunks, taking context and forced language from the chunk's original input.
+        """
+        if not chunks:
+            return []
+        return self._infer_asr(
+            [contexts[c.orig_index] for c in chunks],
+            [c.wav for c in chunks],
+            [languages[c.orig_index] for c in chunks],
+        )
+
     def _infer_asr(
         self,
         contexts: List[str],
@@ -493,31 +1099,73 @@ class Qwen3ASRModel:
         wavs: List[np.ndarray],
         languages: List[Optional[str]],
     ) -> List[str]:
-        outs: List[str] = []
-
         texts = [self._build_text_prompt(context=c, force_language=fl) for c, fl in zip(contexts, languages)]
 
-        batch_size = self.max_inference_batch_size
-        if batch_size is None or batch_size < 0:
-            batch_size = len(texts)
-
-        for i in range(0, len(texts), batch_size):
-            sub_text = texts[i : i + batch_size]
-            sub_wavs = wavs[i : i + batch_size]
-            inputs = self.processor(text=sub_text, audio=sub_wavs, return_tensors="pt", padding=True)
-            inputs = inputs.to(self.model.device).to(self.model.dtype)
-
-            text_ids = self.model.generate(**inputs, max_new_tokens=self.max_new_tokens)
+        outs: List[Optional[str]] = [None] * len(texts)
+        for batch in self._make_batches([w.shape[0] for w in wavs]):
+            sub_text = [texts[k] for k in batch]
+            sub_wavs = [wavs[k] for k in batch]
+            with stage("features"):
+                inputs = self.processor(text=sub_text, audio=sub_wavs, return_tensors="pt", padding=True)
+                inputs = inputs.to(self.model.device).to(self.model.dtype)
+
+            recorder = current_recorder()
+            if recorder is None:
+                text_ids = self.model.generate(**inputs, max_new_tokens=self.max_new_tokens)
+            else:
+                text_ids = self._generate_timed(recorder, inputs)
+                new_ids = text_ids.sequences[:, inputs["input_ids"].shape[1]:]
+                pad_id = getattr(getattr(self.model, "generation_config", None), "pad_token_id", None)
+                record("batch_sizes", len(batch))
+                record("generated_tokens", int(new_ids.numel() if pad_id is None else (new_ids != pad_id).sum()))
 
             decoded = self.processor.batch_decode(
                 text_ids.sequences[:, inputs["input_ids"].shape[1]:],
                 skip_special_tokens=True,
                 clean_up_tokenization_spaces=False,
             )
-            outs.extend(list(decoded))
+            for k, d in zip(batch, decoded):
+                outs[k] = d
 
         return outs
 
+    def _generate_timed(self, recorder: MetricsRecorder, inputs: Any) -> Any:
+        """
+        generate() split into encoder / prefill / decode_loop stages (synchronizing CUDA at the edges).
+        """
+        timer = _FirstStepTimer()
+        encoder_before = recorder.stage_total("encoder")
+        _sync_device(self.device)
+        t0 = time.perf_counter()
+        text_ids = self.model.generate(
+            **inputs, max_new_tokens=self.max_new_tokens, logits_processor=LogitsProcessorList([timer]),
+        )
+        _sync_device(self.device)
+        t_end = time.perf_counter()
+        t_first = timer.first_step_at or t_end
+        encoder = recorder.stage_total("encoder") - encoder_before
+        recorder.add_stage("prefill", max(0.0, t_first - t0 - encoder))
+        recorder.add_stage("decode_loop", t_end - t_first)
+        return text_ids
+
+    def _make_batches(self, lengths: List[int], max_batch_size: Optional[int] = None) -> List[List[int]]:
+        """
+        Group item indices into padded inference batches.
+
+        Uses max_inference_batch_size (or max_batch_size, if given) as item limit, and optionally
+        buckets by length (sort_by_length) and applies the max_inference_batch_seconds padded-audio
+        budget. Without these options, batches are consecutive slices in input order.
+        """
+        max_batch_len = None
+        if self.max_inference_batch_seconds is not None and self.max_inference_batch_seconds > 0:
+            max_batch_len = int(self.max_inference_batch_seconds * SAMPLE_RATE)
+        return make_length_batches(
+            lengths,
+            max_batch_size=self.max_inference_batch_size if max_batch_size is None else max_batch_size,
+            max_batch_len=max_batch_len,
+            sort_by_length=self.sort_by_length,
+        )
+
     def _infer_asr_vllm(
         self,
         contexts: List[str],
@@ -531,55 +1179,112 @@ class Qwen3ASRModel:
 
         outs: List[str] = []
         for batch in chunk_list(inputs, self.max_inference_batch_size):
-            outputs = self.model.generate(batch, sampling_params=self.sampling_params, use_tqdm=False)
+            with stage("generate"):
+                outputs = self.model.generate(batch, sampling_params=self.sampling_params, use_tqdm=False)
+            record("batch_sizes", len(batch))
+            record("generated_tokens", sum(len(o.outputs[0].token_ids) for o in outputs))
             for o in outputs:
                 outs.append(o.outputs[0].text)
         return outs
 
-    def _offset_align_result(self, result: Any, offset_sec: float) -> Any:
+    def _offset_align_result(
+        self,
+        result: Any,
+        offset_sec: float,
+        time_map: Optional[List[Tuple[float, float]]] = None,
+    ) -> Any:
         """
-        Apply time offset to a ForcedAlignResult-like object.
+        Apply time offset to a ForcedAlignResult.
 
-        This function assumes:
-          - result has attribute `.items` which is a list of items with start_time/end_time in seconds.
-          - dataclasses are frozen in upstream implementation, so we reconstruct by type.
+        Results are immutable and column-based, so the shifted start/end arrays go into a new object.
 
         Args:
             result: ForcedAlignResult
             offset_sec: Offset in seconds
+            time_map: Optional piecewise chunk->original time map of a VAD-packed chunk. If given,
+                it is used instead of offset_sec.
 
         Returns:
             ForcedAlignResult: New object with shifted timestamps.
         """
         if result is None:
             return None
-        items = []
-        for it in result.items:
-            items.append(type(it)(text=it.text, 
-                                  start_time=round(it.start_time + offset_sec, 3), 
-                                  end_time=round(it.end_time + offset_sec, 3)))
-        return type(result)(items=items)
+        if time_map is None:
+            shift = lambda t: t + offset_sec
+        else:
+            shift = lambda t: map_chunk_time(t, time_map)
+        return type(result)(
+            texts=result.texts,
+            start_times=np.round(shift(result.start_times), 3),
+            end_times=np.round(shift(result.end_times), 3),
+        )
+
+    def _overlap_cut(
+        self,
+        prev: str,
+        nxt: str,
+        prev_align: Optional[Any],
+        nxt_align: Optional[Any],
+        mid_time: float,
+        overlap_sec: float,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Character offsets (end of prev, start of nxt) where two overlapping chunks hand over.
+
+        The matched overlap text decides (see find_overlap_cut()). Without a match, but with time
+        stamps for both chunks, both texts are cut at the first word starting after mid_time, the
+        middle of the shared audio; otherwise the texts are kept whole.
+        """
+        cut = find_overlap_cut(prev, nxt, overlap_sec=overlap_sec)
+        if cut is not None or prev_align is None or nxt_align is None:
+            return cut
+
+        def first_after(text: str, align: Any) -> int:
+            for pos, start in zip(_word_offsets(text, align.texts), align.start_times.tolist()):
+                if start >= mid_time:
+                    return pos
+            return len(text)
 
-    def _merge_align_results(self, results: List[Any]) -> Optional[Any]:
+        return first_after(prev, prev_align), first_after(nxt, nxt_align)
+
+    @staticmethod
+    def _items_in_span(text: str, align: Any, begin: int, end: int) -> np.ndarray:
+        """Mask of the aligned words of text that fall in text[begin:end]."""
+        pos = np.asarray(_word_offsets(text, align.texts), dtype=np.int64)
+        return (pos >= begin) & (pos < end)
+
+    def _merge_align_results(self, results: List[Any], keep: Optional[List[Optional[np.ndarray]]] = None) -> Optional[Any]:
         """
-        Merge multiple ForcedAlignResult objects into a single one by concatenating items.
+        Merge multiple ForcedAlignResult objects into a single one by concatenating their columns.
 
         Args:
-            results: List of ForcedAlignResult
+            results: List of ForcedAlignResult (None entries are skipped)
+            keep: Optional boolean mask per result selecting the items to keep, used to drop the words
+                of overlapping chunks that the next or previous chunk already covers.
 
         Returns:
             ForcedAlignResult or None
         """
-        if not results:
-            return None
-        all_items = []
-        for r in results:
+        texts: List[str] = []
+        starts: List[np.ndarray] = []
+        ends: List[np.ndarray] = []
+        result_type = None
+        for k, r in enumerate(results):
             if r is None:
                 continue
-            all_items.extend(list(r.items))
-        if not all_items:
+            result_type = type(r)
+            mask = keep[k] if keep is not None else None
+            if mask is not None:
+                texts.extend(t for t, kept in zip(r.texts, mask.tolist()) if kept)
+                starts.append(r.start_times[mask])
+                ends.append(r.end_times[mask])
+            else:
+                texts.extend(r.texts)
+                starts.append(r.start_times)
+                ends.append(r.end_times)
+        if not texts:
             return None
-        return type(results[0])(items=all_items)
+        return result_type(texts=texts, start_times=np.concatenate(starts), end_times=np.concatenate(ends))
 
     def init_streaming_state(
         self,
@@ -588,6 +1293,8 @@ class Qwen3ASRModel:
         unfixed_chunk_num: int = 2,
         unfixed_token_num: int = 5,
         chunk_size_sec: float = 2.0,
+        max_window_sec: Optional[float] = None,
+        context_tail_chars: int = 64,
     ) -> ASRStreamingState:
         """
         Initialize streaming ASR state for a single stream.
@@ -595,7 +1302,8 @@ class Qwen3ASRModel:
         Notes:
             - Streaming ASR is supported ONLY for vLLM backend.
             - Streaming ASR does NOT support timestamps (forced aligner is not used).
-            - Batch inference is NOT supported.
+            - One state per stream; many streams can be decoded together with
+              streaming_transcribe_batch() or StreamingScheduler.
 
         Args:
             context:
@@ -611,6 +1319,15 @@ class Qwen3ASRModel:
             chunk_size_sec:
                 Chunk size in seconds (audio is 16k PCM). The function will internally convert it
                 to sample count at 16kHz.
+            max_window_sec:
+                Optional bound on the audio re-fed to the model (bounded streaming mode).
+                Once the accumulated audio reaches this length, the next quiet chunk boundary
+                (or, at the latest, 1.5x this length) becomes a commit point: the decoded text is
+                moved to state.committed_text and never re-decoded, the matching audio is dropped,
+                and decoding restarts on new audio only. None keeps the whole stream (unbounded).
+            context_tail_chars:
+                In bounded mode, the number of trailing committed characters appended to the
+                context of the new prompt, so the model keeps some left context after a commit.
 
         Returns:
             ASRStreamingState: Mutable state object to be passed to streaming_transcribe() and
@@ -620,12 +1337,17 @@ class Qwen3ASRModel:
             ValueError:
                 - If backend is not "vllm".
                 - If chunk_size_sec <= 0.
+                - If max_window_sec is not None and smaller than chunk_size_sec.
                 - If forced language is invalid (same validation rules as transcribe()).
         """
         if self.backend != "vllm":
             raise ValueError("Streaming ASR is supported only for vLLM backend (backend='vllm').")
         if chunk_size_sec is None or float(chunk_size_sec) <= 0:
             raise ValueError(f"chunk_size_sec must be > 0, got: {chunk_size_sec}")
+        if max_window_sec is not None and float(max_window_sec) < float(chunk_size_sec):
+            raise ValueError(
+                f"max_window_sec must be >= chunk_size_sec, got: {max_window_sec} < {chunk_size_sec}"
+            )
 
         force_language = None
         if language is not None and str(language).strip() != "":
@@ -636,6 +1358,10 @@ class Qwen3ASRModel:
         chunk_size_samples = int(round(float(chunk_size_sec) * SAMPLE_RATE))
         chunk_size_samples = max(1, chunk_size_samples)
 
+        max_window_samples = 0
+        if max_window_sec is not None:
+            max_window_samples = int(round(float(max_window_sec) * SAMPLE_RATE))
+
         prompt_raw = self._build_text_prompt(context=context, force_language=force_language)
 
         return ASRStreamingState(
@@ -652,8 +1378,204 @@ class Qwen3ASRModel:
             language="",
             text="",
             _raw_decoded="",
+            _raw_decoded_ids=[],
+            max_window_samples=max_window_samples,
+            context_tail_chars=int(context_tail_chars),
         )
 
+    def _streaming_prefix(self, state: ASRStreamingState) -> Tuple[str, Optional[List[int]]]:
+        """
+        Build the prefix text for the next decode step with the rollback strategy:
+          - If the current segment has fewer than unfixed_chunk_num decoded chunks: ""
+          - Else: previous decoded text with the last unfixed_token_num tokens rolled back
+            (more tokens are rolled back until the prefix is valid UTF-8).
+
+        The token ids of the previous output are cached in state._raw_decoded_ids, so rolling
+        back only decodes the last few tokens and strips their text from state._raw_decoded,
+        instead of re-encoding and re-decoding the whole accumulated text on every chunk.
+
+        Returns:
+            Tuple[str, Optional[List[int]]]: (prefix text, prefix token ids or None if unknown).
+        """
+        if state.segment_chunk_id < state.unfixed_chunk_num:
+            return "", []
+        tokenizer = self.processor.tokenizer
+        raw = state._raw_decoded
+        cur_ids = state._raw_decoded_ids
+        if cur_ids is None:
+            cur_ids = tokenizer.encode(raw)
+        k = int(state.unfixed_token_num)
+        while True:
+            end_idx = max(0, len(cur_ids) - k)
+            if end_idx == 0:
+                return "", []
+            # Fast path: the rolled-back tail ends the raw text and cuts on a character boundary.
+            tail = tokenizer.decode(cur_ids[end_idx:])
+            if tail and '\ufffd' not in tail and '\ufffd' not in raw and raw.endswith(tail):
+                return raw[: len(raw) - len(tail)], cur_ids[:end_idx]
+            prefix = tokenizer.decode(cur_ids[:end_idx])
+            if '\ufffd' not in prefix:
+                return prefix, cur_ids[:end_idx]
+            k += 1
+
+    def _streaming_update(
+        self,
+        state: ASRStreamingState,
+        prefix: str,
+        prefix_ids: Optional[List[int]],
+        gen_text: str,
+        gen_ids: Optional[List[int]] = None,
+    ) -> None:
+        """
+        Store one decode step result in state and refresh state.language / state.text.
+        """
+        # Accumulate raw decoded (then parse to lang/text)
+        state._raw_decoded = (prefix + gen_text) if prefix is not None else gen_text
+        if prefix_ids is not None and gen_ids is not None:
+            state._raw_decoded_ids = list(prefix_ids) + self._strip_special_ids(gen_ids)
+        else:
+            state._raw_decoded_ids = None
+
+        lang, txt = parse_asr_output(state._raw_decoded, user_language=state.force_language)
+        state.language = merge_languages(state.committed_language.split(",") + [lang])
+        state.text = state.committed_text + txt
+
+        state.chunk_id += 1
+        state.segment_chunk_id += 1
+
+    def _strip_special_ids(self, ids: List[int]) -> List[int]:
+        """Drop trailing special tokens (e.g. EOS) that are not part of the decoded text."""
+        special = getattr(self, "_special_ids", None)
+        if special is None:
+            special = set(getattr(self.processor.tokenizer, "all_special_ids", []) or [])
+            self._special_ids = special
+        ids = list(ids)
+        while ids and ids[-1] in special:
+            ids.pop()
+        return ids
+
+    def _streaming_maybe_commit(self, state: ASRStreamingState, last_chunk: np.ndarray) -> None:
+        """
+        Bounded streaming: commit the current segment at a stable point.
+
+        A stable point is the end of a decoded chunk once audio_accum has reached
+        max_window_samples and the chunk ends quietly (its last 100 ms are much quieter than
+        the segment on average), so no word is likely to straddle the cut. At 1.5x
+        max_window_samples the commit is forced.
+
+        On commit, the parsed text is appended to state.committed_text, all audio of the segment
+        is dropped and the prompt context is refreshed with a short tail of the committed text.
+        """
+        if state.max_window_samples <= 0:
+            return
+        accum_len = int(state.audio_accum.shape[0])
+        if accum_len < state.max_window_samples:
+            return
+
+        forced = accum_len * 2 >= state.max_window_samples * 3
+        if not forced:
+            quiet_len = max(1, int(0.1 * SAMPLE_RATE))
+            tail_energy = float(np.mean(np.abs(last_chunk[-quiet_len:]))) if last_chunk.shape[0] > 0 else 0.0
+            seg_energy = float(np.mean(np.abs(state.audio_accum)))
+            if tail_energy > 0.1 * seg_energy:
+                return
+
+        _, txt = parse_asr_output(state._raw_decoded, user_language=state.force_language)
+        state.committed_text = state.committed_text + txt
+        state.committed_language = state.language
+        state.audio_accum = np.zeros((0,), dtype=np.float32)
+        state._raw_decoded = ""
+        state._raw_decoded_ids = []
+        state.segment_chunk_id = 0
+
+        tail = state.committed_text[-state.context_tail_chars:] if state.context_tail_chars > 0 else ""
+        context = state.context
+        if tail:
+            context = f"{context}\n{tail}" if context else tail
+        state.prompt_raw = self._build_text_prompt(context=context, force_language=state.force_language)
+
+    def _streaming_pcm(self, pcm16k: np.ndarray, state: ASRStreamingState) -> np.ndarray:
+        """
+        Validate one incoming PCM piece for state and convert it to 1D float32, without touching state.
+        """
+        if state is None:
+            raise ValueError("state must not be None. Call init_streaming_state() first.")
+        if state.finished:
+            raise ValueError("state is finished; start a new stream with init_streaming_state().")
+        if pcm16k is None:
+            raise ValueError("pcm16k must not be None.")
+
+        # Raw int16 PCM bytes / memoryview / mmap, converted in a single pass
+        if isinstance(pcm16k, PCM_BUFFER_TYPES):
+            x = pcm_from_buffer(pcm16k, dtype="int16")
+        else:
+            x = np.asarray(pcm16k)
+
+        # Ensure 1D mono
+        if x.ndim != 1:
+            x = x.reshape(-1)
+
+        # Convert to float32 PCM in [-1, 1] if int16 provided
+        if x.dtype == np.int16:
+            x = np.multiply(x, np.float32(1.0 / 32768.0), dtype=np.float32)
+        else:
+            x = x.astype(np.float32, copy=False)
+        return x
+
+    def _streaming_append(self, pcm16k: np.ndarray, state: ASRStreamingState) -> None:
+        """
+        Validate one incoming PCM piece and append it to state.buffer.
+        """
+        x = self._streaming_pcm(pcm16k, state)
+        if x.shape[0] > 0:
+            state.buffer = np.concatenate([state.buffer, x], axis=0)
+
+    def _streaming_decode(
+        self,
+        states: List[ASRStreamingState],
+        pieces: List[np.ndarray],
+        final: bool = False,
+    ) -> None:
+        """
+        Run one decode step for several streams with batched vLLM generate calls.
+
+        Each piece is appended to the audio_accum of its state, the prompt is built with the
+        prefix rollback strategy, and all requests are sent to the engine together (split by
+        max_inference_batch_size). If final is False, bounded-mode commits are applied.
+
+        States are only modified once the engine has returned, so a failed step can be retried.
+        """
+        inputs: List[Dict[str, Any]] = []
+        prefixes: List[Tuple[str, Optional[List[int]]]] = []
+        accums: List[np.ndarray] = []
+        for state, piece in zip(states, pieces):
+            # Accumulate audio (re-feed from start, no padding)
+            if state.audio_accum.shape[0] == 0:
+                accum = piece
+            else:
+                accum = np.concatenate([state.audio_accum, piece], axis=0)
+            accums.append(accum)
+
+            # Build prefix with rollback strategy
+            prefix, prefix_ids = self._streaming_prefix(state)
+            prefixes.append((prefix, prefix_ids))
+            inputs.append({"prompt": state.prompt_raw + prefix, "multi_modal_data": {"audio": [accum]}})
+
+        gens: List[Tuple[str, Optional[List[int]]]] = []
+        for batch in chunk_list(inputs, self.max_inference_batch_size):
+            outputs = self.model.generate(batch, sampling_params=self.sampling_params, use_tqdm=False)
+            for o in outputs:
+                gen_ids = getattr(o.outputs[0], "token_ids", None)
+                gens.append((o.outputs[0].text, list(gen_ids) if gen_ids is not None else None))
+
+        for state, piece, accum, (prefix, prefix_ids), (gen_text, gen_ids) in zip(
+            states, pieces, accums, prefixes, gens
+        ):
+            state.audio_accum = accum
+            self._streaming_update(state, prefix, prefix_ids, gen_text, gen_ids)
+            if not final:
+                self._streaming_maybe_commit(state, piece)
+
     def streaming_transcribe(self, pcm16k: np.ndarray, state: ASRStreamingState) -> ASRStreamingState:
         """
         Streaming ASR decode step.
@@ -669,21 +1591,27 @@ class Qwen3ASRModel:
 
         Implementation details:
             - Each time a new chunk is ready, we append it to audio_accum and re-feed *all* audio seen
-              so far to the model (no padding).
+              so far to the model (no padding). If the engine was created with
+              encoder_window_cache_size > 0, the audio encoder reuses its outputs for completed
+              attention windows and only encodes the new tail.
             - We update the prompt as: state.prompt_raw + prefix_text
             - Prefix rollback strategy:
                 * If chunk_id < unfixed_chunk_num: prefix_text = ""
                 * Else: rollback last unfixed_token_num tokens from previously accumulated decoded text.
+            - In bounded mode (max_window_sec), audio_accum only holds the audio since the last commit
+              point and "chunk_id" above counts chunks since that commit (state.segment_chunk_id).
 
         Notes:
             - vLLM backend only.
             - No timestamps.
-            - Single stream only (no batching).
+            - Single stream; use streaming_transcribe_batch() or StreamingScheduler to batch
+              many concurrent streams.
 
         Args:
             pcm16k:
                 16kHz mono PCM waveform (np.ndarray). Length can be any non-negative integer.
                 dtype can be float32/float64/int16; it will be converted to float32.
+                Raw little-endian int16 PCM as bytes/bytearray/memoryview/mmap is also accepted.
             state:
                 Streaming state returned by init_streaming_state().
 
@@ -696,73 +1624,57 @@ class Qwen3ASRModel:
         """
         if self.backend != "vllm":
             raise ValueError("streaming_transcribe() is supported only for vLLM backend (backend='vllm').")
-        if state is None:
-            raise ValueError("state must not be None. Call init_streaming_state() first.")
-        if pcm16k is None:
-            raise ValueError("pcm16k must not be None.")
-
-        # Ensure 1D mono
-        x = np.asarray(pcm16k)
-        if x.ndim != 1:
-            x = x.reshape(-1)
-
-        # Convert to float32 PCM in [-1, 1] if int16 provided
-        if x.dtype == np.int16:
-            x = (x.astype(np.float32) / 32768.0)
-        else:
-            x = x.astype(np.float32, copy=False)
-
-        # Append to buffer
-        if x.shape[0] > 0:
-            state.buffer = np.concatenate([state.buffer, x], axis=0)
-
-        # Consume full chunks
-        while state.buffer.shape[0] >= state.chunk_size_samples:
-            chunk = state.buffer[: state.chunk_size_samples]
-            state.buffer = state.buffer[state.chunk_size_samples :]
-
-            # Accumulate audio (re-feed from start, no padding)
-            if state.audio_accum.shape[0] == 0:
-                state.audio_accum = chunk
-            else:
-                state.audio_accum = np.concatenate([state.audio_accum, chunk], axis=0)
+        return self.streaming_transcribe_batch([pcm16k], [state])[0]
 
-            # Build prefix with rollback strategy
-            prefix = ""
-            if state.chunk_id < state.unfixed_chunk_num:
-                prefix = ""
-            else:
-                cur_ids = self.processor.tokenizer.encode(state._raw_decoded)
-                k = int(state.unfixed_token_num)
-                while True:
-                    end_idx = max(0, len(cur_ids) - k)
-                    prefix = self.processor.tokenizer.decode(cur_ids[:end_idx]) if end_idx > 0 else ""
-                    if '\ufffd' not in prefix:
-                        break
-                    else:
-                        if end_idx == 0:
-                            prefix = ""
-                            break
-                        k += 1
-
-            prompt = state.prompt_raw + prefix
-
-            # vLLM input: single item
-            inp = {"prompt": prompt, "multi_modal_data": {"audio": [state.audio_accum]}}
-
-            outputs = self.model.generate([inp], sampling_params=self.sampling_params, use_tqdm=False)
-            gen_text = outputs[0].outputs[0].text
+    def streaming_transcribe_batch(
+        self,
+        pcm16k: List[np.ndarray],
+        states: List[ASRStreamingState],
+    ) -> List[ASRStreamingState]:
+        """
+        Batched streaming ASR decode step for many independent streams.
 
-            # Accumulate raw decoded (then parse to lang/text)
-            state._raw_decoded = (prefix + gen_text) if prefix is not None else gen_text
+        Same semantics as streaming_transcribe() for every (pcm16k[i], states[i]) pair, but the
+        ready chunks of all streams are decoded together: each round takes at most one full chunk
+        from every stream that has one buffered and runs a single batched vLLM generate call.
+        Rounds repeat until no stream has a full chunk left. A state may appear several times;
+        its PCM pieces are appended in order.
 
-            lang, txt = parse_asr_output(state._raw_decoded, user_language=state.force_language)
-            state.language = lang
-            state.text = txt
+        Args:
+            pcm16k:
+                List of 16kHz mono PCM waveforms, one per entry of states.
+            states:
+                Streaming states returned by init_streaming_state().
 
-            state.chunk_id += 1
+        Returns:
+            List[ASRStreamingState]: The same state objects (mutated), in input order.
 
-        return state
+        Raises:
+            ValueError:
+                If backend is not "vllm", sizes mismatch or a state is invalid.
+        """
+        if self.backend != "vllm":
+            raise ValueError("streaming_transcribe_batch() is supported only for vLLM backend (backend='vllm').")
+        if len(pcm16k) != len(states):
+            raise ValueError(f"Batch size mismatch: pcm16k={len(pcm16k)}, states={len(states)}")
+
+        # validate every piece before any state is touched
+        converted = [self._streaming_pcm(x, state) for x, state in zip(pcm16k, states)]
+        for x, state in zip(converted, states):
+            if x.shape[0] > 0:
+                state.buffer = np.concatenate([state.buffer, x], axis=0)
+
+        unique_states = list({id(s): s for s in states}.values())
+        while True:
+            ready = [s for s in unique_states if s.buffer.shape[0] >= s.chunk_size_samples]
+            if not ready:
+                break
+            chunks = [state.buffer[: state.chunk_size_samples] for state in ready]
+            self._streaming_decode(ready, chunks)
+            for state in ready:
+                state.buffer = state.buffer[state.chunk_size_samples :]
+
+        return list(states)
 
     def finish_streaming_transcribe(self, state: ASRStreamingState) -> ASRStreamingState:
         """
@@ -771,11 +1683,13 @@ class Qwen3ASRModel:
         This function flushes the remaining buffered audio in state.buffer (tail audio).
         It sends the remaining samples to the model even if shorter than chunk_size_sec,
         without padding. Then it updates state.language/state.text one last time.
+        The state is marked finished: further streaming_transcribe() calls on it raise ValueError,
+        finishing it again is a no-op.
 
         Notes:
             - vLLM backend only.
             - No timestamps.
-            - Single stream only.
+            - Single stream; see finish_streaming_transcribe_batch().
 
         Args:
             state:
@@ -792,39 +1706,35 @@ class Qwen3ASRModel:
             raise ValueError("finish_streaming_transcribe() is supported only for vLLM backend (backend='vllm').")
         if state is None:
             raise ValueError("state must not be None.")
+        return self.finish_streaming_transcribe_batch([state])[0]
 
-        # If no remaining buffer, still return state as-is.
-        if state.buffer is None or state.buffer.shape[0] == 0:
-            return state
-
-        tail = state.buffer
-        state.buffer = np.zeros((0,), dtype=np.float32)
-
-        # Append tail to accumulated audio
-        if state.audio_accum.shape[0] == 0:
-            state.audio_accum = tail
-        else:
-            state.audio_accum = np.concatenate([state.audio_accum, tail], axis=0)
+    def finish_streaming_transcribe_batch(self, states: List[ASRStreamingState]) -> List[ASRStreamingState]:
+        """
+        Finish several streams at once; the tails of all streams are decoded in one batched call.
 
-        # Prefix rollback strategy (same as per-chunk)
-        prefix = ""
-        if state.chunk_id < state.unfixed_chunk_num:
-            prefix = ""
-        else:
-            cur_ids = self.processor.tokenizer.encode(state._raw_decoded)
-            end_idx = max(1, len(cur_ids) - int(state.unfixed_token_num))
-            prefix = self.processor.tokenizer.decode(cur_ids[:end_idx])
+        Same semantics as finish_streaming_transcribe() for every state.
 
-        prompt = state.prompt_raw + prefix
-        inp = {"prompt": prompt, "multi_modal_data": {"audio": [state.audio_accum]}}
+        Args:
+            states:
+                Streaming states.
 
-        outputs = self.model.generate([inp], sampling_params=self.sampling_params, use_tqdm=False)
-        gen_text = outputs[0].outputs[0].text
+        Returns:
+            List[ASRStreamingState]: Updated states (mutated), in input order.
 
-        state._raw_decoded = (prefix + gen_text) if prefix is not None else gen_text
-        lang, txt = parse_asr_output(state._raw_decoded, user_language=state.force_language)
-        state.language = lang
-        state.text = txt
+        Raises:
+            ValueError:
+                If backend is not "vllm" or a state is invalid.
+        """
+        if self.backend != "vllm":
+            raise ValueError("finish_streaming_transcribe_batch() is supported only for vLLM backend (backend='vllm').")
+        if any(s is None for s in states):
+            raise ValueError("state must not be None.")
 
-        state.chunk_id += 1
-        return state
\ No newline at end of file
+        # States without remaining buffer are only marked finished.
+        pending = list({id(s): s for s in states if s.buffer is not None and s.buffer.shape[0] > 0}.values())
+        if pending:
+            self._streaming_decode(pending, [state.buffer for state in pending], final=True)
+        for state in states:
+            state.buffer = np.zeros((0,), dtype=np.float32)
+            state.finished = True
+        return list(states)
@@ -13,12 +13,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import bisect
+import functools
+import math
+import multiprocessing
 import os
+import threading
 import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import nagisa
+import numpy as np
 import torch
 from qwen_asr.core.transformers_backend import (
     Qwen3ASRConfig,
@@ -27,26 +35,59 @@ from qwen_asr.core.transformers_backend import (
 )
 from transformers import AutoConfig, AutoModel, AutoProcessor
 
+from .audio_cache import DecodedAudioCache
 from .utils import (
+    MAX_FORCE_ALIGN_INPUT_SECONDS,
+    SAMPLE_RATE,
     AudioLike,
     ensure_list,
     normalize_audios,
+    validate_resample_quality,
 )
 
+# Long-form alignment (Qwen3ForcedAligner._align_long): words ending in the last _ANCHOR_MARGIN_SEC
+# of a window are re-aligned in the next one, and each window gets _ANCHOR_TEXT_SLACK times the
+# words the remaining speaking rate predicts.
+_ANCHOR_MARGIN_SEC = 20.0
+_ANCHOR_TEXT_SLACK = 1.25
+
+
+_ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
+KOREAN_DICT_PATH = os.path.join(_ASSETS_DIR, "korean_dict_jieba.dict")
+
+# languages whose segmenters are worth a worker process; the rest are simple string scans
+_POOLED_LANGUAGES = ("japanese", "korean")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_korean_scores() -> Dict[str, float]:
+    # parsed once per process and shared (read-only) by every processor / LTokenizer
+    scores: Dict[str, float] = {}
+    with open(KOREAN_DICT_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                scores[line.split()[0]] = 1.0
+    return scores
+
 
 class Qwen3ForceAlignProcessor():
-    def __init__(self):
-        ko_dict_path = os.path.join(os.path.dirname(__file__), "assets", "korean_dict_jieba.dict")
-        ko_scores = {}
-        with open(ko_dict_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                word = line.split()[0]
-                ko_scores[word] = 1.0
-        self.ko_score = ko_scores
+    def __init__(self, cache_size: int = 4096, num_workers: int = 0):
+        """
+        Args:
+            cache_size:
+                Number of (language, text) segmentations kept in an LRU cache. 0 disables it.
+            num_workers:
+                Worker processes segmenting Japanese / Korean texts of a batch in tokenize_batch().
+                0 segments in the calling thread.
+        """
+        self.ko_score = _load_korean_scores()
         self.ko_tokenizer = None
+        self.cache_size = max(0, int(cache_size))
+        self.num_workers = max(0, int(num_workers))
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[str, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
 
     def is_kept_char(self, ch: str) -> bool:
         if ch == "'":
@@ -145,111 +186,162 @@ class Qwen3ForceAlignProcessor():
         return tokens
 
     def fix_timestamp(self, data) -> List[int]:
-        data = data.tolist()
-        n = len(data)
+        return self.fix_timestamp_array(data).tolist()
 
-        dp = [1] * n
-        parent = [-1] * n
-        
-        for i in range(1, n):
-            for j in range(i):
-                if data[j] <= data[i] and dp[j] + 1 > dp[i]:
-                    dp[i] = dp[j] + 1
-                    parent[i] = j
-        
-        max_length = max(dp)
-        max_idx = dp.index(max_length)
-        
-        lis_indices = []
-        idx = max_idx
-        while idx != -1:
-            lis_indices.append(idx)
-            idx = parent[idx]
-        lis_indices.reverse()
+    def fix_timestamp_array(self, data) -> np.ndarray:
+        """
+        Repair non-monotonic timestamps.
 
-        is_normal = [False] * n
-        for idx in lis_indices:
-            is_normal[idx] = True
-        
-        result = data.copy()
-        i = 0
-        
-        while i < n:
-            if not is_normal[i]:
-                j = i
-                while j < n and not is_normal[j]:
-                    j += 1
-                
-                anomaly_count = j - i
-                
-                if anomaly_count <= 2:
-                    left_val = None
-                    for k in range(i - 1, -1, -1):
-                        if is_normal[k]:
-                            left_val = result[k]
-                            break
-                    
-                    right_val = None
-                    for k in range(j, n):
-                        if is_normal[k]:
-                            right_val = result[k]
-                            break
-                    
-                    for k in range(i, j):
-                        if left_val is None:
-                            result[k] = right_val
-                        elif right_val is None:
-                            result[k] = left_val
-                        else:
-                            result[k] = left_val if (k - (i - 1)) <= ((j) - k) else right_val
-                
-                else:
-                    left_val = None
-                    for k in range(i - 1, -1, -1):
-                        if is_normal[k]:
-                            left_val = result[k]
-                            break
-
-                    right_val = None
-                    for k in range(j, n):
-                        if is_normal[k]:
-                            right_val = result[k]
-                            break
-                    
-                    if left_val is not None and right_val is not None:
-                        step = (right_val - left_val) / (anomaly_count + 1)
-                        for k in range(i, j):
-                            result[k] = left_val + step * (k - i + 1)
-                    elif left_val is not None:
-                        for k in range(i, j):
-                            result[k] = left_val
-                    elif right_val is not None:
-                        for k in range(i, j):
-                            result[k] = right_val
-                
-                i = j
+        The longest non-decreasing subsequence is kept as is (found by patience sorting in
+        O(n log n); among equally long subsequences the same one as the textbook O(n^2) DP with
+        earliest predecessors is chosen). Every run of other values is replaced from its nearest kept
+        neighbours: runs of up to 2 snap to the closer neighbour, longer runs are interpolated
+        linearly between them.
+        """
+        values = data.tolist() if hasattr(data, "tolist") else list(data)
+        n = len(values)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        # levels[L] holds (in index order) the indices whose longest subsequence ending there has
+        # length L + 1; their values strictly decrease, so the earliest predecessor in level L - 1
+        # with value <= x is found by bisection over the negated values.
+        tails: List[Any] = []
+        level_idx: List[List[int]] = []
+        level_neg: List[List[Any]] = []
+        parent = [-1] * n
+        for i, x in enumerate(values):
+            L = bisect.bisect_right(tails, x)
+            if L > 0:
+                parent[i] = level_idx[L - 1][bisect.bisect_left(level_neg[L - 1], -x)]
+            if L == len(tails):
+                tails.append(x)
+                level_idx.append([])
+                level_neg.append([])
             else:
-                i += 1
-
-        return [int(res) for res in result]
+                tails[L] = x
+            level_idx[L].append(i)
+            level_neg[L].append(-x)
 
-    def encode_timestamp(self, text: str, language: str) -> List[str]:
-        language = language.lower()
+        is_normal = np.zeros(n, dtype=bool)
+        idx = level_idx[-1][0]
+        while idx != -1:
+            is_normal[idx] = True
+            idx = parent[idx]
+        if is_normal.all():
+            return np.trunc(np.asarray(values, dtype=np.float64)).astype(np.int64)
+
+        vals = np.asarray(values, dtype=np.float64)
+        pos = np.arange(n)
+        # nearest kept index on each side (-1 / n if none)
+        left = np.maximum.accumulate(np.where(is_normal, pos, -1))
+        right = np.minimum.accumulate(np.where(is_normal, pos, n)[::-1])[::-1]
+        has_left = left >= 0
+        has_right = right < n
+        left_val = vals[np.maximum(left, 0)]
+        right_val = vals[np.minimum(right, n - 1)]
+        run = right - left - 1
+
+        both = has_left & has_right
+        nearest = np.where((pos - left) <= (right - pos), left_val, right_val)
+        # kept positions have run == -1; only divide where a run is actually interpolated
+        step = np.divide(right_val - left_val, run + 1, out=np.zeros(n), where=~is_normal & both)
+        interp = left_val + step * (pos - left)
+        fixed = np.where(both, np.where(run <= 2, nearest, interp), np.where(has_left, left_val, right_val))
+
+        result = np.where(is_normal, vals, fixed)
+        return np.trunc(result).astype(np.int64)
+
+    def tokenize(self, text: str, language: str) -> List[str]:
+        """
+        Split text into the word units that get timestamps, using the segmentation cache.
+        """
+        key = (language.lower(), text)
+        words = self._cache_get(key)
+        if words is None:
+            words = tuple(self._segment(text, key[0]))
+            self._cache_put(key, words)
+        return list(words)
+
+    def tokenize_batch(self, texts: List[str], languages: List[str]) -> List[List[str]]:
+        """
+        tokenize() over a batch. Distinct uncached Japanese / Korean texts are segmented on the
+        worker processes when num_workers > 0.
+        """
+        keys = [(lang.lower(), t) for t, lang in zip(texts, languages)]
+        found: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        for key in keys:
+            if key not in found:
+                words = self._cache_get(key)
+                if words is not None:
+                    found[key] = words
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+
+        pooled = [key for key in missing if key[0] in _POOLED_LANGUAGES]
+        if self.num_workers > 0 and len(pooled) > 1:
+            chunksize = max(1, len(pooled) // (4 * self.num_workers))
+            for key, words in zip(pooled, self._get_pool().map(_segment_in_worker, pooled, chunksize=chunksize)):
+                found[key] = tuple(words)
+        for key in missing:
+            if key not in found:
+                found[key] = tuple(self._segment(key[1], key[0]))
+            self._cache_put(key, found[key])
+
+        return [list(found[key]) for key in keys]
+
+    def close(self) -> None:
+        """
+        Shut down the segmentation worker processes, if any were started.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that holds CUDA / OpenMP state is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_segment_worker,
+            )
+        return self._pool
 
-        if language.lower() == "japanese":
-            word_list = self.tokenize_japanese(text)
-        elif language.lower() == "korean":
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[Tuple[str, ...]]:
+        if self.cache_size == 0:
+            return None
+        with self._cache_lock:
+            words = self._cache.get(key)
+            if words is not None:
+                self._cache.move_to_end(key)
+            return words
+
+    def _cache_put(self, key: Tuple[str, str], words: Tuple[str, ...]) -> None:
+        if self.cache_size == 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = words
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _segment(self, text: str, language: str) -> List[str]:
+        if language == "japanese":
+            return self.tokenize_japanese(text)
+        if language == "korean":
             if self.ko_tokenizer is None:
                 from soynlp.tokenizer import LTokenizer
                 self.ko_tokenizer = LTokenizer(scores=self.ko_score)
-            word_list = self.tokenize_korean(self.ko_tokenizer, text)
-        else:
-            word_list = self.tokenize_space_lang(text)
-        
+            return self.tokenize_korean(self.ko_tokenizer, text)
+        return self.tokenize_space_lang(text)
+
+    def build_input_text(self, word_list: List[str]) -> str:
         input_text = "<timestamp><timestamp>".join(word_list) + "<timestamp><timestamp>"
-        input_text = "<|audio_start|><|audio_pad|><|audio_end|>" + input_text
+        return "<|audio_start|><|audio_pad|><|audio_end|>" + input_text
 
-        return word_list, input_text
+    def encode_timestamp(self, text: str, language: str) -> List[str]:
+        word_list = self.tokenize(text, language)
+        return word_list, self.build_input_text(word_list)
 
     def parse_timestamp(self, word_list, timestamp):
         timestamp_output = []
@@ -267,6 +359,19 @@ class Qwen3ForceAlignProcessor():
         return timestamp_output
 
 
+_worker_processor: Optional[Qwen3ForceAlignProcessor] = None
+
+
+def _init_segment_worker() -> None:
+    global _worker_processor
+    _worker_processor = Qwen3ForceAlignProcessor(cache_size=0)
+
+
+def _segment_in_worker(key: Tuple[str, str]) -> List[str]:
+    language, text = key
+    return _worker_processor._segment(text, language)
+
+
 @dataclass(frozen=True)
 class ForcedAlignItem:
     """
@@ -285,25 +390,107 @@ class ForcedAlignItem:
     end_time: int
 
 
-@dataclass(frozen=True)
 class ForcedAlignResult:
     """
-    Forced alignment output for one sample.
+    Forced alignment output for one sample, stored column-wise.
+
+    Texts are a list and start/end times (seconds) are read-only float64 NumPy arrays, so long
+    transcripts do not allocate one Python object per word. Indexing and iteration still give
+    ForcedAlignItem views built on access, and `.items` materializes the full list.
 
     Attributes:
-        items (List[ForcedAlignItem]):
-            Aligned token spans.
+        texts (List[str]):
+            Aligned units (cjk character or word).
+        start_times (np.ndarray):
+            Start times in seconds.
+        end_times (np.ndarray):
+            End times in seconds.
     """
-    items: List[ForcedAlignItem]
+
+    __slots__ = ("texts", "start_times", "end_times")
+
+    def __init__(
+        self,
+        items: Optional[Iterable[ForcedAlignItem]] = None,
+        *,
+        texts: Optional[List[str]] = None,
+        start_times: Optional[Any] = None,
+        end_times: Optional[Any] = None,
+    ):
+        """
+        Build either from items (ForcedAlignResult(items=[...])) or from the three columns.
+        """
+        if items is not None:
+            items = list(items)
+            texts = [it.text for it in items]
+            start_times = [it.start_time for it in items]
+            end_times = [it.end_time for it in items]
+        texts = list(texts or [])
+        start_times = np.array(start_times if start_times is not None else [], dtype=np.float64)
+        end_times = np.array(end_times if end_times is not None else [], dtype=np.float64)
+        if not (len(texts) == len(start_times) == len(end_times)):
+            raise ValueError(
+                f"Column length mismatch: texts={len(texts)}, start_times={len(start_times)}, end_times={len(end_times)}"
+            )
+        start_times.setflags(write=False)
+        end_times.setflags(write=False)
+        object.__setattr__(self, "texts", texts)
+        object.__setattr__(self, "start_times", start_times)
+        object.__setattr__(self, "end_times", end_times)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ForcedAlignResult is immutable")
+
+    def __getstate__(self):
+        return self.texts, self.start_times, self.end_times
+
+    def __setstate__(self, state):
+        # pickle / copy.deepcopy: restore the slots past __setattr__, with the arrays read-only again
+        texts, start_times, end_times = state
+        start_times, end_times = np.array(start_times, dtype=np.float64), np.array(end_times, dtype=np.float64)
+        start_times.setflags(write=False)
+        end_times.setflags(write=False)
+        object.__setattr__(self, "texts", list(texts))
+        object.__setattr__(self, "start_times", start_times)
+        object.__setattr__(self, "end_times", end_times)
+
+    @property
+    def items(self) -> List[ForcedAlignItem]:
+        return list(self)
 
     def __iter__(self):
-        return iter(self.items)
+        for text, start, end in zip(self.texts, self.start_times.tolist(), self.end_times.tolist()):
+            yield ForcedAlignItem(text=text, start_time=start, end_time=end)
 
     def __len__(self):
-        return len(self.items)
+        return len(self.texts)
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[ForcedAlignItem, List[ForcedAlignItem]]:
+        if isinstance(idx, slice):
+            return self.items[idx]
+        return ForcedAlignItem(
+            text=self.texts[idx], start_time=float(self.start_times[idx]), end_time=float(self.end_times[idx]),
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, ForcedAlignResult):
+            return NotImplemented
+        return (
+            self.texts == other.texts
+            and np.array_equal(self.start_times, other.start_times)
+            and np.array_equal(self.end_times, other.end_times)
+        )
+
+    def __repr__(self):
+        return f"ForcedAlignResult(items={self.items!r})"
 
-    def __getitem__(self, idx: int) -> ForcedAlignItem:
-        return self.items[idx]
+
+def _shift_result(result: ForcedAlignResult, keep: slice, offset_sec: float) -> ForcedAlignResult:
+    return ForcedAlignResult(
+        texts=result.texts[keep],
+        start_times=np.round(result.start_times[keep] + offset_sec, 3),
+        end_times=np.round(result.end_times[keep] + offset_sec, 3),
+    )
 
 
 class Qwen3ForcedAligner:
@@ -322,10 +509,17 @@ class Qwen3ForcedAligner:
         model: Qwen3ASRForConditionalGeneration,
         processor: Qwen3ASRProcessor,
         aligner_processor: Qwen3ForceAlignProcessor,
+        decode_workers: int = 0,
+        resample_quality: str = "high",
+        audio_cache: Optional[DecodedAudioCache] = None,
     ):
         self.model = model
         self.processor = processor
         self.aligner_processor = aligner_processor
+        self.decode_workers = max(0, int(decode_workers))
+        validate_resample_quality(resample_quality)
+        self.resample_quality = resample_quality
+        self.audio_cache = audio_cache
 
         self.device = getattr(model, "device", None)
         if self.device is None:
@@ -341,6 +535,11 @@ class Qwen3ForcedAligner:
     def from_pretrained(
         cls,
         pretrained_model_name_or_path: str,
+        batch_audio_encoder: bool = False,
+        decode_workers: int = 0,
+        resample_quality: str = "high",
+        audio_cache: Optional[DecodedAudioCache] = None,
+        segment_workers: int = 0,
         **kwargs,
     ) -> "Qwen3ForcedAligner":
         """
@@ -351,11 +550,23 @@ class Qwen3ForcedAligner:
           2) Loads the model using `AutoModel.from_pretrained(...)`.
           3) Initializes:
              - HF processor (`AutoProcessor.from_pretrained(...)`)
-             - forced alignment text processor (`Qwen3ForceAlignProcessor()`)
+             - forced alignment text processor (`Qwen3ForceAlignProcessor(num_workers=segment_workers)`)
 
         Args:
             pretrained_model_name_or_path (str):
                 HuggingFace repo id or local directory.
+            batch_audio_encoder (bool):
+                If True, the audio encoder runs once per batch instead of once per audio.
+            decode_workers (int):
+                Number of threads decoding/resampling input audio in `align()`. 0 decodes serially.
+            resample_quality (str):
+                Resampler for non-16k input: "high" (librosa/soxr HQ, default), "fast"
+                (soxr LQ) or "polyphase" (scipy polyphase FIR with cached filter taps).
+            audio_cache (Optional[DecodedAudioCache]):
+                Optional cache of decoded audio shared across `align()` calls.
+            segment_workers (int):
+                Number of worker processes segmenting Japanese / Korean transcripts of a batch
+                (nagisa / soynlp). 0 segments in the calling thread. Stop them with close().
             **kwargs:
                 Forwarded to `AutoModel.from_pretrained(...)`.
                 Typical examples: device_map="cuda:0", dtype=torch.bfloat16.
@@ -373,23 +584,19 @@ class Qwen3ForcedAligner:
             raise TypeError(
                 f"AutoModel returned {type(model)}, expected Qwen3ASRForConditionalGeneration."
             )
+        model.thinker.batch_audio_encoder = bool(batch_audio_encoder)
 
         processor = AutoProcessor.from_pretrained(pretrained_model_name_or_path, fix_mistral_regex=True)
-        aligner_processor = Qwen3ForceAlignProcessor()
-
-        return cls(model=model, processor=processor, aligner_processor=aligner_processor)
-
-    def _to_structured_items(self, timestamp_output: List[Dict[str, Any]]) -> ForcedAlignResult:
-        items: List[ForcedAlignItem] = []
-        for it in timestamp_output:
-            items.append(
-                ForcedAlignItem(
-                    text=str(it.get("text", "")),
-                    start_time=float(it.get("start_time", 0)),
-                    end_time=float(it.get("end_time", 0)),
-                )
-            )
-        return ForcedAlignResult(items=items)
+        aligner_processor = Qwen3ForceAlignProcessor(num_workers=segment_workers)
+
+        return cls(
+            model=model,
+            processor=processor,
+            aligner_processor=aligner_processor,
+            decode_workers=decode_workers,
+            resample_quality=resample_quality,
+            audio_cache=audio_cache,
+        )
 
     @torch.inference_mode()
     def align(
@@ -407,6 +614,8 @@ class Qwen3ForcedAligner:
                   - local path / https URL / base64 string
                   - (np.ndarray, sr)
                 All audios will be converted into mono 16k float32 arrays in [-1, 1].
+                Audios longer than MAX_FORCE_ALIGN_INPUT_SECONDS are aligned in windows of that
+                length, stitched at anchor words.
             text:
                 Transcript(s) for alignment.
             language:
@@ -414,12 +623,17 @@ class Qwen3ForcedAligner:
 
         Returns:
             List[ForcedAlignResult]:
-                One result per sample. Each result contains `items`, and each token can be accessed via
-                `.text`, `.start_time`, `.end_time`.
+                One result per sample: columns `texts`, `start_times`, `end_times`, and item views
+                (iteration / indexing / `items`) with `.text`, `.start_time`, `.end_time`.
         """
         texts = ensure_list(text)
         languages = ensure_list(language)
-        audios = normalize_audios(audio)
+        audios = normalize_audios(
+            audio,
+            num_workers=self.decode_workers,
+            resample_quality=self.resample_quality,
+            cache=self.audio_cache,
+        )
 
         if len(languages) == 1 and len(audios) > 1:
             languages = languages * len(audios)
@@ -429,36 +643,128 @@ class Qwen3ForcedAligner:
                 f"Batch size mismatch: audio={len(audios)}, text={len(texts)}, language={len(languages)}"
             )
 
-        word_lists = []
-        aligner_input_texts = []
-        for t, lang in zip(texts, languages):
-            word_list, aligner_input_text = self.aligner_processor.encode_timestamp(t, lang)
-            word_lists.append(word_list)
-            aligner_input_texts.append(aligner_input_text)
+        word_lists = self.aligner_processor.tokenize_batch(texts, languages)
+
+        window = int(MAX_FORCE_ALIGN_INPUT_SECONDS * SAMPLE_RATE)
+        long_idx = [i for i, a in enumerate(audios) if a.shape[0] > window]
+        if not long_idx:
+            return self._align_words(audios, word_lists)
+
+        results: List[Optional[ForcedAlignResult]] = [None] * len(audios)
+        short_idx = [i for i in range(len(audios)) if audios[i].shape[0] <= window]
+        if short_idx:
+            short_results = self._align_words([audios[i] for i in short_idx], [word_lists[i] for i in short_idx])
+            for i, r in zip(short_idx, short_results):
+                results[i] = r
+        long_results = self._align_long([audios[i] for i in long_idx], [word_lists[i] for i in long_idx])
+        for i, r in zip(long_idx, long_results):
+            results[i] = r
+        return results
 
+    def _align_words(self, audios: List[np.ndarray], word_lists: List[List[str]]) -> List[ForcedAlignResult]:
+        """
+        One aligner forward over already tokenized samples, each at most MAX_FORCE_ALIGN_INPUT_SECONDS long.
+        """
         inputs = self.processor(
-            text=aligner_input_texts,
+            text=[self.aligner_processor.build_input_text(w) for w in word_lists],
             audio=audios,
             return_tensors="pt",
             padding=True,
         )
         inputs = inputs.to(self.model.device).to(self.model.dtype)
 
-        logits = self.model.thinker(**inputs).logits
+        # lm_head only at the <timestamp> slots (row-major, so samples stay contiguous): no
+        # (batch, seq, classes) logits tensor and no KV cache
+        ts_mask = inputs["input_ids"] == self.timestamp_token_id
+        logits = self.model.thinker(**inputs, logits_mask=ts_mask, use_cache=False).logits
         output_ids = logits.argmax(dim=-1)
 
+        # one host transfer for the per-sample counts and all predicted timestamp classes
+        counts = ts_mask.sum(dim=1)
+        packed = torch.cat([counts, output_ids.to(counts.dtype)]).cpu().numpy()
+        counts, timestamp_ids = packed[: len(counts)], packed[len(counts) :]
+        timestamp_ms = timestamp_ids * self.timestamp_segment_time
+
         results: List[ForcedAlignResult] = []
-        for input_id, output_id, word_list in zip(inputs["input_ids"], output_ids, word_lists):
-            masked_output_id = output_id[input_id == self.timestamp_token_id]
-            timestamp_ms = (masked_output_id * self.timestamp_segment_time).to("cpu").numpy()
-            timestamp_output = self.aligner_processor.parse_timestamp(word_list, timestamp_ms)
-            for it in timestamp_output:
-                it['start_time'] = round(it['start_time'] / 1000.0, 3)
-                it['end_time'] = round(it['end_time'] / 1000.0, 3)
-            results.append(self._to_structured_items(timestamp_output))
+        for sample_ms, word_list in zip(np.split(timestamp_ms, np.cumsum(counts)[:-1]), word_lists):
+            fixed = self.aligner_processor.fix_timestamp_array(sample_ms)
+            n = len(word_list)
+            results.append(ForcedAlignResult(
+                texts=word_list,
+                start_times=np.round(fixed[0 : 2 * n : 2] / 1000.0, 3),
+                end_times=np.round(fixed[1 : 2 * n : 2] / 1000.0, 3),
+            ))
+
+        return results
 
+    def _align_long(self, audios: List[np.ndarray], word_lists: List[List[str]]) -> List[ForcedAlignResult]:
+        """
+        Align audios longer than MAX_FORCE_ALIGN_INPUT_SECONDS window by window, stitching at anchor words.
+
+        Each round gives every unfinished sample one full-length window starting at its current
+        anchor, together with the words expected there (the remaining speaking rate times the
+        window, plus slack; surplus words are squeezed to the window end by the aligner). Words
+        ending before the last _ANCHOR_MARGIN_SEC of the window are kept. The next anchor is the kept
+        word, among those ending in the window's last stretch before the margin, that is followed by
+        the longest pause; the next window starts at its end time. A window without any kept word
+        (long non-speech) is skipped as a whole minus the margin. Samples advance in lockstep, so one
+        round is one batched forward.
+        """
+        window_sec = float(MAX_FORCE_ALIGN_INPUT_SECONDS)
+        window = int(window_sec * SAMPLE_RATE)
+        keep_before = window_sec - _ANCHOR_MARGIN_SEC
+
+        starts = [0] * len(audios)       # window start per sample, in samples
+        pointers = [0] * len(audios)     # first unaligned word per sample
+        pieces: List[List[ForcedAlignResult]] = [[] for _ in audios]
+        active = [i for i, w in enumerate(word_lists) if w]
+
+        while active:
+            batch_audio, batch_words = [], []
+            for i in active:
+                a, p, words = starts[i], pointers[i], word_lists[i]
+                remaining = audios[i].shape[0] - a
+                if remaining <= window:
+                    count = len(words) - p
+                else:
+                    rate = (len(words) - p) / remaining
+                    count = min(len(words) - p, max(1, math.ceil(rate * window * _ANCHOR_TEXT_SLACK)))
+                batch_audio.append(audios[i][a : a + window])
+                batch_words.append(words[p : p + count])
+
+            next_active = []
+            for i, wav, words, r in zip(active, batch_audio, batch_words, self._align_words(batch_audio, batch_words)):
+                offset = starts[i] / float(SAMPLE_RATE)
+                if starts[i] + wav.shape[0] >= audios[i].shape[0]:
+                    pieces[i].append(_shift_result(r, slice(None), offset))
+                    continue
+
+                kept = int(np.searchsorted(r.end_times, keep_before, side="right"))
+                if kept == 0:
+                    starts[i] += int(round(keep_before * SAMPLE_RATE))
+                else:
+                    lo = min(int(np.searchsorted(r.end_times, keep_before - _ANCHOR_MARGIN_SEC)), kept - 1)
+                    gaps = np.append(r.start_times[lo + 1 : kept + 1], np.inf)[: kept - lo] - r.end_times[lo:kept]
+                    anchor = kept - 1 - int(np.argmax(gaps[::-1]))  # latest of equal pauses
+                    pieces[i].append(_shift_result(r, slice(0, anchor + 1), offset))
+                    pointers[i] += anchor + 1
+                    starts[i] += int(round(float(r.end_times[anchor]) * SAMPLE_RATE))
+                if pointers[i] < len(word_lists[i]):
+                    next_active.append(i)
+            active = next_active
+
+        results = []
+        for i, words in enumerate(word_lists):
+            if not pieces[i]:
+                results.append(ForcedAlignResult())
+                continue
+            results.append(ForcedAlignResult(
+                texts=[t for r in pieces[i] for t in r.texts],
+                start_times=np.concatenate([r.start_times for r in pieces[i]]),
+                end_times=np.concatenate([r.end_times for r in pieces[i]]),
+            ))
         return results
-    
+
     def get_supported_languages(self) -> Optional[List[str]]:
         """
         List supported language names for the current model.
@@ -481,3 +787,9 @@ class Qwen3ForcedAligner:
             return None
 
         return sorted({str(x).lower() for x in langs})
+
+    def close(self) -> None:
+        """
+        Release the text segmentation worker processes (see segment_workers in from_pretrained()).
+        """
+        self.aligner_processor.close()
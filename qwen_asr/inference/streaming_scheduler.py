@@ -0,0 +1,201 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+_NO_AUDIO = np.zeros((0,), dtype=np.float32)
+
+
+@dataclass
+class _StreamingJob:
+    state: Any
+    pcm16k: Optional[np.ndarray]
+    finish: bool
+    future: Future = field(default_factory=Future)
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class StreamingScheduler:
+    """
+    Batch streaming ASR requests of many concurrent sessions into shared vLLM generate calls.
+
+    Sessions (threads, asyncio tasks, web request handlers, ...) submit PCM pieces or finish
+    requests for their own ASRStreamingState and get a Future back. A background thread
+    collects pending requests into ticks and runs one batched decode per tick with
+    Qwen3ASRModel.streaming_transcribe_batch() / finish_streaming_transcribe_batch().
+
+    A tick starts as soon as max_batch_size requests are pending or the oldest pending
+    request has waited max_wait_ms, so the scheduling delay added to each chunk is capped.
+    A request whose Future is cancelled before its tick starts is dropped.
+
+    Example:
+        scheduler = StreamingScheduler(asr, max_batch_size=64, max_wait_ms=20)
+        state = asr.init_streaming_state()
+        scheduler.submit(pcm, state).result()      # blocking
+        await asyncio.wrap_future(scheduler.submit(pcm, state))   # asyncio
+        scheduler.finish(state).result()
+        scheduler.close()
+    """
+
+    def __init__(self, model: Any, max_batch_size: int = 32, max_wait_ms: float = 20.0):
+        """
+        Args:
+            model:
+                Qwen3ASRModel with the vLLM backend.
+            max_batch_size:
+                Maximum number of requests gathered into one tick.
+            max_wait_ms:
+                Maximum time the oldest pending request waits before a tick starts.
+        """
+        if int(max_batch_size) <= 0:
+            raise ValueError(f"max_batch_size must be > 0, got: {max_batch_size}")
+        self.model = model
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait_sec = max(0.0, float(max_wait_ms) / 1000.0)
+
+        self._pending: List[_StreamingJob] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="qwen-asr-streaming-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, pcm16k: np.ndarray, state: Any) -> Future:
+        """
+        Queue a PCM piece for a stream. Same input rules as Qwen3ASRModel.streaming_transcribe().
+
+        Returns:
+            Future: Resolves to the (mutated) state once all full chunks buffered so far are decoded.
+        """
+        return self._enqueue(_StreamingJob(state=state, pcm16k=pcm16k, finish=False))
+
+    def finish(self, state: Any) -> Future:
+        """
+        Queue the end of a stream. Same semantics as Qwen3ASRModel.finish_streaming_transcribe().
+
+        Returns:
+            Future: Resolves to the (mutated) state after the tail audio is decoded.
+        """
+        return self._enqueue(_StreamingJob(state=state, pcm16k=None, finish=True))
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting requests. Already queued requests are still processed.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            self._thread.join()
+
+    def _enqueue(self, job: _StreamingJob) -> Future:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StreamingScheduler is closed.")
+            self._pending.append(job)
+            self._cond.notify_all()
+        return job.future
+
+    def _next_tick(self) -> Optional[List[_StreamingJob]]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+
+            deadline = self._pending[0].created_at + self.max_wait_sec
+            while len(self._pending) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            jobs = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            return jobs
+
+    def _run(self) -> None:
+        while True:
+            jobs = self._next_tick()
+            if jobs is None:
+                return
+            # cancelled requests are dropped; the rest can no longer be cancelled
+            jobs = [j for j in jobs if j.future.set_running_or_notify_cancel()]
+            try:
+                self._run_tick(jobs)
+            except Exception as e:
+                # an unexpected error fails this tick only; the loop keeps serving other sessions
+                for j in jobs:
+                    if not j.future.done():
+                        j.future.set_exception(e)
+
+    def _run_tick(self, jobs: List[_StreamingJob]) -> None:
+        # Audio first, then finishes, so a finish queued after a piece sees that piece.
+        # Each piece is validated and buffered on its own, so bad input only fails its own future.
+        chunk_jobs: List[_StreamingJob] = []
+        for j in jobs:
+            if j.finish:
+                continue
+            try:
+                self.model._streaming_append(j.pcm16k, j.state)
+            except Exception as e:
+                j.future.set_exception(e)
+                continue
+            chunk_jobs.append(j)
+
+        done = self._call_isolated(
+            chunk_jobs, lambda states: self.model.streaming_transcribe_batch([_NO_AUDIO] * len(states), states)
+        )
+        done += self._call_isolated([j for j in jobs if j.finish], self.model.finish_streaming_transcribe_batch)
+        for j in done:
+            j.future.set_result(j.state)
+
+    def _call_isolated(self, jobs: List[_StreamingJob], call: Callable[[List[Any]], Any]) -> List[_StreamingJob]:
+        """
+        Run call on the states of jobs in one batch. If it fails, run it again state by state, so
+        the exception only reaches the jobs of the failing state. The decode steps leave states
+        untouched when the engine fails, so the retry does not decode anything twice.
+
+        Returns:
+            The jobs whose state was processed successfully.
+        """
+        states = list({id(j.state): j.state for j in jobs}.values())
+        if not states:
+            return []
+        try:
+            call(states)
+            return jobs
+        except Exception as e:
+            if len(states) == 1:
+                for j in jobs:
+                    j.future.set_exception(e)
+                return []
+
+        ok: List[_StreamingJob] = []
+        for state in states:
+            state_jobs = [j for j in jobs if j.state is state]
+            try:
+                call([state])
+            except Exception as e:
+                for j in state_jobs:
+                    j.future.set_exception(e)
+                continue
+            ok.extend(state_jobs)
+        return ok
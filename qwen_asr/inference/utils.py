@@ -14,19 +14,55 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import base64
+import bisect
+import functools
+import hashlib
 import io
-import urllib.request
+import itertools
+import math
+import mmap
+import numbers
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Iterable, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import librosa
 import numpy as np
 import soundfile as sf
 
+from .audio_cache import DecodedAudioCache
+from .audio_fetcher import get_default_audio_fetcher
+from .metrics import bind_recorder, stage
+
+PCMBuffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+PCM_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+@dataclass
+class RawPCM:
+    """
+    Raw interleaved PCM samples in a bytes-like buffer (bytes, bytearray, memoryview, mmap).
+
+    Attributes:
+        data: PCM buffer. float32 data is used without copying.
+        sr: Sampling rate.
+        dtype: "int16" or "float32" (little-endian).
+        channels: Number of interleaved channels.
+    """
+    data: PCMBuffer
+    sr: int = 16000
+    dtype: str = "int16"
+    channels: int = 1
+
+
 AudioLike = Union[
     str,                      # wav path / URL / base64
     Tuple[np.ndarray, int],   # (waveform, sr)
+    Tuple[PCMBuffer, int],    # (raw int16 PCM bytes, sr)
+    RawPCM,
 ]
 MaybeList = Union[Any, List[Any]]
 
@@ -110,6 +146,19 @@ def ensure_list(x: MaybeList) -> List[Any]:
         return x if isinstance(x, list) else [x]
 
 
+def is_single_audio(x: Any) -> bool:
+    """
+    True if x is one audio input (a str, RawPCM, PCM buffer, or an (ndarray | buffer, sr) pair)
+    rather than a collection of them. Any other iterable is a collection.
+    """
+    if isinstance(x, (str, RawPCM) + PCM_BUFFER_TYPES):
+        return True
+    return (
+        isinstance(x, tuple) and len(x) == 2
+        and isinstance(x[0], (np.ndarray,) + PCM_BUFFER_TYPES) and isinstance(x[1], numbers.Real)
+    )
+
+
 def is_url(s: str) -> bool:
     try:
         u = urlparse(s)
@@ -134,14 +183,9 @@ def decode_base64_bytes(b64: str) -> bytes:
 
 def load_audio_any(x: str) -> Tuple[np.ndarray, int]:
     if is_url(x):
-        with urllib.request.urlopen(x) as resp:
-            audio_bytes = resp.read()
-        with io.BytesIO(audio_bytes) as f:
-            audio, sr = sf.read(f, dtype="float32", always_2d=False)
+        return decode_audio_bytes(get_default_audio_fetcher().fetch(x))
     elif is_probably_base64(x):
-        audio_bytes = decode_base64_bytes(x)
-        with io.BytesIO(audio_bytes) as f:
-            audio, sr = sf.read(f, dtype="float32", always_2d=False)
+        return decode_audio_bytes(decode_base64_bytes(x))
     else:
         audio, sr = librosa.load(x, sr=None, mono=False)
 
@@ -150,6 +194,15 @@ def load_audio_any(x: str) -> Tuple[np.ndarray, int]:
     return audio, sr
 
 
+def decode_audio_bytes(audio_bytes: bytes) -> Tuple[np.ndarray, int]:
+    """
+    Decode an encoded audio file (wav, flac, ogg, mp3, ...) held in memory.
+    """
+    with io.BytesIO(audio_bytes) as f:
+        audio, sr = sf.read(f, dtype="float32", always_2d=False)
+    return np.asarray(audio, dtype=np.float32), int(sr)
+
+
 def to_mono(audio: np.ndarray) -> np.ndarray:
     if audio.ndim == 1:
         return audio
@@ -157,53 +210,355 @@ def to_mono(audio: np.ndarray) -> np.ndarray:
     if audio.ndim == 2:
         if audio.shape[0] <= 8 and audio.shape[1] > audio.shape[0]:
             audio = audio.T
-        return np.mean(audio, axis=-1).astype(np.float32)
+        return np.mean(audio, axis=-1).astype(np.float32, copy=False)
     raise ValueError(f"Unsupported audio ndim={audio.ndim}")
 
 
 def float_range_normalize(audio: np.ndarray) -> np.ndarray:
-    audio = audio.astype(np.float32)
+    audio = audio.astype(np.float32, copy=False)
     if audio.size == 0:
         return audio
-    peak = float(np.max(np.abs(audio)))
-    if peak == 0.0:
+    # max/min instead of abs() so in-range input is returned as is, without temporaries or copies.
+    peak = max(float(audio.max()), -float(audio.min()))
+    if peak == 0.0 or peak <= 1.0:
         return audio
     # If decoded audio is int-like scaled or out-of-range, normalize conservatively.
-    if peak > 1.0:
-        audio = audio / peak
+    audio = audio / peak
     audio = np.clip(audio, -1.0, 1.0)
     return audio
 
 
-def normalize_audio_input(a: AudioLike) -> np.ndarray:
+def pcm_from_buffer(buf: PCMBuffer, dtype: str = "int16", channels: int = 1) -> np.ndarray:
+    """
+    View a raw little-endian PCM buffer as float32 samples in [-1, 1].
+
+    float32 data is a zero-copy (read-only) view of the buffer; int16 data is converted with a
+    single allocation.
+
+    Args:
+        buf: bytes, bytearray, memoryview or mmap.
+        dtype: "int16" or "float32".
+        channels: Number of interleaved channels. > 1 returns shape (T, channels).
+
+    Returns:
+        np.ndarray: float32 samples.
+    """
+    if dtype == "int16":
+        x = np.frombuffer(buf, dtype="<i2")
+        x = np.multiply(x, np.float32(1.0 / 32768.0), dtype=np.float32)
+    elif dtype == "float32":
+        x = np.frombuffer(buf, dtype="<f4")
+    else:
+        raise ValueError(f"Unsupported PCM dtype: {dtype}. Supported: int16, float32")
+    if channels > 1:
+        if x.shape[0] % channels != 0:
+            raise ValueError(f"PCM sample count {x.shape[0]} is not a multiple of channels={channels}")
+        x = x.reshape(-1, channels)
+    return x
+
+
+@functools.lru_cache(maxsize=64)
+def _polyphase_filter(up: int, down: int) -> np.ndarray:
+    # Same low-pass design as scipy.signal.resample_poly's default, built once per rate pair.
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    taps = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(np.float32)
+    taps.setflags(write=False)
+    return taps
+
+
+def _resample_polyphase(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    from scipy.signal import resample_poly
+
+    g = math.gcd(orig_sr, target_sr)
+    up, down = target_sr // g, orig_sr // g
+    return resample_poly(audio, up, down, window=_polyphase_filter(up, down)).astype(np.float32, copy=False)
+
+
+def _resample_librosa(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    return librosa.resample(audio, orig_sr=orig_sr, target_sr=target_sr).astype(np.float32)
+
+
+def _resample_fast(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    try:
+        import soxr
+    except ImportError:
+        return _resample_polyphase(audio, orig_sr, target_sr)
+    return soxr.resample(audio, orig_sr, target_sr, quality="LQ").astype(np.float32, copy=False)
+
+
+_RESAMPLERS: Dict[str, Callable[[np.ndarray, int, int], np.ndarray]] = {
+    "high": _resample_librosa,
+    "fast": _resample_fast,
+    "polyphase": _resample_polyphase,
+}
+
+
+def register_resampler(name: str, fn: Callable[[np.ndarray, int, int], np.ndarray]) -> None:
+    """
+    Register a resampler backend usable as `resample_quality=name`.
+
+    Args:
+        name: Backend name.
+        fn: Callable (audio, orig_sr, target_sr) -> float32 waveform.
+    """
+    _RESAMPLERS[str(name)] = fn
+
+
+def validate_resample_quality(quality: str) -> None:
+    """
+    Raise ValueError unless quality names a registered resampler backend.
+    """
+    if quality not in _RESAMPLERS:
+        raise ValueError(f"Unknown resample quality: {quality}. Supported: {sorted(_RESAMPLERS)}")
+
+
+def resample_audio(
+    audio: np.ndarray,
+    orig_sr: int,
+    target_sr: int = SAMPLE_RATE,
+    quality: str = "high",
+) -> np.ndarray:
+    """
+    Resample a mono waveform.
+
+    Args:
+        audio: Mono waveform.
+        orig_sr: Input sampling rate.
+        target_sr: Output sampling rate.
+        quality:
+            "high": librosa.resample default (soxr high quality).
+            "fast": soxr low quality called directly (falls back to "polyphase" without soxr).
+            "polyphase": scipy.signal.resample_poly with the FIR taps cached per rate pair.
+            Or any name added with register_resampler().
+
+    Returns:
+        np.ndarray: Resampled float32 waveform.
+    """
+    validate_resample_quality(quality)
+    if int(orig_sr) == int(target_sr):
+        return audio
+    with stage("resample"):
+        return _RESAMPLERS[quality](audio, int(orig_sr), int(target_sr))
+
+
+def normalize_audio_input(a: AudioLike, resample_quality: str = "high") -> np.ndarray:
     """
     Normalize one audio input to mono 16k float32 waveform in [-1, 1].
 
     Supported inputs:
         - str: local file path / https URL / base64 audio string
         - (np.ndarray, sr): waveform and sampling rate
+        - (bytes | bytearray | memoryview | mmap, sr): raw mono int16 PCM
+        - RawPCM: raw int16/float32 PCM buffer with explicit layout
+
+    Non-16k audio is resampled with resample_audio(quality=resample_quality). Mono float32 16k
+    input already in [-1, 1] is returned without copying.
 
     Returns:
         np.ndarray:
             Mono 16k float32 waveform in [-1, 1].
     """
     if isinstance(a, str):
-        audio, sr = load_audio_any(a)
+        with stage("decode"):
+            audio, sr = load_audio_any(a)
+    elif isinstance(a, RawPCM):
+        audio, sr = pcm_from_buffer(a.data, dtype=a.dtype, channels=int(a.channels)), int(a.sr)
     elif isinstance(a, tuple) and len(a) == 2 and isinstance(a[0], np.ndarray):
         audio, sr = a[0], int(a[1])
+    elif isinstance(a, tuple) and len(a) == 2 and isinstance(a[0], PCM_BUFFER_TYPES):
+        audio, sr = pcm_from_buffer(a[0]), int(a[1])
     else:
         raise TypeError(f"Unsupported audio input type: {type(a)}")
 
     audio = to_mono(np.asarray(audio))
     if sr != SAMPLE_RATE:
-        audio = librosa.resample(audio, orig_sr=sr, target_sr=SAMPLE_RATE).astype(np.float32)
+        audio = resample_audio(audio, orig_sr=sr, target_sr=SAMPLE_RATE, quality=resample_quality)
     audio = float_range_normalize(audio)
     return audio
 
 
-def normalize_audios(audios: Union[AudioLike, List[AudioLike]]) -> List[np.ndarray]:
-    items = ensure_list(audios)
-    return [normalize_audio_input(a) for a in items]
+def _hash_file(path: str, h: Any) -> None:
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+
+
+def load_normalized_audio(
+    a: AudioLike,
+    resample_quality: str = "high",
+    cache: Optional[DecodedAudioCache] = None,
+) -> np.ndarray:
+    """
+    normalize_audio_input() with an optional DecodedAudioCache in front.
+
+    The cache key is a hash of the input content (file bytes, downloaded/base64 bytes, or the
+    waveform/PCM samples and their sampling rate) plus the resampler, so the same audio hits
+    whatever path or URL it arrives under, and a changed file misses.
+    """
+    ready = (
+        isinstance(a, tuple) and len(a) == 2 and isinstance(a[0], np.ndarray)
+        and int(a[1]) == SAMPLE_RATE and a[0].ndim == 1 and a[0].dtype == np.float32
+    )
+    if cache is None or ready:
+        # already mono 16k float32 (e.g. chunks handed to the aligner): nothing worth caching
+        return normalize_audio_input(a, resample_quality=resample_quality)
+
+    h = hashlib.blake2b(digest_size=20)
+    h.update(resample_quality.encode("utf-8"))
+    source: AudioLike = a
+    if isinstance(a, str):
+        if is_url(a) or is_probably_base64(a):
+            # the download counts as decoding, as it does in load_audio_any()
+            with stage("decode"):
+                data = get_default_audio_fetcher().fetch(a) if is_url(a) else decode_base64_bytes(a)
+            h.update(data)
+            source = None
+        else:
+            _hash_file(a, h)
+    elif isinstance(a, RawPCM):
+        h.update(f"pcm:{a.dtype}:{a.channels}:{a.sr}".encode("utf-8"))
+        h.update(memoryview(a.data).cast("B"))
+    elif isinstance(a, tuple) and len(a) == 2 and isinstance(a[0], PCM_BUFFER_TYPES):
+        h.update(f"pcm:int16:1:{int(a[1])}".encode("utf-8"))
+        h.update(memoryview(a[0]).cast("B"))
+    elif isinstance(a, tuple) and len(a) == 2 and isinstance(a[0], np.ndarray):
+        x = np.ascontiguousarray(a[0])
+        h.update(f"array:{x.dtype.str}:{x.shape}:{int(a[1])}".encode("utf-8"))
+        h.update(x.view(np.uint8).reshape(-1))
+    else:
+        raise TypeError(f"Unsupported audio input type: {type(a)}")
+
+    key = h.hexdigest()
+    wav = cache.get(key)
+    if wav is not None:
+        return wav
+    if source is None:
+        with stage("decode"):
+            source = decode_audio_bytes(data)
+    return cache.put(key, normalize_audio_input(source, resample_quality=resample_quality))
+
+
+def iter_normalized_audios(
+    audios: Union[AudioLike, Iterable[AudioLike]],
+    num_workers: int = 0,
+    prefetch: Optional[int] = None,
+    resample_quality: str = "high",
+    cache: Optional[DecodedAudioCache] = None,
+) -> Iterator[np.ndarray]:
+    """
+    Yield normalized waveforms (see normalize_audio_input) in input order.
+
+    With num_workers > 0, decoding and resampling run in a thread pool (soundfile, audioread and
+    librosa's resamplers release the GIL) and stay up to `prefetch` inputs ahead of the consumer,
+    so the caller can run inference on earlier audios while later ones are being decoded.
+
+    Args:
+        audios: One audio or an iterable of audios.
+        num_workers: Decode threads. 0 decodes lazily on the calling thread.
+        prefetch: Max inputs decoded ahead of the consumer. Defaults to 2 * num_workers.
+        resample_quality: Resampler backend, see resample_audio().
+        cache: Optional decoded-audio cache, see load_normalized_audio().
+
+    Yields:
+        np.ndarray: Mono 16k float32 waveform in [-1, 1].
+    """
+    load = functools.partial(load_normalized_audio, resample_quality=resample_quality, cache=cache)
+    return _iter_loaded(load, audios, num_workers=num_workers, prefetch=prefetch)
+
+
+def iter_audio_chunks(
+    audios: Union[AudioLike, Iterable[AudioLike]],
+    max_chunk_sec: float,
+    num_workers: int = 0,
+    prefetch: Optional[int] = None,
+    resample_quality: str = "high",
+    cache: Optional[DecodedAudioCache] = None,
+    vad_options: Optional[Dict[str, Any]] = None,
+    overlap_sec: float = 0.0,
+) -> Iterator[List[Tuple[np.ndarray, float, Optional[List[Tuple[float, float]]]]]]:
+    """
+    Like iter_normalized_audios(), but yields the chunks of each input (see load_audio_chunks()).
+    """
+    load = functools.partial(
+        load_audio_chunks,
+        max_chunk_sec=max_chunk_sec,
+        resample_quality=resample_quality,
+        cache=cache,
+        vad_options=vad_options,
+        overlap_sec=overlap_sec,
+    )
+    return _iter_loaded(load, audios, num_workers=num_workers, prefetch=prefetch)
+
+
+def _iter_loaded(
+    load: Callable[[AudioLike], Any],
+    audios: Union[AudioLike, Iterable[AudioLike]],
+    num_workers: int = 0,
+    prefetch: Optional[int] = None,
+) -> Iterator[Any]:
+    load = bind_recorder(load)
+    items = iter([audios]) if is_single_audio(audios) else iter(audios)
+    prefetched: List[str] = []
+    items = _with_url_prefetch(items, lookahead=max(num_workers, 1) + (prefetch or num_workers), started=prefetched)
+    try:
+        if num_workers <= 0:
+            for a in items:
+                yield load(a)
+            return
+
+        prefetch = max(int(prefetch or 2 * num_workers), 1)
+        with ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="qwen-asr-decode") as pool:
+            pending = deque(pool.submit(load, a) for a in itertools.islice(items, prefetch))
+            try:
+                while pending:
+                    result = pending.popleft().result()
+                    for a in itertools.islice(items, 1):
+                        pending.append(pool.submit(load, a))
+                    yield result
+            finally:
+                for f in pending:
+                    f.cancel()
+    finally:
+        # all loads are done or cancelled: downloads nobody fetched (consumer stopped or failed,
+        # or the input was served from the decoded-audio cache) must not linger in the fetcher
+        if prefetched:
+            get_default_audio_fetcher().discard(prefetched)
+
+
+def _with_url_prefetch(items: Iterator[AudioLike], lookahead: int, started: List[str]) -> Iterator[AudioLike]:
+    # Start downloading URL inputs a few items ahead of the loader, so fetches of a batch overlap.
+    # Prefetched URLs are recorded in started for the caller to discard.
+    fetcher = None
+    ahead: deque = deque()
+    while True:
+        for a in itertools.islice(items, lookahead + 1 - len(ahead)):
+            ahead.append(a)
+            if isinstance(a, str) and is_url(a):
+                fetcher = fetcher or get_default_audio_fetcher()
+                fetcher.prefetch([a])
+                started.append(a)
+        if not ahead:
+            return
+        yield ahead.popleft()
+
+
+def normalize_audios(
+    audios: Union[AudioLike, List[AudioLike]],
+    num_workers: int = 0,
+    resample_quality: str = "high",
+    cache: Optional[DecodedAudioCache] = None,
+) -> List[np.ndarray]:
+    """
+    Normalize one or more audio inputs. With num_workers > 0 inputs are decoded in parallel threads.
+    With a DecodedAudioCache, previously seen audio is served from the cache. Results keep input order.
+    """
+    return list(
+        iter_normalized_audios(
+            ensure_list(audios), num_workers=num_workers, resample_quality=resample_quality, cache=cache
+        )
+    )
 
 
 def chunk_list(xs: List[Any], chunk_size: int) -> Iterable[List[Any]]:
@@ -224,6 +579,55 @@ def chunk_list(xs: List[Any], chunk_size: int) -> Iterable[List[Any]]:
         yield xs[i : i + chunk_size]
 
 
+def make_length_batches(
+    lengths: List[int],
+    max_batch_size: int = -1,
+    max_batch_len: Optional[int] = None,
+    sort_by_length: bool = True,
+) -> List[List[int]]:
+    """
+    Group item indices into batches, optionally bucketing items of similar length together.
+
+    With sort_by_length=True, items are ordered by length (longest first) so that each padded
+    batch contains items of similar duration and short clips do not pay for the padding of a
+    long one. Callers run the batches and write results back by index, which restores the
+    original order.
+
+    With max_batch_len, batches are sized by a padded-length budget instead of only by item
+    count: a batch is closed when (number of items) x (longest item) would exceed the budget.
+    A single item longer than the budget forms its own batch.
+
+    Args:
+        lengths (List[int]): Length of each item (e.g. audio samples).
+        max_batch_size (int): Maximum number of items per batch. <= 0 means no limit.
+        max_batch_len (Optional[int]): Padded length budget per batch. None means no limit.
+        sort_by_length (bool): Whether to bucket items by length.
+
+    Returns:
+        List[List[int]]: Batches of indices into lengths.
+    """
+    order = list(range(len(lengths)))
+    if sort_by_length:
+        order.sort(key=lambda i: lengths[i], reverse=True)
+
+    batches: List[List[int]] = []
+    cur: List[int] = []
+    cur_max = 0
+    for i in order:
+        new_max = max(cur_max, int(lengths[i]))
+        full = max_batch_size is not None and 0 < max_batch_size <= len(cur)
+        over_budget = max_batch_len is not None and new_max * (len(cur) + 1) > max_batch_len
+        if cur and (full or over_budget):
+            batches.append(cur)
+            cur = []
+            new_max = int(lengths[i])
+        cur.append(i)
+        cur_max = new_max
+    if cur:
+        batches.append(cur)
+    return batches
+
+
 @dataclass(frozen=True)
 class AudioChunk:
     """
@@ -235,12 +639,16 @@ class AudioChunk:
         wav: Mono float32 waveform.
         sr: Sampling rate.
         offset_sec: Start offset of this chunk in the original audio, in seconds.
+        time_map: For chunks packed from non-contiguous speech spans (VAD mode), the list of
+            (chunk_time_sec, orig_time_sec) starts of each span; see map_chunk_time(). None means
+            the chunk is contiguous and orig_time = offset_sec + chunk_time.
     """
     orig_index: int
     chunk_index: int
     wav: np.ndarray
     sr: int
     offset_sec: float
+    time_map: Optional[List[Tuple[float, float]]] = None
 
 
 def split_audio_into_chunks(
@@ -249,6 +657,7 @@ def split_audio_into_chunks(
     max_chunk_sec: float,
     search_expand_sec: float = 5.0,
     min_window_ms: float = 100.0,
+    overlap_sec: float = 0.0,
 ) -> List[Tuple[np.ndarray, float]]:
     """
     Split a long audio into chunks close to max_chunk_sec, using a low-energy boundary.
@@ -257,12 +666,17 @@ def split_audio_into_chunks(
       - Concatenating all returned chunks reproduces the original audio exactly
         (total number of samples is identical, no overlaps, no gaps).
 
+    With overlap_sec > 0, every chunk but the last additionally runs overlap_sec past its boundary,
+    i.e. into the head of the next chunk (offsets are unchanged). Dropping those trailing samples
+    gives back the exact partition above. Chunk lengths, overlap included, stay near max_chunk_sec.
+
     Args:
         wav: Mono waveform float32.
         sr: Sampling rate.
         max_chunk_sec: Target max chunk duration in seconds.
         search_expand_sec: Boundary search half-window in seconds.
         min_window_ms: Sliding window in milliseconds for energy estimation.
+        overlap_sec: Audio shared by adjacent chunks, in seconds.
 
     Returns:
         List[Tuple[np.ndarray, float]]: List of (chunk_wav, offset_sec).
@@ -279,6 +693,7 @@ def split_audio_into_chunks(
     max_len = int(max_chunk_sec * sr)
     expand = int(search_expand_sec * sr)
     win = max(4, int((min_window_ms / 1000.0) * sr))
+    overlap = _overlap_samples(overlap_sec, max_chunk_sec, sr)
 
     chunks: List[Tuple[np.ndarray, float]] = []
 
@@ -286,49 +701,352 @@ def split_audio_into_chunks(
     offset_sec = 0.0
 
     while (total_len - start) > max_len:
-        cut = start + max_len
+        boundary = _low_energy_boundary(wav, start, start + max_len - overlap, expand, win)
 
-        left = max(start, cut - expand)
-        right = min(total_len, cut + expand)
+        chunk = wav[start:boundary + overlap]
+        chunks.append((chunk, offset_sec))
 
-        if right - left <= win:
-            boundary = cut
-        else:
-            seg = wav[left:right]
-            seg_abs = np.abs(seg)
+        offset_sec += (boundary - start) / float(sr)
+        start = boundary
 
-            window_sums = np.convolve(seg_abs, np.ones(win, dtype=np.float32), mode="valid")
+    tail = wav[start:total_len]
+    chunks.append((tail, offset_sec))
 
-            min_pos = int(np.argmin(window_sums))
+    return [(_pad_to_min_input(c, sr), off) for c, off in chunks]
 
-            wstart = min_pos
-            wend = min_pos + win
-            local = seg_abs[wstart:wend]
-            inner = int(np.argmin(local))
-            boundary = left + wstart + inner
 
-        boundary = int(max(boundary, start + 1))
-        boundary = int(min(boundary, total_len))
+def _overlap_samples(overlap_sec: float, max_chunk_sec: float, sr: int) -> int:
+    if overlap_sec < 0 or overlap_sec * 2 >= max_chunk_sec:
+        raise ValueError(f"overlap_sec must be in [0, max_chunk_sec / 2), got {overlap_sec} for max_chunk_sec={max_chunk_sec}")
+    return int(overlap_sec * sr)
 
-        chunk = wav[start:boundary]
-        chunks.append((chunk, offset_sec))
 
-        offset_sec += (boundary - start) / float(sr)
-        start = boundary
+def _low_energy_boundary(wav: np.ndarray, start: int, cut: int, expand: int, win: int) -> int:
+    """
+    Pick a split point in wav[start:] near `cut`: the quietest sample inside the lowest-energy
+    `win`-sample window within +-expand samples of cut.
 
-    tail = wav[start:total_len]
-    chunks.append((tail, offset_sec))
+    Moving window energies come from one cumulative sum over the search span, so each cut costs
+    O(span) instead of O(span * win) for a convolution with a ones kernel.
+    """
+    total_len = int(wav.shape[0])
+    left = max(start, cut - expand)
+    right = min(total_len, cut + expand)
+
+    if right - left <= win:
+        boundary = cut
+    else:
+        seg = wav[left:right]
+        seg_abs = np.abs(seg)
+
+        csum = np.empty(seg_abs.shape[0] + 1, dtype=np.float64)
+        csum[0] = 0.0
+        np.cumsum(seg_abs, dtype=np.float64, out=csum[1:])
+        window_sums = csum[win:] - csum[:-win]
+
+        min_pos = int(np.argmin(window_sums))
 
+        wstart = min_pos
+        wend = min_pos + win
+        local = seg_abs[wstart:wend]
+        inner = int(np.argmin(local))
+        boundary = left + wstart + inner
+
+    boundary = int(max(boundary, start + 1))
+    boundary = int(min(boundary, total_len))
+    return boundary
+
+
+def _pad_to_min_input(c: np.ndarray, sr: int) -> np.ndarray:
     # Pad too-short chunks to at least MIN_ASR_INPUT_SECONDS (zero-padding at tail)
     min_len = int(MIN_ASR_INPUT_SECONDS * sr)
-    padded: List[Tuple[np.ndarray, float]] = []
-    for c, off in chunks:
-        if c.shape[0] < min_len:
-            pad = min_len - int(c.shape[0])
-            c = np.pad(c, (0, pad), mode="constant", constant_values=0.0).astype(np.float32)
-        padded.append((c, off))
-    chunks = padded
+    if c.shape[0] < min_len:
+        pad = min_len - int(c.shape[0])
+        c = np.pad(c, (0, pad), mode="constant", constant_values=0.0).astype(np.float32)
+    return c
+
+
+def detect_speech_segments(
+    wav: np.ndarray,
+    sr: int,
+    frame_ms: float = 30.0,
+    threshold_db: Optional[float] = None,
+    min_speech_ms: float = 250.0,
+    min_silence_ms: float = 500.0,
+    pad_ms: float = 200.0,
+) -> List[Tuple[int, int]]:
+    """
+    Energy-based voice activity detection.
+
+    Frames whose RMS level is above the threshold count as speech. Pauses shorter than
+    min_silence_ms are bridged, speech runs shorter than min_speech_ms are dropped, and every
+    segment is padded by pad_ms on both sides (overlapping segments are merged).
+
+    Args:
+        wav: Mono waveform.
+        sr: Sampling rate.
+        frame_ms: Analysis frame length.
+        threshold_db: Speech threshold in dBFS. None adapts to the signal: 12 dB above the noise
+            floor (10th percentile frame level), but at most 20 dB below the loud frames and at
+            least -60 dBFS.
+        min_speech_ms: Shortest kept speech run.
+        min_silence_ms: Shortest pause that splits speech.
+        pad_ms: Padding added around each segment.
+
+    Returns:
+        List[Tuple[int, int]]: Sorted, non-overlapping (start_sample, end_sample) speech segments.
+    """
+    hop = max(1, int(sr * frame_ms / 1000.0))
+    total_len = int(wav.shape[0])
+    n_frames = -(-total_len // hop)
+    if n_frames == 0:
+        return []
+    frames = np.zeros(n_frames * hop, dtype=np.float32)
+    frames[:total_len] = wav
+    power = np.mean(np.square(frames.reshape(n_frames, hop), dtype=np.float64), axis=1)
+    level_db = 10.0 * np.log10(power + 1e-10)
+
+    if threshold_db is None:
+        floor_db = float(np.percentile(level_db, 10))
+        loud_db = float(np.percentile(level_db, 99))
+        threshold_db = max(-60.0, min(floor_db + 12.0, loud_db - 20.0))
+    speech = level_db > threshold_db
+
+    def runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    # bridge short pauses, then drop short bursts
+    min_silence = int(round(min_silence_ms / frame_ms))
+    starts, ends = runs(~speech)
+    for s0, e0 in zip(starts, ends):
+        if 0 < s0 and e0 < n_frames and e0 - s0 < min_silence:
+            speech[s0:e0] = True
+    min_speech = int(round(min_speech_ms / frame_ms))
+    starts, ends = runs(speech)
+
+    pad = int(sr * pad_ms / 1000.0)
+    segments: List[Tuple[int, int]] = []
+    for s0, e0 in zip(starts, ends):
+        if e0 - s0 < min_speech:
+            continue
+        a = max(0, int(s0) * hop - pad)
+        b = min(total_len, int(e0) * hop + pad)
+        if segments and a <= segments[-1][1]:
+            segments[-1] = (segments[-1][0], b)
+        else:
+            segments.append((a, b))
+    return segments
+
+
+def vad_split_audio(
+    wav: np.ndarray,
+    sr: int,
+    max_chunk_sec: float,
+    search_expand_sec: float = 5.0,
+    min_window_ms: float = 100.0,
+    **vad_options: Any,
+) -> List[Tuple[np.ndarray, float, List[Tuple[float, float]]]]:
+    """
+    Drop non-speech and pack the speech segments (detect_speech_segments) into chunks of at most
+    max_chunk_sec. Segments longer than that are cut at low-energy points like
+    split_audio_into_chunks.
 
+    Args:
+        wav: Mono waveform float32.
+        sr: Sampling rate.
+        max_chunk_sec: Target max chunk duration in seconds.
+        search_expand_sec: Boundary search half-window for cutting long segments.
+        min_window_ms: Energy window for cutting long segments.
+        **vad_options: Forwarded to detect_speech_segments().
+
+    Returns:
+        List of (chunk_wav, offset_sec, time_map), where time_map lists the (chunk_time_sec,
+        orig_time_sec) start of every speech span packed into the chunk (see map_chunk_time()).
+        Empty if no speech is found.
+    """
+    wav = np.asarray(wav, dtype=np.float32)
+    max_len = int(max_chunk_sec * sr)
+    expand = int(search_expand_sec * sr)
+    win = max(4, int((min_window_ms / 1000.0) * sr))
+
+    spans: List[Tuple[int, int]] = []
+    for a, b in detect_speech_segments(wav, sr, **vad_options):
+        while b - a > max_len:
+            cut = _low_energy_boundary(wav[:b], a, a + max_len, expand, win)
+            spans.append((a, cut))
+            a = cut
+        spans.append((a, b))
+
+    chunks: List[Tuple[np.ndarray, float, List[Tuple[float, float]]]] = []
+    group: List[Tuple[int, int]] = []
+
+    def flush() -> None:
+        pieces = [wav[a:b] for a, b in group]
+        chunk = pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+        time_map, pos = [], 0
+        for a, b in group:
+            time_map.append((pos / float(sr), a / float(sr)))
+            pos += b - a
+        chunks.append((_pad_to_min_input(chunk, sr), group[0][0] / float(sr), time_map))
+
+    group_len = 0
+    for a, b in spans:
+        if group and group_len + (b - a) > max_len:
+            flush()
+            group, group_len = [], 0
+        group.append((a, b))
+        group_len += b - a
+    if group:
+        flush()
+    return chunks
+
+
+def map_chunk_time(t: Union[float, np.ndarray], time_map: List[Tuple[float, float]]) -> Union[float, np.ndarray]:
+    """
+    Map a time (or an array of times) inside a packed chunk back to the original audio
+    (see vad_split_audio()).
+    """
+    if np.ndim(t) == 0:
+        k = max(0, bisect.bisect_right([c for c, _ in time_map], t) - 1)
+        chunk_start, orig_start = time_map[k]
+        return orig_start + (t - chunk_start)
+    chunk_starts = np.array([c for c, _ in time_map], dtype=np.float64)
+    orig_starts = np.array([o for _, o in time_map], dtype=np.float64)
+    k = np.maximum(np.searchsorted(chunk_starts, t, side="right") - 1, 0)
+    return orig_starts[k] + (t - chunk_starts[k])
+
+
+def iter_audio_file_chunks(
+    path: str,
+    max_chunk_sec: float,
+    search_expand_sec: float = 5.0,
+    min_window_ms: float = 100.0,
+    block_sec: float = 30.0,
+    resample_quality: str = "high",
+    overlap_sec: float = 0.0,
+) -> Iterator[Tuple[np.ndarray, float]]:
+    """
+    Read a local audio file window by window and yield normalized chunks as split_audio_into_chunks
+    would, without decoding the whole file into memory.
+
+    Frames are read sequentially with soundfile in blocks of block_sec and downmixed on the fly;
+    only the samples of the current chunk plus the boundary search window are kept (at the native
+    sampling rate). Each chunk is then resampled to 16k and range-normalized on its own.
+
+    Args:
+        path: Local audio file readable by soundfile (wav, flac, ogg, mp3, ...).
+        max_chunk_sec: Target max chunk duration in seconds.
+        search_expand_sec: Boundary search half-window in seconds.
+        min_window_ms: Sliding window in milliseconds for energy estimation.
+        block_sec: Read block size in seconds.
+        resample_quality: Resampler backend, see resample_audio().
+        overlap_sec: Audio shared by adjacent chunks, in seconds (see split_audio_into_chunks()).
+
+    Yields:
+        Tuple[np.ndarray, float]: (mono 16k float32 chunk, offset_sec).
+    """
+    with sf.SoundFile(path) as f:
+        sr = int(f.samplerate)
+        block = max(1, int(block_sec * sr))
+        max_len = int(max_chunk_sec * sr)
+        expand = int(search_expand_sec * sr)
+        win = max(4, int((min_window_ms / 1000.0) * sr))
+        overlap = _overlap_samples(overlap_sec, max_chunk_sec, sr)
+
+        def finish(chunk: np.ndarray) -> np.ndarray:
+            chunk = float_range_normalize(resample_audio(chunk, sr, SAMPLE_RATE, quality=resample_quality))
+            return _pad_to_min_input(chunk, SAMPLE_RATE)
+
+        buf = np.zeros(0, dtype=np.float32)
+        buf_start = 0  # file frame index of buf[0]
+        eof = False
+        while True:
+            # Buffer enough frames to decide the next boundary (chunk + search window). Blocks are
+            # joined once per chunk; always_2d gives (frames, channels) even for a 1-frame block.
+            blocks = [buf]
+            buffered = buf.shape[0]
+            while not eof and buffered <= max_len + expand:
+                with stage("decode"):
+                    frames = f.read(block, dtype="float32", always_2d=True)
+                if frames.shape[0] == 0:
+                    eof = True
+                    break
+                blocks.append(frames.mean(axis=1, dtype=np.float32) if frames.shape[1] > 1 else frames[:, 0])
+                buffered += frames.shape[0]
+            if len(blocks) > 1:
+                buf = np.concatenate(blocks)
+            if buf.shape[0] <= max_len:
+                break
+            with stage("split"):
+                boundary = _low_energy_boundary(buf, 0, max_len - overlap, expand, win)
+            yield finish(buf[:boundary + overlap]), buf_start / float(sr)
+            buf = buf[boundary:]
+            buf_start += boundary
+
+        yield finish(buf), buf_start / float(sr)
+
+
+def _is_local_long_file(a: Any, max_chunk_sec: float) -> bool:
+    if not isinstance(a, str) or is_url(a) or is_probably_base64(a):
+        return False
+    try:
+        info = sf.info(a)
+    except Exception:
+        return False
+    return info.frames > max_chunk_sec * info.samplerate
+
+
+def load_audio_chunks(
+    a: AudioLike,
+    max_chunk_sec: float,
+    resample_quality: str = "high",
+    cache: Optional[DecodedAudioCache] = None,
+    vad_options: Optional[Dict[str, Any]] = None,
+    overlap_sec: float = 0.0,
+) -> List[Tuple[np.ndarray, float, Optional[List[Tuple[float, float]]]]]:
+    """
+    Normalize one audio input and split it into chunks of at most ~max_chunk_sec.
+
+    Local files longer than max_chunk_sec are read window by window (iter_audio_file_chunks), so
+    peak memory is one mono native-rate window instead of the whole decoded multichannel file.
+    They bypass the cache; other inputs go through load_normalized_audio(cache=cache).
+
+    With vad_options (a dict, possibly empty, of detect_speech_segments() options), non-speech is
+    dropped and speech is packed into chunks with vad_split_audio(). Otherwise adjacent chunks share
+    overlap_sec seconds of audio (see split_audio_into_chunks()).
+
+    Returns:
+        List of (mono 16k chunk_wav, offset_sec, time_map). time_map is None for contiguous
+        chunks; see AudioChunk.time_map.
+    """
+    if vad_options is not None:
+        overlap_sec = 0.0
+    # short chunks search for a boundary within a quarter of their length
+    expand_sec = min(5.0, max_chunk_sec / 4.0)
+    if _is_local_long_file(a, max_chunk_sec):
+        windows = iter_audio_file_chunks(
+            a, max_chunk_sec, search_expand_sec=expand_sec, resample_quality=resample_quality, overlap_sec=overlap_sec,
+        )
+    else:
+        wav = load_normalized_audio(a, resample_quality=resample_quality, cache=cache)
+        if vad_options is None:
+            with stage("split"):
+                windows = split_audio_into_chunks(
+                    wav=wav, sr=SAMPLE_RATE, max_chunk_sec=max_chunk_sec, search_expand_sec=expand_sec,
+                    overlap_sec=overlap_sec,
+                )
+        else:
+            windows = [(wav, 0.0)]
+    if vad_options is None:
+        return [(c, off, None) for c, off in windows]
+
+    chunks = []
+    for window, window_off in windows:
+        with stage("split"):
+            packed = vad_split_audio(window, SAMPLE_RATE, max_chunk_sec, **vad_options)
+        for c, off, time_map in packed:
+            chunks.append((c, window_off + off, [(ct, window_off + ot) for ct, ot in time_map]))
     return chunks
 
 
@@ -495,3 +1213,69 @@ def merge_languages(langs: List[str]) -> str:
         out.append(x)
         prev = x
     return ",".join(out)
+
+
+# CJK ideographs and kana count one unit per character; other scripts one unit per word.
+_CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_MERGE_UNIT_RE = re.compile(f"[{_CJK_CHARS}]|(?:(?![{_CJK_CHARS}])[^\\W_])+")
+
+
+# Upper bound on speech rate (words, or CJK characters, per second) used to size the overlap search.
+_OVERLAP_UNITS_PER_SEC = 8.0
+
+
+def find_overlap_cut(
+    prev: str,
+    nxt: str,
+    overlap_sec: Optional[float] = None,
+    max_units: int = 64,
+    min_match: int = 2,
+    max_edge_units: int = 2,
+) -> Optional[Tuple[int, int]]:
+    """
+    Find where to hand over from prev to nxt, two transcripts whose audio overlaps.
+
+    The tail of prev and the head of nxt (a unit is a word, or a single CJK character) are compared
+    case-insensitively, ignoring punctuation. Only a common run of units that ends at most
+    max_edge_units before the end of prev and starts at most max_edge_units after the start of nxt is
+    accepted, so a phrase that merely repeats elsewhere in either text is never taken for the overlap.
+    The cut is placed in the middle of the longest such run, since words near a chunk edge are the
+    least reliable.
+
+    Args:
+        prev: Text of the earlier chunk.
+        nxt: Text of the later chunk.
+        overlap_sec: Duration of the shared audio. If given, the search is limited to the units that
+            can be spoken in that time.
+        max_units: Units of each side searched for the overlap.
+        min_match: Minimum run length accepted as overlap.
+        max_edge_units: Units allowed after the run in prev and before it in nxt.
+
+    Returns:
+        Optional[Tuple[int, int]]: (end of the kept part of prev, start of the kept part of nxt) as
+        character offsets, or None if no overlap was found.
+    """
+    if overlap_sec is not None:
+        max_units = min(max_units, math.ceil(overlap_sec * _OVERLAP_UNITS_PER_SEC) + max_edge_units)
+    a = list(_MERGE_UNIT_RE.finditer(prev))[-max_units:] if max_units > 0 else []
+    b = list(_MERGE_UNIT_RE.finditer(nxt))[:max_units] if max_units > 0 else []
+    ka = [m.group(0).lower() for m in a]
+    kb = [m.group(0).lower() for m in b]
+
+    # longest common run over units that ends near the end of a and starts near the start of b
+    best_len, best_i, best_j = 0, 0, 0
+    row = [0] * (len(kb) + 1)
+    for i in range(1, len(ka) + 1):
+        new_row = [0] * (len(kb) + 1)
+        for j in range(1, len(kb) + 1):
+            if ka[i - 1] == kb[j - 1]:
+                run = new_row[j] = row[j - 1] + 1
+                if run > best_len and len(ka) - i <= max_edge_units and j - run <= max_edge_units:
+                    best_len, best_i, best_j = run, i - run, j - run
+        row = new_row
+
+    if best_len < max(1, min_match):
+        return None
+    mid = best_len // 2
+    return a[best_i + mid].start(), b[best_j + mid].start()
+
@@ -0,0 +1,44 @@
+"""Tests for the decoded-audio cache (no model weights needed)."""
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import soundfile as sf
+
+from qwen_asr.inference.audio_cache import DecodedAudioCache
+from qwen_asr.inference.utils import normalize_audios
+
+
+def test_lru_eviction_and_stats():
+    cache = DecodedAudioCache(max_bytes=2 * 400)
+    for key in "abc":
+        cache.put(key, np.zeros(100, dtype=np.float32))
+    assert cache.get("a") is None          # evicted, least recently used
+    assert cache.get("c") is not None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 2, 800)
+
+
+def test_disk_spill(tmp_path):
+    cache = DecodedAudioCache(max_bytes=400, spill_dir=str(tmp_path))
+    a = np.arange(100, dtype=np.float32)
+    cache.put("a", a)
+    cache.put("b", np.zeros(100, dtype=np.float32))   # pushes "a" to disk
+    got = cache.get("a")
+    assert np.array_equal(got, a) and not got.flags.writeable
+    assert cache.stats()["spill_hits"] == 1
+
+
+def test_normalize_audios_hits_by_content(tmp_path):
+    sr = 8000
+    x = np.random.default_rng(0).uniform(-0.5, 0.5, sr).astype(np.float32)
+    sf.write(str(tmp_path / "a.wav"), x, sr, subtype="FLOAT")
+    sf.write(str(tmp_path / "copy.wav"), x, sr, subtype="FLOAT")
+    cache = DecodedAudioCache()
+
+    first = normalize_audios([str(tmp_path / "a.wav"), (x, sr)], cache=cache)
+    again = normalize_audios([str(tmp_path / "copy.wav"), (x.copy(), sr)], cache=cache)
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 2
+    assert all(np.array_equal(p, q) for p, q in zip(first, again))
+    assert np.array_equal(again[1], normalize_audios((x, sr))[0])
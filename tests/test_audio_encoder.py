@@ -0,0 +1,94 @@
+"""Tests for the transformers audio encoder with a tiny random config (no model weights needed)."""
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from qwen_asr.core.transformers_backend.configuration_qwen3_asr import Qwen3ASRThinkerConfig
+from qwen_asr.core.transformers_backend.modeling_qwen3_asr import Qwen3ASRThinkerForConditionalGeneration
+
+
+def _tiny_thinker(attn_implementation="eager"):
+    torch.manual_seed(0)
+    config = Qwen3ASRThinkerConfig(
+        audio_config=dict(
+            num_mel_bins=16, encoder_layers=2, encoder_attention_heads=2, encoder_ffn_dim=32,
+            d_model=16, output_dim=24, n_window=50, n_window_infer=200, downsample_hidden_size=8,
+        ),
+        text_config=dict(
+            vocab_size=64, hidden_size=24, intermediate_size=32, num_hidden_layers=1,
+            num_attention_heads=2, num_key_value_heads=1, head_dim=12,
+            rope_scaling={"rope_type": "default", "mrope_section": [2, 2, 2]},
+        ),
+    )
+    config._attn_implementation = attn_implementation
+    config.audio_config._attn_implementation = attn_implementation
+    config.text_config._attn_implementation = attn_implementation
+    return Qwen3ASRThinkerForConditionalGeneration(config).eval()
+
+
+# --- Batched audio encoder ---
+
+@pytest.mark.parametrize("attn_implementation", ["eager", "sdpa"])
+def test_batched_audio_features_match_per_sample(attn_implementation):
+    thinker = _tiny_thinker(attn_implementation)
+    # mixed lengths: shorter than one conv chunk, exact multiples, and several attention windows
+    lengths = [37, 100, 450, 60, 200, 513]
+    features = torch.randn(len(lengths), 16, max(lengths))
+    mask = torch.zeros(len(lengths), max(lengths), dtype=torch.long)
+    for i, n in enumerate(lengths):
+        mask[i, :n] = 1
+
+    with torch.no_grad():
+        thinker.batch_audio_encoder = False
+        expected = thinker.get_audio_features(features, feature_attention_mask=mask)
+        thinker.batch_audio_encoder = True
+        batched = thinker.get_audio_features(features, feature_attention_mask=mask)
+
+    assert batched.shape == expected.shape
+    assert torch.allclose(batched, expected, atol=1e-5)
+
+
+# --- Windowed encoder attention ---
+
+def test_prepare_attention_mask_is_block_diagonal():
+    encoder = _tiny_thinker().audio_tower
+    cu_seqlens = torch.tensor([0, 4, 8, 11], dtype=torch.int32)
+    mask = encoder._prepare_attention_mask(torch.zeros(11, 16), cu_seqlens)[0, 0]
+    expected = torch.full((11, 11), torch.finfo(torch.float32).min)
+    for start, end in [(0, 4), (4, 8), (8, 11)]:
+        expected[start:end, start:end] = 0
+    assert torch.equal(mask, expected)
+
+
+@pytest.mark.parametrize("attn_implementation", ["eager", "sdpa"])
+def test_windowed_attention_matches_dense_mask(attn_implementation):
+    encoder = _tiny_thinker(attn_implementation).audio_tower
+    attn = encoder.layers[0].self_attn
+    hidden_states = torch.randn(31, 16)
+    cu_seqlens = torch.tensor([0, 13, 26, 31], dtype=torch.int32)
+    mask = encoder._prepare_attention_mask(hidden_states, cu_seqlens)
+    with torch.no_grad():
+        windowed = attn(hidden_states, cu_seqlens=cu_seqlens)
+        dense = attn(hidden_states, cu_seqlens=cu_seqlens, attention_mask=mask)
+    assert torch.allclose(windowed, dense, atol=1e-5)
+
+
+# --- Masked lm_head ---
+
+def test_logits_mask_scores_only_selected_positions():
+    thinker = _tiny_thinker()
+    input_ids = torch.randint(1, 64, (2, 12))
+    attention_mask = torch.ones_like(input_ids)
+    attention_mask[1, :3] = 0  # left padding
+    mask = torch.rand(2, 12) < 0.4
+    with torch.no_grad():
+        full = thinker(input_ids=input_ids, attention_mask=attention_mask, use_cache=False).logits
+        thinker.rope_deltas = None
+        sparse = thinker(input_ids=input_ids, attention_mask=attention_mask, use_cache=False, logits_mask=mask).logits
+    assert sparse.shape == (int(mask.sum()), full.shape[-1])
+    assert torch.allclose(sparse, full[mask], atol=1e-5)
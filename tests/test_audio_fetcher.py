@@ -0,0 +1,167 @@
+"""Tests for the pooled HTTP audio fetcher, against a local HTTP server."""
+import io, os, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from qwen_asr.inference import audio_fetcher
+from qwen_asr.inference.audio_cache import DecodedAudioCache
+from qwen_asr.inference.audio_fetcher import AudioFetcher
+from qwen_asr.inference.metrics import MetricsRecorder, recording
+from qwen_asr.inference.utils import iter_normalized_audios, normalize_audios
+
+
+def _wav_bytes(seconds=0.5, sr=16000):
+    buf = io.BytesIO()
+    sf.write(buf, np.full(int(seconds * sr), 0.25, dtype=np.float32), sr, format="WAV")
+    return buf.getvalue()
+
+
+@pytest.fixture(scope="module")
+def server():
+    body = _wav_bytes()
+    hits = {"get": 0, "304": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            hits["get"] += 1
+            if self.path == "/missing.wav":
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.headers.get("If-None-Match") == '"v1"':
+                hits["304"] += 1
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/wav")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", body, hits
+    httpd.shutdown()
+
+
+def test_fetch_and_prefetch(server):
+    base, body, hits = server
+    fetcher = AudioFetcher(max_workers=4)
+    urls = [f"{base}/a{i}.wav" for i in range(4)]
+    fetcher.prefetch(urls)
+    assert all(fetcher.fetch(u) == body for u in urls)
+    with pytest.raises(RuntimeError):
+        fetcher.fetch(f"{base}/missing.wav")
+    fetcher.close()
+
+
+def test_max_bytes(server):
+    base, body, _ = server
+    fetcher = AudioFetcher(max_bytes=len(body) - 1)
+    with pytest.raises(ValueError):
+        fetcher.fetch(f"{base}/big.wav")
+    fetcher.close()
+
+
+def test_etag_disk_cache(server, tmp_path):
+    base, body, hits = server
+    fetcher = AudioFetcher(cache_dir=str(tmp_path))
+    before = hits["304"]
+    assert fetcher.fetch(f"{base}/cached.wav") == body
+    assert hits["304"] == before
+    assert fetcher.fetch(f"{base}/cached.wav") == body
+    assert hits["304"] == before + 1
+
+    # the body is evicted between reading its ETag and the 304: fetched again in full
+    read_cache = fetcher._read_cache
+    def evicting_read(url, with_body):
+        if with_body:
+            os.remove(fetcher._cache_path(url))
+        return read_cache(url, with_body)
+    fetcher._read_cache = evicting_read
+    gets = hits["get"]
+    assert fetcher.fetch(f"{base}/cached.wav") == body
+    assert hits["304"] == before + 2 and hits["get"] == gets + 2
+    fetcher.close()
+
+
+def test_url_inputs_use_default_fetcher(server, monkeypatch):
+    base, _, _ = server
+    fetcher = AudioFetcher()
+    monkeypatch.setattr(audio_fetcher, "_default_fetcher", fetcher)
+    wavs = normalize_audios([f"{base}/x{i}.wav" for i in range(3)])
+    assert [len(w) for w in wavs] == [8000] * 3
+    assert np.allclose(wavs[0], 0.25)
+    fetcher.close()
+
+
+def test_unclaimed_prefetches_are_dropped(server, monkeypatch):
+    base, body, hits = server
+    fetcher = AudioFetcher(max_workers=2)
+    monkeypatch.setattr(audio_fetcher, "_default_fetcher", fetcher)
+    urls = [f"{base}/p{i}.wav" for i in range(6)]
+
+    # consumer stops after the first input
+    it = iter_normalized_audios(urls, num_workers=2)
+    next(it)
+    it.close()
+    assert not fetcher._inflight
+
+    # consumer fails part-way
+    with pytest.raises(RuntimeError):
+        list(iter_normalized_audios(urls[:2] + [f"{base}/missing.wav"] + urls[2:]))
+    assert not fetcher._inflight
+    fetcher.close()
+
+
+def test_prefetch_expiry_and_limit(server):
+    base, body, hits = server
+    fetcher = AudioFetcher(max_workers=1, prefetch_ttl=0.0, max_prefetched=2)
+    fetcher.prefetch([f"{base}/t{i}.wav" for i in range(4)])
+    assert list(fetcher._inflight) == [f"{base}/t2.wav", f"{base}/t3.wav"]
+    fetcher._inflight[f"{base}/t3.wav"][0].result()
+    before = hits["get"]
+    assert fetcher.fetch(f"{base}/t3.wav") == body  # stale prefetch is not used
+    assert hits["get"] == before + 1
+    fetcher.close()
+
+
+def test_disk_cache_is_bounded(server, tmp_path):
+    base, body, _ = server
+    fetcher = AudioFetcher(cache_dir=str(tmp_path), max_cache_entries=2)
+    for i in range(3):
+        fetcher.fetch(f"{base}/d{i}.wav")
+    assert len(os.listdir(tmp_path)) == 2
+    assert not os.path.exists(fetcher._cache_path(f"{base}/d0.wav"))
+    fetcher.close()
+    small = AudioFetcher(cache_dir=str(tmp_path), max_cache_bytes=len(body) + 100)
+    small.fetch(f"{base}/d3.wav")
+    assert os.listdir(tmp_path) == [os.path.basename(small._cache_path(f"{base}/d3.wav"))]
+    small.close()
+
+
+def test_url_download_counts_as_decode_with_a_cache(server, monkeypatch):
+    base, body, _ = server
+    fetcher = AudioFetcher()
+    monkeypatch.setattr(audio_fetcher, "_default_fetcher", fetcher)
+    fetch = fetcher.fetch
+    monkeypatch.setattr(fetcher, "fetch", lambda url: time.sleep(0.2) or fetch(url))
+    recorder = MetricsRecorder()
+    with recording(recorder):
+        normalize_audios([f"{base}/timed.wav"], cache=DecodedAudioCache())
+    assert recorder.stage_total("decode") >= 0.2
+    fetcher.close()
@@ -0,0 +1,83 @@
+"""Tests for the streaming audio encoder window cache (plain torch, no vLLM needed)."""
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import torch
+
+from qwen_asr.core.audio_window_cache import AudioWindowCache, encode_with_window_cache
+from qwen_asr.core.transformers_backend.modeling_qwen3_asr import _get_feat_extract_output_lengths
+
+MEL = 8
+WINDOW = 200  # n_window_infer frames; 100-frame conv chunks -> 26 tokens per window
+
+
+class _WindowLocalEncoder:
+    """Fake encoder whose output for every WINDOW-frame span depends only on that span, like the real one."""
+
+    def __init__(self):
+        self.frames_encoded = 0
+
+    def __call__(self, input_features, feature_lens, aftercnn_lens):
+        self.frames_encoded += int(feature_lens.sum())
+        outs = []
+        for feat in input_features.split(feature_lens.tolist(), dim=1):
+            for piece in feat.split(WINDOW, dim=1):
+                n = int(_get_feat_extract_output_lengths(torch.tensor(piece.shape[1])))
+                pos = torch.arange(n, dtype=feat.dtype)
+                outs.append(torch.stack([pos + piece.mean(), pos * piece.std(), piece[:, ::7].sum().expand(n)], -1))
+        out = torch.cat(outs)
+        assert out.shape[0] == int(aftercnn_lens.sum())
+        return out
+
+
+def _batch(*feats):
+    return torch.cat(feats, dim=1), torch.tensor([f.shape[1] for f in feats])
+
+
+def test_fingerprint_is_exact_and_batch_independent():
+    cache = AudioWindowCache(max_windows=8, window_frames=WINDOW, num_mel_bins=MEL)
+    windows = torch.randn(3, MEL, WINDOW)
+    keys = cache.fingerprint(windows)
+    assert len(set(keys)) == 3
+    assert [cache.fingerprint(windows[i : i + 1])[0] for i in range(3)] == keys
+    nudged = windows[1].clone()
+    nudged[3, 17] = torch.nextafter(nudged[3, 17], torch.tensor(1e9))
+    assert cache.fingerprint(nudged[None])[0] != keys[1]
+    assert cache.fingerprint(windows[:0]) == []
+
+
+def test_lru_eviction():
+    cache = AudioWindowCache(max_windows=2, window_frames=WINDOW, num_mel_bins=MEL)
+    a, b, c = (torch.full((1,), float(i)) for i in range(3))
+    cache.put((1, 1), a)
+    cache.put((2, 2), b)
+    assert cache.get((1, 1)) is a  # (2, 2) is now least recently used
+    cache.put((3, 3), c)
+    assert len(cache) == 2 and cache.get((2, 2)) is None
+    assert cache.get((1, 1)) is a and cache.get((3, 3)) is c
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cached_output_equals_uncached_while_streaming():
+    torch.manual_seed(0)
+    cache = AudioWindowCache(max_windows=64, window_frames=WINDOW, num_mel_bins=MEL)
+    encoder = _WindowLocalEncoder()
+    stream_a, stream_b = torch.randn(MEL, 1000), torch.randn(MEL, 1000)
+    prev_lens = torch.zeros(2, dtype=torch.long)
+    for t in (130, 260, 470, 610, 990):
+        feats, lens = _batch(stream_a[:, :t], stream_b[:, : t // 2 + 50])
+        expected = _WindowLocalEncoder()(feats, lens, _get_feat_extract_output_lengths(lens))
+        before = encoder.frames_encoded
+        got = encode_with_window_cache(cache, encoder, feats, lens, _get_feat_extract_output_lengths)
+        assert torch.equal(got, expected)
+        # full windows completed on the previous step are reused, the rest is encoded
+        assert encoder.frames_encoded - before == int((lens - prev_lens // WINDOW * WINDOW).sum())
+        prev_lens = lens
+    # a changed early window (e.g. re-normalized features) is recomputed, never reused
+    changed = stream_a[:, :990].clone()
+    changed[:, 10] += 1.0
+    feats, lens = _batch(changed)
+    expected = _WindowLocalEncoder()(feats, lens, _get_feat_extract_output_lengths(lens))
+    assert torch.equal(encode_with_window_cache(cache, encoder, feats, lens, _get_feat_extract_output_lengths), expected)
@@ -0,0 +1,274 @@
+"""Tests for the forced aligner's text/timestamp processing (no model weights needed)."""
+import copy, os, pickle, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import torch
+import pytest
+
+from qwen_asr.inference.qwen3_asr import ASRTranscription
+from qwen_asr.inference.qwen3_forced_aligner import (
+    ForcedAlignResult,
+    Qwen3ForceAlignProcessor,
+    Qwen3ForcedAligner,
+)
+
+
+@pytest.fixture(scope="module")
+def processor():
+    return Qwen3ForceAlignProcessor()
+
+
+def _fix_timestamp_reference(data):
+    # the original O(n^2) implementation
+    data = data.tolist()
+    n = len(data)
+    dp = [1] * n
+    parent = [-1] * n
+    for i in range(1, n):
+        for j in range(i):
+            if data[j] <= data[i] and dp[j] + 1 > dp[i]:
+                dp[i] = dp[j] + 1
+                parent[i] = j
+    idx = dp.index(max(dp))
+    is_normal = [False] * n
+    while idx != -1:
+        is_normal[idx] = True
+        idx = parent[idx]
+    result = data.copy()
+    i = 0
+    while i < n:
+        if is_normal[i]:
+            i += 1
+            continue
+        j = i
+        while j < n and not is_normal[j]:
+            j += 1
+        left_val = next((result[k] for k in range(i - 1, -1, -1) if is_normal[k]), None)
+        right_val = next((result[k] for k in range(j, n) if is_normal[k]), None)
+        for k in range(i, j):
+            if left_val is None:
+                result[k] = right_val
+            elif right_val is None:
+                result[k] = left_val
+            elif j - i <= 2:
+                result[k] = left_val if (k - (i - 1)) <= (j - k) else right_val
+            else:
+                result[k] = left_val + (right_val - left_val) / (j - i + 1) * (k - i + 1)
+        i = j
+    return [int(r) for r in result]
+
+
+# --- Timestamp repair ---
+
+def test_fix_timestamp_matches_reference(processor):
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        n = int(rng.integers(1, 60))
+        ts = np.sort(rng.integers(0, 40, n)) * 80
+        # inject glitches: isolated spikes, dips and a few long bad runs
+        for _ in range(int(rng.integers(0, 6))):
+            a = int(rng.integers(0, n))
+            b = min(n, a + int(rng.integers(1, 6)))
+            ts[a:b] = rng.integers(0, 40, b - a) * 80
+        assert processor.fix_timestamp(ts) == _fix_timestamp_reference(ts)
+    float_ts = np.array([0.0, 80.0, 4000.0, 160.0, 240.0, 0.0, 10.0, 20.0, 30.0, 400.0])
+    assert processor.fix_timestamp(float_ts) == _fix_timestamp_reference(float_ts)
+
+
+@pytest.mark.filterwarnings("error")
+def test_fix_timestamp_interpolates_long_runs(processor):
+    ts = np.array([0, 100, 900, 800, 700, 300, 400, 600])
+    assert processor.fix_timestamp(ts) == [0, 100, 150, 200, 250, 300, 400, 600]
+    # a run of <= 2 snaps to the nearer neighbour
+    assert processor.fix_timestamp(np.array([0, 100, 900, 50, 200, 300])) == [0, 100, 100, 200, 200, 300]
+    # runs at either end copy their only neighbour
+    assert processor.fix_timestamp(np.array([900, 800, 700, 10, 20, 30, 5, 4, 3])) == [10, 10, 10, 10, 20, 30, 30, 30, 30]
+
+
+# --- Word segmentation ---
+
+def test_segmentation_cache(monkeypatch):
+    proc = Qwen3ForceAlignProcessor(cache_size=2)
+    calls = []
+    segment = proc._segment
+    monkeypatch.setattr(proc, "_segment", lambda text, lang: calls.append(text) or segment(text, lang))
+    texts = ["hello world", "one two", "hello world"]
+    words = proc.tokenize_batch(texts, ["English", "english", "ENGLISH"])
+    assert words == [["hello", "world"], ["one", "two"], ["hello", "world"]]
+    assert calls == ["hello world", "one two"]
+    words[0].append("x")  # callers get their own lists
+    assert proc.tokenize("hello world", "English") == ["hello", "world"]
+    proc.tokenize("three", "English")  # evicts "one two"
+    proc.tokenize("one two", "English")
+    assert calls == ["hello world", "one two", "three", "one two"]
+
+
+def test_segmentation_worker_pool():
+    texts = ["今日はいい天気ですね。", "公園に散歩に行きましょう。", "오늘은 날씨가 좋네요", "hello world"]
+    langs = ["Japanese", "Japanese", "Korean", "English"]
+    serial = Qwen3ForceAlignProcessor(cache_size=0)
+    pooled = Qwen3ForceAlignProcessor(num_workers=2)
+    aligner = Qwen3ForcedAligner(_FakeModel(torch.zeros(1, 1, dtype=torch.long)), _FakeProcessor(), pooled)
+    try:
+        assert pooled.tokenize_batch(texts, langs) == [serial.tokenize(t, l) for t, l in zip(texts, langs)]
+    finally:
+        aligner.close()
+    assert pooled._pool is None
+
+
+# --- Result container ---
+
+def test_align_result_survives_pickle_and_deepcopy():
+    res = ForcedAlignResult(texts=["a", "b"], start_times=[0.0, 0.5], end_times=[0.4, 0.9])
+    for copied in (pickle.loads(pickle.dumps(res)), copy.deepcopy(res), copy.deepcopy(ASRTranscription("English", "a b", res))):
+        got = getattr(copied, "time_stamps", copied)
+        assert got == res and got.texts is not res.texts
+        assert not got.start_times.flags.writeable
+        with pytest.raises(AttributeError):
+            got.texts = []
+
+
+# --- Batched timestamp extraction ---
+
+class _Inputs(dict):
+    def to(self, *args):
+        return self
+
+
+class _FakeProcessor:
+    """Tokenizes aligner prompts as 1 (plain) / 7 (<timestamp>) ids, right-padded with 0."""
+
+    def __call__(self, text, audio, **kwargs):
+        seqs = [[7 if p == "<timestamp>" else 1 for p in t.replace("<timestamp>", "|<timestamp>|").split("|") if p]
+                for t in text]
+        width = max(len(q) for q in seqs)
+        return _Inputs(input_ids=torch.tensor([q + [0] * (width - len(q)) for q in seqs]))
+
+
+class _FakeModel:
+    device = "cpu"
+    dtype = torch.float32
+
+    class config:
+        timestamp_token_id = 7
+        timestamp_segment_time = 80
+
+    def __init__(self, output_ids):
+        self.output_ids = output_ids
+        self.thinker = self
+
+    def __call__(self, input_ids, logits_mask=None, use_cache=None):
+        logits = torch.nn.functional.one_hot(self.output_ids[:, : input_ids.shape[1]], num_classes=64).float()
+        if logits_mask is not None:
+            logits = logits[logits_mask]
+        return type("Out", (), {"logits": logits})()
+
+
+def test_align_extracts_timestamps_in_one_pass(processor):
+    texts = ["hello big world", "one two", "a b c d e"]
+    rng = np.random.default_rng(0)
+    output_ids = torch.tensor(rng.integers(0, 64, (3, 40)))
+    aligner = Qwen3ForcedAligner(_FakeModel(output_ids), _FakeProcessor(), processor)
+    audio = (np.zeros(16000, np.float32), 16000)
+    results = aligner.align([audio] * 3, texts, "English")
+
+    inputs = _FakeProcessor()([processor.encode_timestamp(t, "English")[1] for t in texts], None)
+    for res, text, input_id, output_id in zip(results, texts, inputs["input_ids"], output_ids):
+        # the previous per-sample path
+        words = processor.encode_timestamp(text, "English")[0]
+        ms = (output_id[: len(input_id)][input_id == 7] * 80).numpy()
+        expected = [(it["text"], round(it["start_time"] / 1000.0, 3), round(it["end_time"] / 1000.0, 3))
+                    for it in processor.parse_timestamp(words, ms)]
+        assert [(it.text, it.start_time, it.end_time) for it in res] == expected
+        assert res.texts == words and res.start_times.dtype == np.float64
+        assert res[-1].end_time == expected[-1][2] and len(res[:2]) == 2
+
+
+# --- Long-form alignment ---
+
+def _long_aligner(processor, samples, sr=16000):
+    """
+    Aligner whose _align_words places word "<tag><k>" of sample tag at its true (start, end) times.
+    samples maps tag -> (total_sec, starts, ends). Every audio sample holds its own time as a fraction
+    of the total, so the fake knows where a window starts; the windows it sees are recorded.
+    """
+    windows = []
+
+    def fake_align_words(audios, word_lists):
+        out = []
+        for a, ws in zip(audios, word_lists):
+            tag = ws[0].rstrip("0123456789")
+            total_sec, starts, ends = samples[tag]
+            offset, length = round(float(a[0]) * total_sec, 3), len(a) / sr
+            windows.append((tag, offset, len(ws)))
+            idx = np.array([int(w[len(tag):]) for w in ws])
+            # words outside the window are squeezed to its edges, like the real aligner does
+            start = np.clip(starts[idx] - offset, 0, length)
+            end = np.clip(ends[idx] - offset, 0, length)
+            out.append(ForcedAlignResult(texts=list(ws), start_times=np.round(start, 3), end_times=np.round(end, 3)))
+        return out
+
+    aligner = Qwen3ForcedAligner(_FakeModel(torch.zeros(1, 1, dtype=torch.long)), _FakeProcessor(), processor)
+    aligner._align_words = fake_align_words
+    audios = [((np.arange(int(total * sr)) / (total * sr)).astype(np.float32), sr) for total, _, _ in samples.values()]
+    texts = [" ".join(f"{tag}{k}" for k in range(len(starts))) for tag, (_, starts, _) in samples.items()]
+    return aligner, audios, texts, windows
+
+
+def _check_long(res, tag, starts, ends):
+    # every word exactly once, in order, at its true time
+    assert res.texts == [f"{tag}{k}" for k in range(len(starts))]
+    assert np.allclose(res.start_times, starts, atol=2e-3)
+    assert np.allclose(res.end_times, ends, atol=2e-3)
+    assert np.all(np.diff(res.start_times) >= 0)
+
+
+def test_long_audio_is_aligned_in_windows_and_stitched(processor):
+    # word k is spoken at [0.6 k, 0.6 k + 0.4) s, with a 5 s pause every 250 words
+    starts = np.array([0.6 * k + 5.0 * (k // 250) for k in range(1000)])
+    aligner, audios, texts, windows = _long_aligner(processor, {"w": (620.0, starts, starts + 0.4)})
+    res = aligner.align(audios, texts, "English")[0]
+
+    _check_long(res, "w", starts, starts + 0.4)
+    assert all(np.diff(res.start_times) > 0)
+    # each window is at most 180 s and later ones start at the anchor word before a pause
+    assert [off for _, off, _ in windows] == [0.0, 149.8, 304.8, 459.8]
+
+
+def test_long_audio_skips_windows_without_speech(processor):
+    # 100 words, 400 s of silence, 100 more words
+    starts = np.array([0.6 * k + 400.0 * (k // 100) for k in range(200)])
+    aligner, audios, texts, windows = _long_aligner(processor, {"w": (520.0, starts, starts + 0.4)})
+    res = aligner.align(audios, texts, "English")[0]
+
+    _check_long(res, "w", starts, starts + 0.4)
+    offsets = [off for _, off, _ in windows]
+    # windows with no kept word move on by the window minus the margin
+    assert np.isclose(np.diff(offsets), 160.0).sum() >= 2
+    assert offsets == sorted(offsets)
+
+
+def test_long_audio_survives_a_low_word_estimate(processor):
+    # 900 fast words in the first 300 s, then 100 slow ones: the first windows get too few words
+    starts = np.concatenate([np.arange(900) * (300.0 / 900), 300.0 + np.arange(100) * 3.0])
+    ends = starts + np.where(np.arange(1000) < 900, 0.25, 1.0)
+    aligner, audios, texts, windows = _long_aligner(processor, {"w": (600.0, starts, ends)})
+    res = aligner.align(audios, texts, "English")[0]
+
+    _check_long(res, "w", starts, ends)
+    assert windows[0][2] < np.searchsorted(starts, 160.0)  # the estimate really was low
+
+
+def test_long_and_short_audio_in_one_batch(processor):
+    fast = np.arange(1200) * 0.5
+    slow = np.array([0.6 * k + 5.0 * (k // 250) for k in range(1000)])
+    short = np.arange(40) * 0.5
+    samples = {"a": (610.0, fast, fast + 0.4), "b": (30.0, short, short + 0.4), "c": (620.0, slow, slow + 0.4)}
+    aligner, audios, texts, windows = _long_aligner(processor, samples)
+    results = aligner.align(audios, texts, "English")
+
+    for res, (tag, (_, starts, ends)) in zip(results, samples.items()):
+        _check_long(res, tag, starts, ends)
+    assert [w for w in windows if w[0] == "b"] == [("b", 0.0, 40)]
@@ -0,0 +1,250 @@
+"""Tests for qwen_asr.inference.utils helpers (no model weights needed)."""
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pytest
+import soundfile as sf
+from scipy.signal import resample_poly
+
+from qwen_asr.inference.utils import (
+    RawPCM,
+    iter_audio_file_chunks,
+    is_single_audio,
+    iter_normalized_audios,
+    detect_speech_segments,
+    load_audio_chunks,
+    make_length_batches,
+    map_chunk_time,
+    find_overlap_cut,
+    normalize_audio_input,
+    normalize_audios,
+    resample_audio,
+    split_audio_into_chunks,
+    vad_split_audio,
+)
+
+
+# --- Length-bucketed batching ---
+
+def test_length_batches_input_order_without_sorting():
+    assert make_length_batches([5, 100, 3, 50, 7], max_batch_size=2, sort_by_length=False) == [[0, 1], [2, 3], [4]]
+
+def test_length_batches_bucket_by_length():
+    batches = make_length_batches([5, 100, 3, 50, 7], max_batch_size=2)
+    assert batches == [[1, 3], [4, 0], [2]]
+    assert sorted(i for b in batches for i in b) == list(range(5))
+
+def test_length_batches_padded_budget():
+    # 100 alone; 50 + 7 padded to 2 x 50 = 100 <= 120; 5 + 3 -> 10
+    assert make_length_batches([5, 100, 3, 50, 7], max_batch_len=120) == [[1], [3, 4], [0, 2]]
+    # an item longer than the budget still gets its own batch
+    assert make_length_batches([500, 1], max_batch_len=100) == [[0], [1]]
+
+def test_length_batches_empty():
+    assert make_length_batches([], max_batch_size=4) == []
+
+
+# --- Parallel audio decoding ---
+
+def test_normalize_audios_parallel_keeps_order():
+    rng = np.random.default_rng(0)
+    audios = [(rng.uniform(-0.5, 0.5, 800 * (i + 1)).astype(np.float32), 8000) for i in range(6)]
+    serial = normalize_audios(audios)
+    parallel = normalize_audios(audios, num_workers=3)
+    assert [len(w) for w in parallel] == [1600 * (i + 1) for i in range(6)]
+    assert all(np.array_equal(a, b) for a, b in zip(serial, parallel))
+    lazy = list(iter_normalized_audios(iter(audios), num_workers=2, prefetch=1))
+    assert all(np.array_equal(a, b) for a, b in zip(serial, lazy))
+
+
+
+def test_single_inputs_and_collections(tmp_path):
+    x = np.zeros(1600, np.float32)
+    for single in ("a.wav", RawPCM(b"\x00\x00"), b"\x00\x00", (x, 16000), (b"\x00\x00", 8000)):
+        assert is_single_audio(single)
+    for many in ([(x, 16000)], ("a.wav", "b.wav"), ((x, 16000), (x, 16000)), iter([])):
+        assert not is_single_audio(many)
+
+    paths = []
+    for i in range(2):
+        paths.append(str(tmp_path / f"{i}.wav"))
+        sf.write(paths[-1], np.full(800 * (i + 1), 0.25, np.float32), 16000)
+
+    class Paths:
+        def __iter__(self):
+            return iter(paths)
+
+    for many in (tuple(paths), Paths()):
+        assert [len(w) for w in iter_normalized_audios(many)] == [800, 1600]
+    assert [len(w) for w in iter_normalized_audios((x, 16000))] == [1600]
+
+# --- Resampling ---
+
+def test_fast_resampler_matches_resample_poly():
+    x = np.random.default_rng(0).uniform(-0.5, 0.5, 44100).astype(np.float32)
+    y = resample_audio(x, 44100, 16000, quality="polyphase")
+    assert y.dtype == np.float32 and len(y) == 16000
+    assert np.allclose(y, resample_poly(x, 160, 441), atol=1e-5)
+    # 8k telephony, and a second call reuses the cached filter
+    assert len(resample_audio(x[:8000], 8000, quality="polyphase")) == 16000
+    assert len(resample_audio(x[:8000], 8000, quality="fast")) == 16000
+    assert resample_audio(x, 16000, quality="fast") is x
+
+def test_unknown_resample_quality():
+    with pytest.raises(ValueError):
+        resample_audio(np.zeros(10, np.float32), 8000, quality="nope")
+
+
+# --- Raw PCM input ---
+
+def test_mono_16k_float32_input_is_not_copied():
+    x = np.linspace(-1.0, 1.0, 1600, dtype=np.float32)
+    assert normalize_audio_input((x, 16000)) is x
+    loud = normalize_audio_input((x * 4, 16000))
+    assert np.allclose(loud, x)
+
+def test_raw_pcm_buffers():
+    import mmap
+
+    pcm = np.array([0, 16384, -32768, 32767], dtype="<i2")
+    expected = pcm.astype(np.float32) / 32768.0
+    for buf in (pcm.tobytes(), bytearray(pcm.tobytes()), memoryview(pcm.tobytes())):
+        assert np.array_equal(normalize_audio_input((buf, 16000)), expected)
+
+    f32 = np.array([0.5, -0.25, 0.25, 0.0], dtype="<f4")
+    with mmap.mmap(-1, f32.nbytes) as mm:
+        mm.write(f32.tobytes())
+        out = normalize_audio_input(RawPCM(mm, dtype="float32"))
+        assert np.array_equal(out, f32)
+        assert np.shares_memory(out, np.frombuffer(mm, dtype="<f4"))
+        del out
+
+    stereo = normalize_audio_input(RawPCM(f32.tobytes(), dtype="float32", channels=2))
+    assert np.allclose(stereo, [0.125, 0.125])
+
+
+# --- Windowed reading of long files ---
+
+def test_long_file_is_split_window_by_window(tmp_path):
+    sr = 48000
+    t = np.arange(25 * sr) / sr
+    tone = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    tone[int(9.5 * sr):int(9.7 * sr)] = 0.0    # quiet spot near the first 10 s cut
+    tone[int(19.2 * sr):int(19.4 * sr)] = 0.0  # and near the second
+    path = str(tmp_path / "long.wav")
+    sf.write(path, np.stack([tone, tone], axis=1), sr)
+
+    chunks = list(iter_audio_file_chunks(path, max_chunk_sec=10, search_expand_sec=1, block_sec=3))
+    offsets = [off for _, off in chunks]
+    assert len(chunks) == 3
+    assert 9.5 <= offsets[1] <= 9.7 and 19.2 <= offsets[2] <= 19.4
+    assert abs(sum(len(c) for c, _ in chunks) - 25 * 16000) <= len(chunks)
+    assert all(c.dtype == np.float32 and np.abs(c).max() <= 1.0 for c, _ in chunks)
+
+    # load_audio_chunks picks the windowed reader for long files only
+    assert [off for _, off, _ in load_audio_chunks(path, max_chunk_sec=10)] != [0.0]
+    assert [off for _, off, _ in load_audio_chunks(path, max_chunk_sec=30)] == [0.0]
+
+
+def test_windowed_reader_downmixes_a_tiny_last_block(tmp_path):
+    sr = 16000
+    rng = np.random.default_rng(0)
+    frames = rng.uniform(-0.3, 0.3, (25 * sr + 2, 4)).astype(np.float32)  # last 1 s block has 2 frames
+    path = str(tmp_path / "quad.wav")
+    sf.write(path, frames, sr, subtype="FLOAT")
+    chunks = list(iter_audio_file_chunks(path, max_chunk_sec=10, search_expand_sec=1, block_sec=1))
+    joined = np.concatenate([c for c, _ in chunks])
+    assert joined.shape[0] == frames.shape[0]
+    assert np.allclose(joined, frames.mean(axis=1), atol=1e-6)
+
+# --- Chunk splitting ---
+
+def test_split_audio_concatenation_is_exact():
+    sr = 16000
+    wav = np.random.default_rng(0).uniform(-0.5, 0.5, 95 * sr).astype(np.float32)
+    wav[int(28.7 * sr):int(28.9 * sr)] *= 0.01   # quiet spot near the first 30 s cut
+    chunks = split_audio_into_chunks(wav, sr, max_chunk_sec=30)
+    assert np.array_equal(np.concatenate([c for c, _ in chunks]), wav)
+    assert 28.7 <= chunks[1][1] <= 28.9
+    offsets = np.cumsum([0] + [len(c) for c, _ in chunks[:-1]]) / sr
+    assert np.allclose([off for _, off in chunks], offsets)
+
+def test_split_audio_with_overlap():
+    sr = 16000
+    wav = np.random.default_rng(0).uniform(-0.5, 0.5, 50 * sr).astype(np.float32)
+    plain = split_audio_into_chunks(wav, sr, max_chunk_sec=10, search_expand_sec=1)
+    chunks = split_audio_into_chunks(wav, sr, max_chunk_sec=10, search_expand_sec=1, overlap_sec=2)
+    assert len(chunks) > len(plain) - 1
+    for (c, off), (_, next_off) in zip(chunks, chunks[1:]):
+        start = int(round(off * sr))
+        assert np.array_equal(c, wav[start:start + len(c)])
+        assert len(c) - int(round((next_off - off) * sr)) == 2 * sr
+        assert len(c) <= 11 * sr
+    trimmed = [c[:int(round((b - a) * sr))] for (c, a), (_, b) in zip(chunks, chunks[1:])] + [chunks[-1][0]]
+    assert np.array_equal(np.concatenate(trimmed), wav)
+    with pytest.raises(ValueError):
+        split_audio_into_chunks(wav, sr, max_chunk_sec=10, overlap_sec=5)
+
+
+# --- Overlap text reconciliation ---
+
+def test_find_overlap_cut():
+    prev, nxt = "the quick brown fox jumps", "Brown fox jumps over the dog."
+    # cut in the middle of the shared run, case and punctuation ignored
+    assert find_overlap_cut(prev, nxt) == (prev.index("fox"), nxt.index("fox"))
+    prev, nxt = "今天天气很好，我们去公园", "我们去公园散步吧"
+    assert find_overlap_cut(prev, nxt) == (prev.index("去"), nxt.index("去"))
+    # no common run
+    assert find_overlap_cut("Hello there.", "General Kenobi") is None
+    assert find_overlap_cut("", "a b") is None
+
+
+def test_find_overlap_cut_ignores_repeats_away_from_the_seam():
+    prev = "we talked about the budget for the next quarter and then we moved on to the hiring plan for the team"
+    nxt = "plan for the team was approved. later in the meeting we talked about the budget for the next quarter again"
+    assert find_overlap_cut(prev, nxt) == (prev.index("the team"), nxt.index("the team"))
+    assert find_overlap_cut(prev, nxt, overlap_sec=2.0) == (prev.index("the team"), nxt.index("the team"))
+
+    prev = "我们讨论了下个季度的预算，然后讨论招聘计划"
+    nxt = "招聘计划获得通过。后来我们讨论了下个季度的预算"
+    assert find_overlap_cut(prev, nxt) == (prev.index("计"), nxt.index("计"))
+
+    # a repeat with no overlap at the seam is not taken
+    assert find_overlap_cut("the budget for the next quarter. fine, thank you", "ok so then the budget for the next quarter") is None
+    # the search only covers what fits in the shared audio
+    assert find_overlap_cut("a b c d e f g h", "a b c d e f g h x") == (8, 8)
+    assert find_overlap_cut("a b c d e f g h", "a b c d e f g h x", overlap_sec=0.25) is None
+
+
+# --- VAD segmentation ---
+
+def _bursts(sr, spans, total_sec):
+    rng = np.random.default_rng(0)
+    wav = rng.normal(0, 1e-4, int(total_sec * sr)).astype(np.float32)
+    for a, b in spans:
+        wav[int(a * sr):int(b * sr)] = rng.uniform(-0.5, 0.5, int(b * sr) - int(a * sr))
+    return wav
+
+def test_detect_speech_segments():
+    sr = 16000
+    wav = _bursts(sr, [(1.0, 3.0), (3.2, 4.0), (10.0, 12.0), (20.0, 20.05)], 25)
+    segs = [(a / sr, b / sr) for a, b in detect_speech_segments(wav, sr, pad_ms=100)]
+    # the 0.2 s pause is bridged, the 50 ms click is dropped
+    assert len(segs) == 2
+    assert abs(segs[0][0] - 0.9) < 0.05 and abs(segs[0][1] - 4.1) < 0.05
+    assert abs(segs[1][0] - 9.9) < 0.05 and abs(segs[1][1] - 12.1) < 0.05
+    assert detect_speech_segments(np.zeros(sr, np.float32), sr) == []
+
+def test_vad_split_packs_speech_and_maps_time():
+    sr = 16000
+    wav = _bursts(sr, [(1.0, 4.0), (30.0, 33.0), (60.0, 75.0)], 80)
+    chunks = vad_split_audio(wav, sr, max_chunk_sec=10, pad_ms=0)
+    # 3 s + 3 s packed together; the 15 s span is cut into two pieces
+    assert len(chunks) == 3
+    packed, offset, time_map = chunks[0]
+    assert abs(len(packed) / sr - 6.0) < 0.1 and abs(offset - 1.0) < 0.05
+    assert abs(map_chunk_time(0.5, time_map) - 1.5) < 0.05
+    assert abs(map_chunk_time(4.0, time_map) - 31.0) < 0.05
+    assert sum(len(c) for c, _, _ in chunks) / sr < 22
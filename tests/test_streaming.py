@@ -0,0 +1,223 @@
+"""Tests for streaming ASR state handling (no model weights needed)."""
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pytest
+
+from qwen_asr.inference.qwen3_asr import Qwen3ASRModel
+from qwen_asr.inference.streaming_scheduler import StreamingScheduler
+
+CHUNK = 1600  # 0.1 s chunks
+EOS = 256
+
+
+class _ByteTokenizer:
+    """UTF-8 byte tokenizer: CJK characters span 3 tokens, so rollbacks can cut into them."""
+
+    all_special_ids = [EOS]
+
+    def encode(self, text):
+        return list(text.encode("utf-8"))
+
+    def decode(self, ids):
+        return bytes(i for i in ids if i != EOS).decode("utf-8", errors="replace")
+
+
+class _Processor:
+    tokenizer = _ByteTokenizer()
+
+    def apply_chat_template(self, msgs, add_generation_prompt, tokenize):
+        return f"<system>{msgs[0]['content']}</system><assistant>"
+
+
+def _word(k):
+    # mix 3-byte CJK characters with ASCII letters
+    return chr(0x4E00 + k) if k % 3 else chr(ord("a") + k % 26)
+
+
+class _Engine:
+    """
+    Fake vLLM engine. Chunk k of a stream carries k in its first sample; the transcript of some
+    audio is the word of every chunk in it, and the engine continues whatever prefix the prompt has.
+    """
+
+    def __init__(self):
+        self.prompts = []
+        self.batch_sizes = []
+
+    def generate(self, batch, sampling_params=None, use_tqdm=False):
+        self.batch_sizes.append(len(batch))
+        outs = []
+        for req in batch:
+            audio = req["multi_modal_data"]["audio"][0]
+            if np.isnan(audio).any():
+                raise RuntimeError("engine failure")
+            self.prompts.append(req["prompt"])
+            words = "".join(_word(int(round(float(audio[i]) * 1e6))) for i in range(0, len(audio), CHUNK))
+            full = "language Chinese<asr_text>" + words
+            prefix = req["prompt"].split("<assistant>", 1)[1]
+            gen = full[len(prefix):] if full.startswith(prefix) else full
+            token_ids = _ByteTokenizer().encode(gen) + [EOS]
+            outs.append(type("Out", (), {"outputs": [type("Gen", (), {"text": gen, "token_ids": token_ids})()]})())
+        return outs
+
+
+def _model(**kwargs):
+    return Qwen3ASRModel(backend="vllm", model=_Engine(), processor=_Processor(), **kwargs)
+
+
+def _stream(num_chunks, quiet_every=0, first=0):
+    # loud chunks, optionally every n-th one silent; chunk k starts with k * 1e-6
+    audio = np.full(num_chunks * CHUNK, 0.5, dtype=np.float32)
+    for k in range(num_chunks):
+        if quiet_every and k % quiet_every == quiet_every - 1:
+            audio[k * CHUNK : (k + 1) * CHUNK] = 0.0
+        audio[k * CHUNK] = (first + k) * 1e-6
+    return audio
+
+
+def _expected(num_chunks, first=0):
+    return "".join(_word(first + k) for k in range(num_chunks))
+
+
+def _feed(model, state, audio, piece=1000):
+    for i in range(0, len(audio), piece):
+        model.streaming_transcribe(audio[i : i + piece], state)
+    return model.finish_streaming_transcribe(state)
+
+
+# --- Bounded streaming ---
+
+def test_bounded_streaming_commits_each_segment_once():
+    n = 80
+    unbounded = _model()
+    state = _feed(unbounded, unbounded.init_streaming_state(chunk_size_sec=0.1), _stream(n, quiet_every=4))
+    assert state.text == _expected(n)
+    assert len(unbounded.model.prompts[-1]) > n
+
+    model = _model()
+    state = model.init_streaming_state(chunk_size_sec=0.1, max_window_sec=0.5, context_tail_chars=8)
+    state = _feed(model, state, _stream(n, quiet_every=4))
+    # every word exactly once, in order, across commits
+    assert state.text == _expected(n)
+    assert len(state.committed_text) >= n - 8 and _expected(n).startswith(state.committed_text)
+    # commits happen at the quiet chunks or at 1.5x the window, so the re-fed audio stays bounded ...
+    assert len(state.audio_accum) <= 8 * CHUNK
+    # ... and so does the prompt: base + context tail + at most one segment of prefix
+    base = len(model._build_text_prompt(context="", force_language=None))
+    assert max(len(p) for p in model.model.prompts) <= base + 1 + 8 + len("language Chinese<asr_text>") + 8
+
+
+# --- Batched streaming and the scheduler ---
+
+def test_streaming_batch_matches_single_streams():
+    n = 12
+    model = _model()
+    states = [model.init_streaming_state(chunk_size_sec=0.1) for _ in range(3)]
+    audios = [_stream(n + i, first=100 * i) for i in range(3)]
+    for i in range(0, max(len(a) for a in audios), 2500):
+        model.streaming_transcribe_batch([a[i : i + 2500] for a in audios], states)
+    model.finish_streaming_transcribe_batch(states)
+    assert [s.text for s in states] == [_expected(n + i, first=100 * i) for i in range(3)]
+    assert max(model.model.batch_sizes) == 3
+    with pytest.raises(ValueError):
+        model.streaming_transcribe(audios[0][:CHUNK], states[0])  # finished
+
+
+def test_scheduler_batches_sessions_and_finishes_after_pieces():
+    model = _model()
+    scheduler = StreamingScheduler(model, max_batch_size=16, max_wait_ms=200)
+    try:
+        states = [model.init_streaming_state(chunk_size_sec=0.1) for _ in range(4)]
+        audios = [_stream(5, first=100 * i) for i in range(4)]
+        futures = []
+        for state, audio in zip(states, audios):
+            # the trailing partial chunk is only decoded by the finish queued right after it
+            futures.append(scheduler.submit(audio[: 4 * CHUNK + 700], state))
+            futures.append(scheduler.finish(state))
+        results = [f.result(timeout=10) for f in futures]
+    finally:
+        scheduler.close()
+    assert results[1::2] == states
+    assert [s.text for s in states] == [_expected(4, first=100 * i) + _word(100 * i + 4) for i in range(4)]
+    assert max(model.model.batch_sizes) == 4
+
+
+def test_scheduler_isolates_failing_sessions():
+    model = _model()
+    scheduler = StreamingScheduler(model, max_batch_size=16, max_wait_ms=200)
+    good, odd, done, poisoned = (model.init_streaming_state(chunk_size_sec=0.1) for _ in range(4))
+    model.finish_streaming_transcribe(done)
+    poison = _stream(2, first=50)
+    poison[5] = np.nan
+    try:
+        futures = [
+            scheduler.submit(_stream(3), good),
+            scheduler.submit(b"\x00\x01\x02", odd),  # odd-length int16 PCM
+            scheduler.submit(_stream(1), done),
+            scheduler.submit(poison, poisoned),      # fails inside the engine
+        ]
+        assert futures[0].result(timeout=10) is good
+        for f, exc in zip(futures[1:], (ValueError, ValueError, RuntimeError)):
+            with pytest.raises(exc):
+                f.result(timeout=10)
+    finally:
+        scheduler.close()
+    assert good.text == _expected(3) and good.chunk_id == 3
+    # the failed engine step left the poisoned state as it was
+    assert poisoned.chunk_id == 0 and poisoned.audio_accum.shape[0] == 0 and poisoned.buffer.shape[0] == 2 * CHUNK
+
+
+
+def test_scheduler_survives_cancelled_jobs_and_tick_errors(monkeypatch):
+    model = _model()
+    scheduler = StreamingScheduler(model, max_batch_size=16, max_wait_ms=200)
+    a, b = (model.init_streaming_state(chunk_size_sec=0.1) for _ in range(2))
+    try:
+        cancelled = scheduler.submit(_stream(2), a)
+        assert cancelled.cancel()
+        assert scheduler.submit(_stream(3), b).result(timeout=10) is b
+        assert a.chunk_id == 0 and b.chunk_id == 3
+
+        # an unexpected error fails its tick only
+        run_tick = scheduler._run_tick
+        monkeypatch.setattr(scheduler, "_run_tick", lambda jobs: (_ for _ in ()).throw(RuntimeError("boom")))
+        with pytest.raises(RuntimeError, match="boom"):
+            scheduler.submit(_stream(1), a).result(timeout=10)
+        monkeypatch.setattr(scheduler, "_run_tick", run_tick)
+        assert scheduler.finish(b).result(timeout=10) is b
+    finally:
+        scheduler.close()
+
+# --- Prefix rollback on cached token ids ---
+
+def _reference_prefix(tokenizer, raw, k):
+    # the original rollback: re-encode the whole text and decode the kept ids
+    ids = tokenizer.encode(raw)
+    while True:
+        end_idx = max(0, len(ids) - k)
+        prefix = tokenizer.decode(ids[:end_idx]) if end_idx > 0 else ""
+        if "\ufffd" not in prefix or end_idx == 0:
+            return prefix if "\ufffd" not in prefix else ""
+        k += 1
+
+
+@pytest.mark.parametrize("rollback", [1, 2, 3, 4, 5])
+def test_cached_rollback_matches_reencoding(rollback):
+    model = _model()
+    tokenizer = model.processor.tokenizer
+    state = model.init_streaming_state(chunk_size_sec=0.1, unfixed_chunk_num=1, unfixed_token_num=rollback)
+    audio = _stream(20)
+    cut_inside_char = 0
+    for k in range(20):
+        model.streaming_transcribe(audio[k * CHUNK : (k + 1) * CHUNK], state)
+        assert state._raw_decoded_ids == tokenizer.encode(state._raw_decoded)
+        prefix, prefix_ids = model._streaming_prefix(state)
+        assert prefix == _reference_prefix(tokenizer, state._raw_decoded, rollback)
+        assert prefix_ids == tokenizer.encode(prefix)
+        cut_inside_char += "\ufffd" in tokenizer.decode(state._raw_decoded_ids[: len(state._raw_decoded_ids) - rollback])
+    assert state.text == _expected(20)
+    if rollback in (1, 2, 4, 5):
+        assert cut_inside_char > 0
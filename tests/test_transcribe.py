@@ -0,0 +1,288 @@
+"""Tests for the batch transcribe drivers (no model weights needed)."""
+import os, sys, threading, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pytest
+import soundfile as sf
+import torch
+
+from qwen_asr.inference.parallel_transcriber import ParallelTranscriber
+from qwen_asr.inference import qwen3_asr
+from qwen_asr.inference.metrics import MetricsRecorder, recording
+from qwen_asr.inference.qwen3_asr import Qwen3ASRModel
+from qwen_asr.inference.qwen3_forced_aligner import ForcedAlignItem, ForcedAlignResult
+from qwen_asr.inference.utils import AudioChunk
+
+
+class _LengthModel(Qwen3ASRModel):
+    """Transcribes every chunk as its sample count and records which thread ran it."""
+
+    def __init__(self, **kwargs):
+        super().__init__(backend="vllm", model=None, processor=None, **kwargs)
+        self.threads = set()
+
+    def _infer_asr(self, contexts, wavs, languages):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.02)
+        return [f"language English<asr_text>{len(w)}|" for w in wavs]
+
+
+class _SpanAligner:
+    """Aligns each chunk text as one item spanning the whole chunk."""
+
+    device = "cpu"
+
+    def __init__(self):
+        self.threads = set()
+
+    def align(self, audio, text, language):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.02)
+        return [ForcedAlignResult(items=[ForcedAlignItem(t, 0.0, len(w) / sr)]) for (w, sr), t in zip(audio, text)]
+
+
+# --- Multi-worker fan-out ---
+
+def test_parallel_matches_single_model():
+    sr = 16000
+    wav = np.random.default_rng(0).uniform(-0.5, 0.5, 95 * sr).astype(np.float32)
+    workers = [_LengthModel(max_inference_batch_size=2) for _ in range(3)]
+    transcriber = ParallelTranscriber(workers)
+    try:
+        got = transcriber.transcribe([(wav, sr), (wav[: 5 * sr], sr)], max_chunk_sec=10)
+    finally:
+        transcriber.close()
+    expected = _LengthModel(max_inference_batch_size=2).transcribe([(wav, sr), (wav[: 5 * sr], sr)], max_chunk_sec=10)
+    assert [(r.language, r.text) for r in got] == [(r.language, r.text) for r in expected]
+    assert len(got[0].text.split("|")) >= 9
+    assert sum(bool(w.threads) for w in workers) > 1
+
+
+# --- Lazy iterator API ---
+
+def test_transcribe_iter_is_lazy_and_matches_transcribe():
+    sr = 16000
+    rng = np.random.default_rng(0)
+    audios = [(rng.uniform(-0.5, 0.5, int(s * sr)).astype(np.float32), sr) for s in (3, 25, 1, 12, 4)]
+    model = _LengthModel(max_inference_batch_size=2)
+    expected = model.transcribe(audios, max_chunk_sec=10)
+
+    pulled = []
+    def source():
+        for a in audios:
+            pulled.append(a)
+            yield a
+
+    results = model.transcribe_iter(source(), max_chunk_sec=10)
+    first = next(results)
+    assert first.text == expected[0].text
+    assert len(pulled) < len(audios)
+    assert [first] + list(results) == expected
+
+    unbounded = _LengthModel()
+    assert list(unbounded.transcribe_iter(audios, max_chunk_sec=10)) == expected
+
+
+def test_transcribe_iter_runs_inference_without_grad():
+    class GradModel(_LengthModel):
+        def _infer_asr(self, contexts, wavs, languages):
+            self.grad_modes.append(torch.is_grad_enabled())
+            return super()._infer_asr(contexts, wavs, languages)
+
+    model = GradModel(max_inference_batch_size=1)
+    model.grad_modes = []
+    audio = (np.zeros(16000, np.float32), 16000)
+    for _ in model.transcribe_iter([audio] * 3):
+        assert torch.is_grad_enabled()  # the caller's own mode is untouched between results
+    assert model.grad_modes == [False] * 3
+
+
+def test_transcribe_iter_takes_any_iterable_of_inputs(tmp_path):
+    sr = 16000
+    paths = []
+    for s in (1, 2):
+        paths.append(str(tmp_path / f"{s}.wav"))
+        sf.write(paths[-1], np.full(s * sr, 0.25, np.float32), sr)
+    model = _LengthModel()
+    assert [r.text for r in model.transcribe_iter(tuple(paths))] == ["16000|", "32000|"]
+    assert [r.text for r in model.transcribe_iter((np.zeros(sr, np.float32), sr))] == ["16000|"]
+
+
+# --- Pipelined alignment ---
+
+def test_pipelined_alignment_matches_serial():
+    sr = 16000
+    rng = np.random.default_rng(0)
+    audios = [(rng.uniform(-0.5, 0.5, int(s * sr)).astype(np.float32), sr) for s in (25, 3, 12)]
+    serial = _LengthModel(max_inference_batch_size=2, forced_aligner=_SpanAligner())
+    piped = _LengthModel(max_inference_batch_size=2, forced_aligner=_SpanAligner(), pipeline_alignment=True)
+    expected = serial.transcribe(audios, return_time_stamps=True, max_chunk_sec=10)
+    got = piped.transcribe(audios, return_time_stamps=True, max_chunk_sec=10)
+    assert got == expected
+    assert len(got[0].time_stamps) == 3
+    assert piped.forced_aligner.threads.isdisjoint(piped.threads)
+
+
+def test_pipelined_alignment_batches_an_unbounded_model(monkeypatch):
+    monkeypatch.setattr(qwen3_asr, "_PIPELINE_BATCH_SIZE", 2)
+    audios = [(np.zeros(16000 * (i + 1), np.float32), 16000) for i in range(5)]
+    model = _LengthModel(forced_aligner=_SpanAligner(), pipeline_alignment=True)
+    calls = []
+    infer = model._infer_asr
+    model._infer_asr = lambda contexts, wavs, languages: calls.append(len(wavs)) or infer(contexts, wavs, languages)
+    got = model.transcribe(audios, return_time_stamps=True)
+    assert calls == [2, 2, 1]
+    assert got == _LengthModel(forced_aligner=_SpanAligner()).transcribe(audios, return_time_stamps=True)
+
+
+# --- Overlapping chunks ---
+
+_WORD_SEC = 0.5
+
+
+class _WordModel(Qwen3ASRModel):
+    """Hears word k at [k * 0.5, k * 0.5 + 0.4) s as "wk"; with garble, words in the audio shared with
+    the previous chunk come out as "vk", so the overlap texts do not match."""
+
+    def __init__(self, overlap_sec, garble=False, **kwargs):
+        super().__init__(backend="vllm", model=None, processor=None, **kwargs)
+        self.overlap_sec, self.garble = overlap_sec, garble
+        self.offsets = {}
+
+    def _infer_chunks(self, chunks, contexts, languages):
+        out = []
+        for c in chunks:
+            lo, hi = c.offset_sec, c.offset_sec + len(c.wav) / c.sr
+            words = []
+            for k in range(int(hi / _WORD_SEC) + 1):
+                start = k * _WORD_SEC
+                if lo <= start and start + 0.4 <= hi:
+                    shared = c.chunk_index > 0 and start < lo + self.overlap_sec
+                    words.append(("v" if self.garble and shared else "w") + str(k))
+            text = " ".join(words) + "."
+            self.offsets[text] = c.offset_sec
+            out.append("language English<asr_text>" + text)
+        return out
+
+
+class _WordAligner:
+    device = "cpu"
+
+    def __init__(self, offsets):
+        self.offsets = offsets
+
+    def align(self, audio, text, language):
+        out = []
+        for t in text:
+            starts = [int(w[1:]) * _WORD_SEC - self.offsets[t] for w in t.rstrip(".").split()]
+            out.append(ForcedAlignResult(items=[
+                ForcedAlignItem(w, s, s + 0.4) for w, s in zip(t.rstrip(".").split(), starts)
+            ]))
+        return out
+
+
+@pytest.mark.parametrize("garble", [False, True])
+def test_overlap_hands_over_text_and_timestamps_at_one_point(garble):
+    sr = 16000
+    wav = np.random.default_rng(0).uniform(-0.5, 0.5, 40 * sr).astype(np.float32)
+    model = _WordModel(overlap_sec=2.0, garble=garble)
+    model.forced_aligner = _WordAligner(model.offsets)
+    (r,) = model.transcribe([(wav, sr)], return_time_stamps=True, max_chunk_sec=10, chunk_overlap_sec=2.0)
+
+    words = r.text.replace(".", " ").split()
+    assert words == [it.text for it in r.time_stamps]
+    assert [int(w[1:]) for w in words] == list(range(80))
+    assert np.all(np.diff(r.time_stamps.start_times) > 0)
+    assert any(w.startswith("v") for w in words) == garble
+
+
+def _merge(texts, times, overlap_sec=2.0):
+    """_merge_chunk_results over one input whose chunk k starts at 8 k s; times are absolute word starts."""
+    chunks = [AudioChunk(0, k, np.zeros(1, np.float32), 16000, 8.0 * k) for k in range(len(texts))]
+    results = [
+        ("English", t, ForcedAlignResult(texts=t.replace(".", " ").split(), start_times=ts, end_times=np.add(ts, 0.4)))
+        for t, ts in zip(texts, times)
+    ]
+    return _LengthModel()._merge_chunk_results(1, chunks, results, True, overlap_sec)[0]
+
+
+def test_merge_chunk_results_cuts_text_and_timestamps_at_the_match():
+    r = _merge(["a b c d e", "d e f g."], [[5, 6, 7, 8, 9], [8.1, 9.1, 10, 11]])
+    assert r.text == "a b c d e f g."
+    assert r.time_stamps.texts == ["a", "b", "c", "d", "e", "f", "g"]
+    # "d" from the first chunk, "e" onwards from the second
+    assert r.time_stamps.start_times.tolist() == [5, 6, 7, 8, 9.1, 10, 11]
+
+
+def test_merge_chunk_results_falls_back_to_the_middle_of_the_overlap():
+    # no shared words: both sides are cut at the first word starting after 8 + 1 s
+    r = _merge(["a b c d e", "x y f g"], [[5, 6, 7, 8.5, 9.5], [8.4, 9.2, 10, 11]])
+    assert r.text == "a b c d y f g"
+    assert r.time_stamps.texts == ["a", "b", "c", "d", "y", "f", "g"]
+
+
+def test_merge_chunk_results_with_a_chunk_covered_by_both_neighbours():
+    # the middle chunk's head cut lies after its tail cut: it contributes nothing
+    r = _merge(["x a b c d", "a b c d", "a b y"], [[6, 7, 8, 9, 10], [8.1, 9.1, 10.1, 11.1], [16, 17, 18]])
+    assert r.text == "x a b b y"
+    assert r.time_stamps.texts == r.text.split()
+    assert not ({8.1, 9.1, 10.1, 11.1} & set(r.time_stamps.start_times.tolist()))
+
+
+# --- Metrics hooks ---
+
+def test_metrics_hook_reports_stages_and_counts():
+    rng = np.random.default_rng(0)
+    audios = [(rng.uniform(-0.5, 0.5, s * 8000).astype(np.float32), 8000) for s in (25, 3)]
+    model = _LengthModel(max_inference_batch_size=2, forced_aligner=_SpanAligner())
+    reports = []
+    model.add_metrics_hook(reports.append)
+
+    model.transcribe(audios, return_time_stamps=True, max_chunk_sec=10)
+    (m,) = reports
+    assert m.num_inputs == 2 and m.num_chunks == 4
+    assert abs(m.audio_seconds - 28.0) < 0.1
+    assert {"resample", "split", "parse", "align"} <= set(m.stage_seconds)
+    assert m.total_seconds >= m.stage_seconds["align"] > 0
+
+    reports.clear()
+    assert len(list(model.transcribe_iter(audios, max_chunk_sec=10))) == 2
+    assert sum(r.num_inputs for r in reports) == 2 and sum(r.num_chunks for r in reports) == 4
+    assert {r.batch_capacity for r in reports} == {m.batch_capacity} == {2}
+
+    seen = len(reports)
+    model.remove_metrics_hook(reports.append)
+    model.transcribe(audios[1:])
+    assert len(reports) == seen
+
+
+def test_encoder_timer_is_registered_once_per_module():
+    net = torch.nn.Module()
+    net.thinker = torch.nn.Module()
+    net.thinker.audio_tower = tower = torch.nn.Identity()
+    a, b = (Qwen3ASRModel(backend="transformers", model=net, processor=None) for _ in range(2))
+    assert not tower._forward_hooks and not tower._forward_pre_hooks  # metrics off: no hooks
+
+    hook_a, hook_b = (lambda m: None), (lambda m: None)
+    a.add_metrics_hook(hook_a)
+    b.add_metrics_hook(hook_b)
+    assert len(tower._forward_pre_hooks) == len(tower._forward_hooks) == 1
+    recorder, stages = MetricsRecorder(), []
+    recorder.add_stage = lambda name, seconds: stages.append(name)
+    with recording(recorder):
+        tower(torch.zeros(1))
+    assert stages == ["encoder"]
+
+    a.remove_metrics_hook(hook_a)
+    assert len(tower._forward_hooks) == 1  # b still records
+    b.remove_metrics_hook(hook_b)
+    assert not tower._forward_hooks and not tower._forward_pre_hooks
+
+
+# --- Constructor validation ---
+
+def test_unknown_resample_quality_is_rejected_up_front():
+    with pytest.raises(ValueError):
+        _LengthModel(resample_quality="nope")